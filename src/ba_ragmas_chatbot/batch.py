@@ -0,0 +1,336 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+from dotenv import load_dotenv
+
+from ba_ragmas_chatbot import logger_config
+from ba_ragmas_chatbot.graph.profiles import resolve_profile
+from ba_ragmas_chatbot.graph.utils import get_app_config
+from ba_ragmas_chatbot.graph.workflow import (
+    close_checkpointer,
+    get_graph,
+    open_checkpointer,
+    run_config,
+)
+from ba_ragmas_chatbot.llm.factory import residency, scheduler
+from ba_ragmas_chatbot.paths import DATA_ROOT
+from ba_ragmas_chatbot.tools.vectorstore import (
+    asetup_vectorstore,
+    drop_vectorstore,
+    embedding_metrics,
+    new_collection_name,
+)
+
+logger = logger_config.get_logger("Batch")
+
+BATCH_OUTPUT_DIR = DATA_ROOT / "batch_output"
+REPORT_FILE = "report.json"
+
+
+@dataclass
+class BatchJob:
+    """One article of a batch file, with the answers the wizard would ask for."""
+
+    job_id: str
+    topic: str
+    length: str = "medium"
+    tone: str = "professional"
+    language: str = "English"
+    language_level: str = "intermediate"
+    information_level: str = "medium"
+    additional_info: str = ""
+    documents: List[str] = field(default_factory=list)
+    profile: Optional[str] = None
+
+
+def _slug(text: str, max_length: int = 40) -> str:
+    slug = re.sub(r"[^a-zA-Z0-9]+", "_", text).strip("_").lower()
+    return slug[:max_length] or "article"
+
+
+def _documents(value, base_dir: Path) -> List[str]:
+    """document paths (relative to the job file) and URLs of a job spec."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(";")
+    documents = []
+    for entry in (str(v).strip() for v in value):
+        if not entry:
+            continue
+        if entry.startswith("http://") or entry.startswith("https://"):
+            documents.append(entry)
+        else:
+            documents.append(str((base_dir / entry).resolve()))
+    return documents
+
+
+def load_jobs(path: Path) -> List[BatchJob]:
+    """
+    Reads job specs from a YAML file (a list of jobs, or "jobs" plus
+    optional "defaults") or a CSV file with one job per row. Only topic is
+    required; documents are separated by ";" in CSV files.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            specs, defaults = list(csv.DictReader(f)), {}
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or []
+        if isinstance(data, dict):
+            specs, defaults = data.get("jobs", []), data.get("defaults", {}) or {}
+        else:
+            specs, defaults = data, {}
+
+    jobs = []
+    known = set(BatchJob.__dataclass_fields__)
+    for index, spec in enumerate(specs, start=1):
+        spec = {**defaults, **{k: v for k, v in spec.items() if v not in (None, "")}}
+        topic = str(spec.get("topic") or "").strip()
+        if not topic:
+            raise ValueError(f"{path}: job {index} has no topic")
+        spec["job_id"] = _slug(str(spec.pop("id", "") or f"{index:03d}_{topic}"))
+        spec["documents"] = _documents(spec.get("documents"), path.parent)
+        jobs.append(BatchJob(**{k: v for k, v in spec.items() if k in known}))
+    return jobs
+
+
+def graph_inputs(job: BatchJob, collection_name: str) -> dict:
+    """maps a job spec onto the initial AgentState, like the Telegram wizard."""
+    return {
+        "topic": job.topic,
+        "target_len": job.length,
+        "language_level": job.language_level,
+        "information_level": job.information_level,
+        "language": job.language,
+        "tone": job.tone,
+        "additional_info": job.additional_info,
+        "source_documents": list(job.documents),
+        "collection_name": collection_name,
+        "research_data": [],
+        "outline": [],
+        "draft": "",
+        "final_article": "",
+        "revision_count": 0,
+        "profile": resolve_profile(target_len=job.length, profile=job.profile),
+    }
+
+
+def _load_report(output_dir: Path) -> dict:
+    path = output_dir / REPORT_FILE
+    if not path.exists():
+        return {"jobs": {}}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"⚠️ Could not read batch report {path}: {e}")
+        return {"jobs": {}}
+
+
+def _save_report(output_dir: Path, report: dict) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / REPORT_FILE
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+async def run_job(job: BatchJob, output_dir: Path) -> dict:
+    """
+    Runs one job through the compiled graph and writes its article. A job
+    that was interrupted in an earlier batch run continues from its last
+    checkpointed node.
+    """
+    profile = resolve_profile(target_len=job.length, profile=job.profile)
+    app = get_graph(profile)
+    config = run_config("batch", job.job_id)
+    snapshot = await app.aget_state(config) if app.checkpointer else None
+    resuming = bool(snapshot and snapshot.next)
+    checkpointed = snapshot.values if resuming else {}
+    collection_name = checkpointed.get("collection_name") or new_collection_name(
+        f"batch_{job.job_id}"
+    )
+
+    started = time.perf_counter()
+    node_seconds: Dict[str, float] = {}
+    try:
+        if job.documents and not checkpointed.get("research_data"):
+            await asetup_vectorstore(job.documents, collection_name)
+
+        inputs = None if resuming else graph_inputs(job, collection_name)
+        final_state = dict(checkpointed) if resuming else dict(inputs)
+        if resuming:
+            logger.info(f"♻️ Job {job.job_id}: resuming after the last completed step.")
+
+        step_started = time.perf_counter()
+        async for chunk in app.astream(inputs, config, stream_mode="updates"):
+            now = time.perf_counter()
+            for node_name, state_update in chunk.items():
+                final_state.update(state_update or {})
+                node_seconds[node_name] = round(
+                    node_seconds.get(node_name, 0) + now - step_started, 3
+                )
+            step_started = now
+    finally:
+        drop_vectorstore(collection_name)
+
+    output_path = output_dir / f"{job.job_id}.md"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(final_state.get("final_article") or "")
+
+    if app.checkpointer:
+        await app.checkpointer.adelete_thread(config["configurable"]["thread_id"])
+
+    return {
+        "topic": job.topic,
+        "profile": profile,
+        "status": "done",
+        "resumed": resuming,
+        "seconds": round(time.perf_counter() - started, 3),
+        "nodes": node_seconds,
+        "revisions": final_state.get("revision_count", 0),
+        "output": str(output_path),
+    }
+
+
+async def run_batch(
+    jobs: List[BatchJob], output_dir: Path, concurrency: int = 1
+) -> dict:
+    """
+    Runs all jobs with at most `concurrency` at once and writes the report
+    after every job. Jobs the report already lists as done (with their
+    article on disk) are skipped, so an interrupted batch can be restarted
+    with the same command.
+    """
+    output_dir = Path(output_dir)
+    report = _load_report(output_dir)
+    entries = report.setdefault("jobs", {})
+
+    def is_done(job: BatchJob) -> bool:
+        entry = entries.get(job.job_id, {})
+        return entry.get("status") == "done" and Path(entry.get("output", "")).exists()
+
+    todo = [job for job in jobs if not is_done(job)]
+    if len(todo) < len(jobs):
+        logger.info(f"⏭️ Skipping {len(jobs) - len(todo)} finished job(s).")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    lock = asyncio.Lock()
+    for _ in todo:
+        residency.run_queued()
+
+    async def worker(job: BatchJob) -> None:
+        async with semaphore:
+            residency.run_started()
+            print(f"▶️ {job.job_id}: {job.topic}")
+            try:
+                entry = await run_job(job, output_dir)
+                print(f"✅ {job.job_id} finished in {entry['seconds']:.0f}s")
+            except Exception as e:
+                logger.exception(f"Batch job {job.job_id} failed: {e}")
+                print(f"❌ {job.job_id} failed: {e}")
+                entry = {"topic": job.topic, "status": "failed", "error": str(e)}
+            finally:
+                residency.run_finished()
+            async with lock:
+                entries[job.job_id] = entry
+                _save_report(output_dir, report)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(job) for job in todo])
+    wall_seconds = time.perf_counter() - started
+
+    done = [entries[j.job_id] for j in todo if entries[j.job_id]["status"] == "done"]
+    report["last_run"] = {
+        "jobs": len(todo),
+        "done": len(done),
+        "failed": len(todo) - len(done),
+        "concurrency": concurrency,
+        "wall_seconds": round(wall_seconds, 3),
+        "job_seconds": round(sum(e["seconds"] for e in done), 3),
+        "articles_per_hour": (
+            round(len(done) * 3600 / wall_seconds, 2) if wall_seconds else 0.0
+        ),
+        "scheduler": scheduler.metrics(),
+        "embeddings": embedding_metrics(),
+    }
+    _save_report(output_dir, report)
+    return report
+
+
+async def _main(args) -> int:
+    jobs = load_jobs(args.jobs_file)
+    concurrency = args.concurrency or get_app_config().get("queue", {}).get(
+        "max_concurrent_runs", 1
+    )
+    await open_checkpointer()
+    try:
+        report = await run_batch(jobs, args.output_dir, concurrency)
+    finally:
+        await close_checkpointer()
+
+    summary = report["last_run"]
+    print(
+        f"📊 {summary['done']}/{summary['jobs']} articles in "
+        f"{summary['wall_seconds']:.0f}s ({summary['articles_per_hour']} per hour), "
+        f"report: {Path(args.output_dir) / REPORT_FILE}"
+    )
+    print(
+        f"🔀 {summary['scheduler']['model_switches']} model switches for "
+        f"{summary['scheduler']['calls']} LLM calls"
+    )
+    return 1 if summary["failed"] else 0
+
+
+def run():
+    """Generates the articles of a YAML/CSV job file without Telegram."""
+    load_dotenv()
+    parser = argparse.ArgumentParser(
+        description="Generate blog articles for every job in a YAML or CSV file."
+    )
+    parser.add_argument("jobs_file", type=Path, help="YAML or CSV file of job specs")
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=BATCH_OUTPUT_DIR,
+        help=f"where articles and {REPORT_FILE} are written",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=None,
+        help="articles generated at the same time (default: queue.max_concurrent_runs)",
+    )
+    args = parser.parse_args()
+
+    exit_code = 1
+    try:
+        exit_code = asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        print("\n👋 Batch interrupted, run the same command again to resume.")
+    except Exception as e:
+        print(f"❌ Batch failed: {e}")
+        logger.exception(f"Batch failed: {e}")
+    finally:
+        logger_config.shutdown()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    run()
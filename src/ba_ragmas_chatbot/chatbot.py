@@ -1,18 +1,44 @@
 import os
 import shutil
-import yaml
+import time
+import uuid
+from datetime import timedelta
 from pathlib import Path
+from typing import Dict, Optional
 
 
-from ba_ragmas_chatbot.graph.workflow import create_graph
-from ba_ragmas_chatbot.tools.vectorstore import setup_vectorstore
+from ba_ragmas_chatbot.graph.workflow import (
+    get_graph,
+    benchmark_graph_build,
+    open_checkpointer,
+    close_checkpointer,
+    drop_stale_checkpoints,
+    run_config,
+)
+from ba_ragmas_chatbot.job_queue import GenerationJob, GenerationQueue
+from ba_ragmas_chatbot.live_preview import LivePreview
+from ba_ragmas_chatbot.graph.utils import get_app_config, config_service
+from ba_ragmas_chatbot.graph.profiles import (
+    get_profile,
+    profile_names,
+    resolve_profile,
+)
+from ba_ragmas_chatbot.graph.verdict import needs_rewrite
+from ba_ragmas_chatbot.llm.backends import RoutedLLM
+from ba_ragmas_chatbot.llm.factory import backend_pool
+from ba_ragmas_chatbot.tools.vectorstore import (
+    asetup_vectorstore,
+    new_collection_name,
+    drop_vectorstore,
+    drop_stale_collections,
+)
 
 from telegram import (
     Update,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
 )
-from telegram.error import BadRequest
+from telegram.error import BadRequest, RetryAfter
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -35,6 +61,18 @@ class TelegramBot:
 
     CHAT = -1
 
+    PREVIEW_HEADERS = {
+        "writer": "✍️ Draft (live):",
+        "polisher": "✨ Final article (live):",
+    }
+
+    STEP_TEXTS = {
+        "editor": "⏳ 🏗️ Editor is creating the outline...",
+        "writer": "⏳ ✍️ Writer is drafting the article...",
+        "fact_checker": "⏳ ⚖️ Fact Checker is verifying facts...",
+        "polisher": "⏳ ✨ Polisher is formatting the final text...",
+    }
+
     VALID_MIME_TYPES = [
         "application/pdf",
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
@@ -54,20 +92,27 @@ class TelegramBot:
             )
         model_cfg = self.config.get("models", {})
         self.llm_name = model_cfg.get("chat_model", "llama3.1:8b-instruct-q8_0")
-        self.llm_url = model_cfg.get("base_url", "http://localhost:11434")
-        self.ai = OllamaLLM(model=self.llm_name, base_url=self.llm_url)
+        self.ai = RoutedLLM(
+            lambda base_url: OllamaLLM(model=self.llm_name, base_url=base_url),
+            self.llm_name,
+            backend_pool,
+        )
         self.tools = []
 
-    def _load_config(self):
-        """Lädt die Konfiguration robust relativ zum Modulpfad."""
-        here = Path(__file__).resolve().parent
-        config_path = here / "config" / "configs.yaml"
-
-        if not config_path.exists():
-            raise FileNotFoundError(f"Config file not found at: {config_path}")
+        queue_cfg = self.config.get("queue", {})
+        self.bot = None
+        # chat_id -> time.monotonic() until which telegram rate limits edits
+        self._status_paused_until: Dict[int, float] = {}
+        self.queue = GenerationQueue(
+            self.run_generation_job,
+            max_concurrent=queue_cfg.get("max_concurrent_runs", 1),
+            default_run_seconds=queue_cfg.get("default_run_seconds", 600),
+            on_update=self.report_queue_position,
+        )
 
-        with open(config_path, "r", encoding="utf-8") as file:
-            return yaml.safe_load(file)
+    def _load_config(self):
+        """Lädt die Konfiguration aus dem zentralen Config-Service."""
+        return get_app_config()
 
     def clear_db(self):
         """Deletes all database files related to ChromaDB."""
@@ -152,8 +197,18 @@ class TelegramBot:
         ] + self.build_navigation()
         return InlineKeyboardMarkup(keyboard)
 
-    def build_confirm_keyboard(self) -> InlineKeyboardMarkup:
+    def build_confirm_keyboard(
+        self, selected_profile: Optional[str] = None
+    ) -> InlineKeyboardMarkup:
+        profiles = [
+            InlineKeyboardButton(
+                f"{'✔️ ' if name == selected_profile else ''}{name}",
+                callback_data=f"profile:{name}",
+            )
+            for name in profile_names()
+        ]
         keyboard = [
+            profiles,
             [InlineKeyboardButton("✅ Confirm", callback_data="confirm:confirm")],
         ] + self.build_navigation()
         return InlineKeyboardMarkup(keyboard)
@@ -206,6 +261,7 @@ class TelegramBot:
             "language",
             "tone",
             "additional_information",
+            "profile",
             "state_stack",
             "current_state",
         ]:
@@ -391,20 +447,10 @@ class TelegramBot:
 
         elif state == S.CONFIRM:
             user_data = context.user_data
-            text = (
-                "🔵🔵🔵🔵🔵🔵🔵🔵🔵🔵🔵\n\n"
-                "Thanks! Here's your configuration:\n\n"
-                f"- Topic or Task: {user_data.get('topic')}\n"
-                f"- Length: {user_data.get('length')}\n"
-                f"- Language Level: {user_data.get('language_level')}\n"
-                f"- Information Level: {user_data.get('information')}\n"
-                f"- Language: {user_data.get('language')}\n"
-                f"- Tone: {user_data.get('tone')}\n"
-                f"- Additional Information: {user_data.get('additional_information')}\n\n"
-                "If everything looks good, confirm to start generation."
-            )
+            text = self.build_summary_text(user_data) + self.CONFIRM_HINT
             sent = await message.reply_html(
-                text, reply_markup=self.build_confirm_keyboard()
+                text,
+                reply_markup=self.build_confirm_keyboard(user_data.get("profile")),
             )
             self.set_last_wizard_message(context, sent)
 
@@ -448,7 +494,7 @@ class TelegramBot:
                 update.message.text
             ]
             history = "\n".join(context.user_data["history"])
-            response = str(self.ai.invoke(history))
+            response = str(await self.ai.ainvoke(history))
             await update.message.reply_html(response)
             self.logger.debug(f"chat: answered with {str(response)}")
             context.user_data["history"].append(str(response))
@@ -749,6 +795,18 @@ class TelegramBot:
 
     # Step: Document
 
+    @staticmethod
+    def upload_path(chat_id, file_name: str) -> str:
+        """
+        Own path for every upload. Jobs index their files when they are
+        dispatched, so an upload with the same name from another chat must
+        not replace a file a queued job still points at.
+        """
+        folder = DOCUMENTS_DIR / str(chat_id)
+        folder.mkdir(parents=True, exist_ok=True)
+        name = Path(file_name or "document").name
+        return str(folder / f"{uuid.uuid4().hex[:12]}_{name}")
+
     async def document(self, update: Update, context: CallbackContext) -> int:
         """Processes document upload or skip with 'no'."""
         message = update.message
@@ -782,8 +840,7 @@ class TelegramBot:
                 )
                 return int(S.DOCUMENT)
 
-            DOCUMENTS_DIR.mkdir(parents=True, exist_ok=True)
-            file_path = str(DOCUMENTS_DIR / document.file_name)
+            file_path = self.upload_path(update.effective_chat.id, document.file_name)
 
             try:
                 file = await context.bot.get_file(document.file_id)
@@ -1012,250 +1069,359 @@ class TelegramBot:
 
     # Step: Confirm
 
-    async def confirm_button(self, update: Update, context: CallbackContext) -> int:
-        query = update.callback_query
-        data = query.data
-        await query.answer()
-        _, action = data.split(":", 1)
-        self.logger.debug(f"confirm_button: action={action}")
-
-        if action != "confirm":
-            await query.message.reply_text(
-                "Please use the Confirm button to start the generation."
-            )
-            return int(S.CONFIRM)
+    CONFIRM_HINT = (
+        "Pick a pipeline (fast = fewer steps, quality = all checks) or keep the "
+        "one chosen for the length. If everything looks good, confirm to start "
+        "generation."
+    )
 
-        user_data = context.user_data
-        summary_text = (
+    def build_summary_text(self, user_data: dict) -> str:
+        return (
             "🔵🔵🔵🔵🔵🔵🔵🔵🔵🔵🔵\n\n"
             "Thanks! Here's your configuration:\n\n"
             f"- Topic or Task: {user_data.get('topic')}\n"
             f"- Length: {user_data.get('length')}\n"
+            f"- Pipeline: {resolve_profile(user_data.get('length'), user_data.get('profile'))}\n"
             f"- Language Level: {user_data.get('language_level')}\n"
             f"- Information Level: {user_data.get('information')}\n"
             f"- Language: {user_data.get('language')}\n"
             f"- Tone: {user_data.get('tone')}\n"
             f"- Additional Information: {user_data.get('additional_information')}\n\n"
-            "✅ Selected: Confirm"
         )
 
-        await query.edit_message_text(summary_text)
+    def next_step_text(self, nodes: list, node_name: str) -> str:
+        """status line of the node that follows node_name in the run's profile."""
+        following = nodes[nodes.index(node_name) + 1 :] if node_name in nodes else []
+        if not following:
+            return "⏳ 📄 Finishing the article..."
+        return self.STEP_TEXTS.get(following[0], "⏳ Working...")
 
-        inputs = {
+    def build_graph_inputs(self, user_data: dict) -> dict:
+        """maps the wizard answers onto the initial AgentState."""
+        return {
             "topic": user_data.get("topic"),
-            "length": user_data.get("length"),
+            "target_len": user_data.get("length"),
             "language_level": user_data.get("language_level"),
             "information_level": user_data.get("information"),
             "language": user_data.get("language"),
             "tone": user_data.get("tone"),
-            "additional_information": user_data.get("additional_information"),
+            "additional_info": user_data.get("additional_information"),
+            "source_documents": list(user_data.get("file_paths", [])),
             "history": user_data.get("history", []),
+            "research_data": [],
+            "outline": [],
+            "draft": "",
+            "final_article": "",
+            "revision_count": 0,
+            "profile": resolve_profile(
+                target_len=user_data.get("length"), profile=user_data.get("profile")
+            ),
         }
 
+    async def enqueue_generation(
+        self, update: Update, context: CallbackContext
+    ) -> None:
+        """Puts the configured article into the generation queue."""
+        user_data = context.user_data
+        status_msg = await update.effective_message.reply_html(
+            "🚀 GENERATION STATUS\n\n⏳ Waiting for a free generation slot..."
+        )
+        job = GenerationJob(
+            chat_id=update.effective_chat.id,
+            user_id=update.effective_user.id,
+            inputs=self.build_graph_inputs(user_data),
+            file_paths=list(user_data.get("file_paths", [])),
+            status_message_id=status_msg.message_id,
+        )
+        await self.queue.submit(job)
+
+    async def report_queue_position(
+        self, job: GenerationJob, position: int, eta_seconds: float
+    ) -> None:
+        """Shows queue position and ETA in the job's status message."""
+        eta_minutes = max(1, round(eta_seconds / 60))
+        await self.edit_status(
+            job,
+            "🚀 GENERATION STATUS\n\n"
+            f"⏳ Queued at position {position}. Estimated start in ~{eta_minutes} min.",
+        )
+
+    async def edit_status(self, job: GenerationJob, text: str) -> None:
+        """
+        Shows text in the job's status message. While telegram rate limits
+        the chat, status edits are skipped like the live preview's, the next
+        status after the pause shows the current state again.
+        """
+        if time.monotonic() < self._status_paused_until.get(job.chat_id, 0):
+            return
         try:
-            file_paths = context.user_data.get("file_paths", [])
-            if file_paths:
-                await query.message.reply_text("📚 Indexing sources...")
-                setup_vectorstore(file_paths)
-
-            graph_inputs = {
-                "topic": inputs.get("topic"),
-                "target_len": inputs.get("length"),
-                "language_level": inputs.get("language_level"),
-                "information_level": inputs.get("information_level"),
-                "language": inputs.get("language"),
-                "tone": inputs.get("tone"),
-                "additional_info": inputs.get("additional_information"),
-                "source_documents": file_paths,
-                "history": inputs.get("history", []),
-                "research_data": [],
-                "outline": [],
-                "draft": "",
-                "final_article": "",
-                "revision_count": 0,
-            }
-
-            app = create_graph()
+            await self.bot.edit_message_text(
+                chat_id=job.chat_id, message_id=job.status_message_id, text=text
+            )
+        except RetryAfter as e:
+            delay = e.retry_after
+            if isinstance(delay, timedelta):
+                delay = delay.total_seconds()
+            self.logger.debug(f"edit_status: rate limited, pausing for {delay}s.")
+            self._status_paused_until[job.chat_id] = time.monotonic() + delay
+        except BadRequest as e:
+            self.logger.debug(f"edit_status: {e}")
 
-            status_text = "🚀 GENERATION STATUS\n\n"
-            status_msg = await update.effective_message.reply_html(
-                status_text + "⏳ 🕵️ Researcher is gathering information..."
+    async def index_sources(self, chat_id, file_paths, collection_name) -> None:
+        """Indexes the sources in the background and reports progress."""
+        status_msg = await self.bot.send_message(chat_id, "📚 Indexing sources...")
+
+        async def report(done: int, total: int, name: str):
+            try:
+                await status_msg.edit_text(
+                    f"📚 Indexing sources... ({done}/{total})\n✅ {name}"
+                )
+            except (BadRequest, RetryAfter) as e:
+                # progress is only informative, a rate limit skips this step
+                self.logger.debug(f"index_sources: {e}")
+
+        await asetup_vectorstore(file_paths, collection_name, progress=report)
+
+    async def run_generation_job(self, job: GenerationJob) -> None:
+        """
+        Runs the LangGraph workflow for one queued job. If the job's run was
+        interrupted (crash, restart, Ollama timeout), it continues from the
+        last checkpointed node instead of starting over.
+        """
+        profile = job.inputs.get("profile")
+        app = get_graph(profile)
+        nodes = get_profile(profile)["nodes"]
+        config = run_config(job.chat_id, job.job_id)
+        snapshot = await app.aget_state(config) if app.checkpointer else None
+        resuming = bool(snapshot and snapshot.next)
+        checkpointed = snapshot.values if resuming else {}
+        if not resuming and not job.inputs.get("topic"):
+            # a resume whose checkpoint is gone (finished, expired or resumed
+            # twice) has no inputs to start over with
+            self.logger.warning(
+                f"run_generation_job: nothing to resume for {job.job_id}."
             )
+            await self.edit_status(job, "⚠️ Nothing to resume for this article.")
+            return
+        collection_name = checkpointed.get("collection_name") or new_collection_name(
+            job.chat_id
+        )
+
+        try:
+            file_paths = job.file_paths or checkpointed.get("source_documents", [])
+            if file_paths and not checkpointed.get("research_data"):
+                await self.index_sources(job.chat_id, file_paths, collection_name)
 
-            final_state = graph_inputs
+            status_text = "🚀 GENERATION STATUS\n\n"
+            if resuming:
+                graph_inputs = None
+                final_state = dict(checkpointed)
+                status_text += "♻️ Resuming after the last completed step.\n"
+                await self.edit_status(job, status_text)
+            else:
+                graph_inputs = dict(job.inputs)
+                graph_inputs["collection_name"] = collection_name
+                final_state = graph_inputs
+                await self.edit_status(
+                    job, status_text + "⏳ 🕵️ Researcher is gathering information..."
+                )
 
-            async for output in app.astream(graph_inputs):
-                for node_name, state_update in output.items():
+            streaming_cfg = get_app_config().get("streaming", {})
+            streamed_nodes = streaming_cfg.get("nodes", [])
+            edit_interval = streaming_cfg.get("edit_interval_seconds", 1.5)
+            previews = {}
+
+            async for mode, chunk in app.astream(
+                graph_inputs, config, stream_mode=["updates", "messages"]
+            ):
+                if mode == "messages":
+                    message, metadata = chunk
+                    node_name = metadata.get("langgraph_node")
+                    if node_name not in streamed_nodes or not message.content:
+                        continue
+                    if node_name not in previews:
+                        header = self.PREVIEW_HEADERS.get(node_name, node_name)
+                        previews[node_name] = LivePreview(
+                            self.bot,
+                            job.chat_id,
+                            header=f"{header}\n\n",
+                            min_interval=edit_interval,
+                        )
+                    await previews[node_name].push(message.content)
+                    continue
+
+                for node_name, state_update in chunk.items():
                     final_state.update(state_update)
+                    if node_name in previews:
+                        await previews.pop(node_name).close()
 
                     if node_name == "researcher":
                         status_text += "✅ 🕵️ Researcher finished.\n"
-                        await status_msg.edit_text(
-                            status_text + "⏳ 🏗️ Editor is creating the outline..."
+                        await self.edit_status(
+                            job, status_text + self.next_step_text(nodes, node_name)
                         )
 
                     elif node_name == "editor":
                         status_text += "✅ 🏗️ Editor finished.\n"
-                        await status_msg.edit_text(
-                            status_text + "⏳ ✍️ Writer is drafting the article..."
+                        await self.edit_status(
+                            job, status_text + self.next_step_text(nodes, node_name)
                         )
 
                     elif node_name == "writer":
                         status_text += "✅ ✍️ Writer finished.\n"
-                        await status_msg.edit_text(
-                            status_text + "⏳ ⚖️ Fact Checker is verifying facts..."
+                        await self.edit_status(
+                            job, status_text + self.next_step_text(nodes, node_name)
                         )
 
                     elif node_name == "fact_checker":
                         status_text += "✅ ⚖️ Fact Checker finished.\n"
-                        critique = state_update.get("critique", "").strip().upper()
                         rev_count = state_update.get("revision_count", 0)
 
-                        if (
-                            critique == "PASS"
-                            or critique.startswith("PASS")
-                            or critique == ""
-                            or rev_count >= 2
-                        ):
-                            await status_msg.edit_text(
-                                status_text
-                                + "⏳ ✨ Polisher is formatting the final text..."
+                        if state_update.get("final_article"):
+                            status_text += "✅ ✨ Polisher finished (in parallel).\n"
+                            await self.edit_status(
+                                job, status_text + "🎉 Generation complete!"
+                            )
+                        elif not needs_rewrite(final_state):
+                            await self.edit_status(
+                                job, status_text + self.next_step_text(nodes, node_name)
                             )
                         else:
-                            await status_msg.edit_text(
+                            await self.edit_status(
+                                job,
                                 status_text
-                                + f"⚠️ ✍️ Fact Checker found errors! Writer is rewriting (Revision {rev_count})..."
+                                + f"⚠️ ✍️ Fact Checker found errors! Writer is rewriting (Revision {rev_count})...",
                             )
 
                     elif node_name == "polisher":
                         status_text += "✅ ✨ Polisher finished.\n"
-                        await status_msg.edit_text(
-                            status_text + "🎉 Generation complete!"
+                        await self.edit_status(
+                            job, status_text + "🎉 Generation complete!"
+                        )
+
+                    elif node_name == "publish":
+                        await self.edit_status(
+                            job, status_text + "🎉 Generation complete!"
                         )
 
             final_text = final_state.get("final_article", "⚠️ No article generated.")
 
-            article_title = inputs.get("topic") or "Article"
-            await self.send_file_response(update, final_text, article_title)
+            article_title = final_state.get("topic") or "Article"
+            await self.send_file_response(job.chat_id, final_text, article_title)
 
-            self.logger.debug("confirm_button: Graph run successful.")
+            if app.checkpointer:
+                await app.checkpointer.adelete_thread(
+                    config["configurable"]["thread_id"]
+                )
+            self.logger.debug(f"run_generation_job: job {job.job_id} successful.")
 
         except Exception as e:
-            self.logger.exception(f"confirm_button: error during crew run: {e}")
-            await query.message.reply_text(
-                "⚠️ An error occurred while generating the article. Please try again."
+            self.logger.exception(f"run_generation_job: error during graph run: {e}")
+            reply_markup = None
+            if app.checkpointer:
+                reply_markup = InlineKeyboardMarkup(
+                    [
+                        [
+                            InlineKeyboardButton(
+                                "♻️ Resume",
+                                callback_data=f"resume:{job.job_id}:{profile or ''}",
+                            )
+                        ]
+                    ]
+                )
+            await self.bot.send_message(
+                job.chat_id,
+                "⚠️ An error occurred while generating the article. Please try again.",
+                reply_markup=reply_markup,
             )
+        finally:
+            drop_vectorstore(collection_name)
 
-        return ConversationHandler.END
-
-    async def confirm(self, update: Update, context: CallbackContext) -> int:
-        text = (update.message.text or "").strip().lower()
-        self.logger.debug(f"confirm: {text}")
+    async def resume_button(self, update: Update, context: CallbackContext) -> None:
+        """Queues an interrupted run again, it continues from its checkpoint."""
+        query = update.callback_query
+        await query.answer()
+        _, job_id, *rest = query.data.split(":")
+        profile = rest[0] if rest and rest[0] else None
+        self.logger.debug(f"resume_button: job={job_id} profile={profile}")
 
-        if text in ("yes", "y", "ja"):
+        if self.queue.contains(job_id):
+            # double tap, the first one queued the run already
+            return
+        config = run_config(query.message.chat_id, job_id)
+        snapshot = await get_graph(profile).aget_state(config)
+        if not snapshot.next:
+            await query.edit_message_text("Nothing to resume for this article.")
+            return
 
-            inputs = {
-                "topic": context.user_data.get("topic"),
-                "length": context.user_data.get("length"),
-                "language_level": context.user_data.get("language_level"),
-                "information_level": context.user_data.get("information"),
-                "language": context.user_data.get("language"),
-                "tone": context.user_data.get("tone"),
-                "additional_information": context.user_data.get(
-                    "additional_information"
-                ),
-                "history": context.user_data.get("history", []),
-            }
+        await query.edit_message_reply_markup(reply_markup=None)
+        status_msg = await query.message.reply_text(
+            "🚀 GENERATION STATUS\n\n⏳ Waiting for a free generation slot..."
+        )
+        job = GenerationJob(
+            chat_id=query.message.chat_id,
+            user_id=update.effective_user.id,
+            inputs={"profile": profile} if profile else {},
+            status_message_id=status_msg.message_id,
+            job_id=job_id,
+        )
+        await self.queue.submit(job)
 
-            try:
+    async def confirm_button(self, update: Update, context: CallbackContext) -> int:
+        query = update.callback_query
+        data = query.data
+        await query.answer()
+        _, action = data.split(":", 1)
+        self.logger.debug(f"confirm_button: action={action}")
 
-                file_paths = context.user_data.get("file_paths", [])
-                if file_paths:
-                    await update.message.reply_text("📚 Indexing sources...")
-                    setup_vectorstore(file_paths)
-
-                graph_inputs = {
-                    "topic": inputs.get("topic"),
-                    "target_len": inputs.get("length"),
-                    "language_level": inputs.get("language_level"),
-                    "information_level": inputs.get("information_level"),
-                    "language": inputs.get("language"),
-                    "tone": inputs.get("tone"),
-                    "additional_info": inputs.get("additional_information"),
-                    "source_documents": file_paths,
-                    "history": inputs.get("history", []),
-                    "research_data": [],
-                    "outline": [],
-                    "draft": "",
-                    "final_article": "",
-                    "revision_count": 0,
-                }
-
-                app = create_graph()
-                status_text = "🚀 GENERATION STATUS\n\n"
-                status_msg = await update.effective_message.reply_html(
-                    status_text + "⏳ 🕵️ Researcher is gathering information..."
-                )
+        if action != "confirm":
+            await query.message.reply_text(
+                "Please use the Confirm button to start the generation."
+            )
+            return int(S.CONFIRM)
 
-                final_state = graph_inputs
+        summary_text = self.build_summary_text(context.user_data)
+        await query.edit_message_text(summary_text + "✅ Selected: Confirm")
 
-                async for output in app.astream(graph_inputs):
-                    for node_name, state_update in output.items():
-                        final_state.update(state_update)
+        try:
+            await self.enqueue_generation(update, context)
+        except Exception as e:
+            self.logger.exception(f"confirm_button: error while queueing: {e}")
+            await query.message.reply_text(
+                "⚠️ An error occurred while generating the article. Please try again."
+            )
 
-                        if node_name == "researcher":
-                            status_text += "✅ 🕵️ Researcher finished.\n"
-                            await status_msg.edit_text(
-                                status_text + "⏳ 🏗️ Editor is creating the outline..."
-                            )
+        return ConversationHandler.END
 
-                        elif node_name == "editor":
-                            status_text += "✅ 🏗️ Editor finished.\n"
-                            await status_msg.edit_text(
-                                status_text + "⏳ ✍️ Writer is drafting the article..."
-                            )
+    async def profile_button(self, update: Update, context: CallbackContext) -> int:
+        """sets the pipeline profile from the confirm screen."""
+        query = update.callback_query
+        await query.answer()
+        _, profile = query.data.split(":", 1)
+        self.logger.debug(f"profile_button: profile={profile}")
 
-                        elif node_name == "writer":
-                            status_text += "✅ ✍️ Writer finished.\n"
-                            await status_msg.edit_text(
-                                status_text + "⏳ ⚖️ Fact Checker is verifying facts..."
-                            )
+        context.user_data["profile"] = profile
+        await query.edit_message_text(
+            self.build_summary_text(context.user_data) + self.CONFIRM_HINT,
+            reply_markup=self.build_confirm_keyboard(profile),
+        )
+        return int(S.CONFIRM)
 
-                        elif node_name == "fact_checker":
-                            status_text += "✅ ⚖️ Fact Checker finished.\n"
-                            critique = state_update.get("critique", "").strip().upper()
-                            rev_count = state_update.get("revision_count", 0)
-
-                            if (
-                                critique == "PASS"
-                                or critique.startswith("PASS")
-                                or critique == ""
-                                or rev_count >= 2
-                            ):
-                                await status_msg.edit_text(
-                                    status_text
-                                    + "⏳ ✨ Polisher is formatting the final text..."
-                                )
-                            else:
-                                await status_msg.edit_text(
-                                    status_text
-                                    + f"⚠️ ✍️ Fact Checker found errors! Writer is rewriting (Revision {rev_count})..."
-                                )
-
-                        elif node_name == "polisher":
-                            status_text += "✅ ✨ Polisher finished.\n"
-                            await status_msg.edit_text(
-                                status_text + "🎉 Generation complete!"
-                            )
+    async def confirm(self, update: Update, context: CallbackContext) -> int:
+        text = (update.message.text or "").strip().lower()
+        self.logger.debug(f"confirm: {text}")
 
-                final_text = final_state.get("final_article", "⚠️ No article generated.")
+        if text in profile_names():
+            context.user_data["profile"] = text
+            await self.ask_state_question(update, context, S.CONFIRM)
+            return int(S.CONFIRM)
 
-                article_title = inputs.get("topic") or "Article"
-                await self.send_file_response(update, final_text, article_title)
-                self.logger.debug("confirm: Graph run successful.")
+        if text in ("yes", "y", "ja"):
 
+            try:
+                await self.enqueue_generation(update, context)
             except Exception as e:
-                self.logger.error(f"confirm: graph error {e}", exc_info=True)
+                self.logger.error(f"confirm: queue error {e}", exc_info=True)
                 await update.message.reply_text(
                     "❌ An error occurred during article generation. Please try again."
                 )
@@ -1294,7 +1460,7 @@ class TelegramBot:
                 chat_id=update.effective_chat.id, action="typing"
             )
 
-            response = str(self.ai.invoke(history_str))
+            response = str(await self.ai.ainvoke(history_str))
             context.user_data["history"].append(response)
 
             sent = await update.message.reply_text(
@@ -1310,7 +1476,7 @@ class TelegramBot:
 
         return int(S.FREE_CHAT)
 
-    async def send_file_response(self, update: Update, content: str, topic: str):
+    async def send_file_response(self, chat_id: int, content: str, topic: str):
         """
         creates md.-file of the finished blog-post, hands it to the user and deletes data afterwards.
         """
@@ -1323,28 +1489,32 @@ class TelegramBot:
             safe_topic = "Blog_Draft"
 
         filename = f"{safe_topic}.md"
+        DOCUMENTS_DIR.mkdir(parents=True, exist_ok=True)
         file_path = DOCUMENTS_DIR / filename
 
         try:
             with open(file_path, "w", encoding="utf-8") as f:
                 f.write(content)
 
-            await update.effective_message.reply_text(
-                "✅ FINISHED! Here is your draft as md.-file:"
+            await self.bot.send_message(
+                chat_id, "✅ FINISHED! Here is your draft as md.-file:"
             )
 
-            await update.effective_message.reply_document(
-                document=file_path, filename=filename, caption=f"📄 Draft: {safe_topic}"
+            await self.bot.send_document(
+                chat_id,
+                document=file_path,
+                filename=filename,
+                caption=f"📄 Draft: {safe_topic}",
             )
             self.logger.info(f"File sent successfully: {filename}")
 
         except Exception as e:
             self.logger.error(f"Failed to send file: {e}")
-            await update.effective_message.reply_text(
-                "⚠️ Failed to send file. Trying as blank text..."
+            await self.bot.send_message(
+                chat_id, "⚠️ Failed to send file. Trying as blank text..."
             )
 
-            await update.effective_message.reply_text(content[:4000])
+            await self.bot.send_message(chat_id, content[:4000])
 
         finally:
 
@@ -1356,9 +1526,45 @@ class TelegramBot:
 
     # Start bot
 
+    async def post_init(self, application: Application) -> None:
+        """Starts the generation queue once the bot is connected."""
+        self.bot = application.bot
+
+        timings = benchmark_graph_build()
+        self.logger.info(
+            "⏱️ Graph setup per request: "
+            f"{timings['compile_per_request_ms']:.1f} ms when compiled per run, "
+            f"{timings['shared_graph_ms']:.3f} ms with the shared graph."
+        )
+
+        await open_checkpointer()
+        ttl = get_app_config().get("queue", {}).get("checkpoint_ttl_hours", 72)
+        removed = await drop_stale_checkpoints(ttl)
+        if removed:
+            self.logger.info(f"Removed checkpoints of {removed} stale run(s).")
+        await self.queue.start()
+
+    async def post_shutdown(self, application: Application) -> None:
+        await self.queue.stop()
+        await close_checkpointer()
+
     def start_bot(self) -> None:
         """Builds and starts the Telegram bot with the conversation handler."""
-        application = Application.builder().token(self.token).build()
+        config_service.start_watcher()
+        removed = drop_stale_collections()
+        if removed:
+            self.logger.info(f"Removed {removed} stale run collection(s).")
+
+        application = (
+            Application.builder()
+            .token(self.token)
+            .post_init(self.post_init)
+            .post_shutdown(self.post_shutdown)
+            # handlers await LLM calls (free chat, queued article runs); without
+            # this PTB handles one update at a time and every other chat waits
+            .concurrent_updates(True)
+            .build()
+        )
 
         conv_handler = ConversationHandler(
             entry_points=[
@@ -1473,6 +1679,7 @@ class TelegramBot:
                 S.CONFIRM: [
                     CallbackQueryHandler(self.handle_navigation, pattern="^nav_"),
                     CallbackQueryHandler(self.confirm_button, pattern="^confirm:"),
+                    CallbackQueryHandler(self.profile_button, pattern="^profile:"),
                     MessageHandler(
                         filters.TEXT & ~filters.COMMAND,
                         self.confirm,
@@ -1486,4 +1693,7 @@ class TelegramBot:
         application.add_handler(CommandHandler("start", self.start))
         application.add_handler(CommandHandler("chat", self.chat))
         application.add_handler(conv_handler)
+        application.add_handler(
+            CallbackQueryHandler(self.resume_button, pattern="^resume:")
+        )
         application.run_polling()
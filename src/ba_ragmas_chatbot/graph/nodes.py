@@ -1,60 +1,128 @@
+import asyncio
+from collections import OrderedDict
+from typing import Optional
 from datetime import datetime
-from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.messages import HumanMessage
+from langgraph.constants import TAG_NOSTREAM
 from ba_ragmas_chatbot.graph.state import AgentState
-from ba_ragmas_chatbot.llm.factory import get_llm_for_agent
-from ba_ragmas_chatbot.graph.utils import get_agent_config, get_task_config
+from ba_ragmas_chatbot.graph.prompts import Prompt
+from ba_ragmas_chatbot.graph.sections import (
+    article_title,
+    join_sections,
+    parse_outline,
+    split_draft,
+)
+from ba_ragmas_chatbot.graph.verdict import (
+    VERDICT_SCHEMA,
+    Issue,
+    feedback_by_section,
+    format_critique,
+    format_issue,
+    needs_rewrite,
+    parse_verdict,
+)
+from ba_ragmas_chatbot.llm.factory import aget_llm_for_agent, context_budget
+from ba_ragmas_chatbot.graph.utils import (
+    get_agent_config,
+    get_task_config,
+    get_app_config,
+)
 from ba_ragmas_chatbot.tools.vectorstore import get_retriever
 from ba_ragmas_chatbot.tools.search_tool import perform_web_search
+from ba_ragmas_chatbot.tools.keywords import extract_keywords
+from ba_ragmas_chatbot.tools.research_cache import (
+    lookup_briefing,
+    sources_fingerprint,
+    store_briefing,
+    topic_embedding,
+)
 from ba_ragmas_chatbot import logger_config
 
 logger = logger_config.get_logger("GraphNodes")
 
+SEARCH_QUERY_CACHE_SIZE = 256
+_search_query_cache: "OrderedDict[tuple, str]" = OrderedDict()
 
-def research_node(state: AgentState):
-    """
-    Fetches context from vector store AND/OR Web Search.
-    Distinguishes clearly between Local Docs (High Trust) and Web (Low Trust).
-    """
-    topic = state["topic"]
-    logger.info(f"🕵️ RESEARCHER started for topic: {topic}")
 
-    agent_cfg = get_agent_config("researcher")
-    task_cfg = get_task_config("research_task")
-    current_date = datetime.now().strftime("%d. %B %Y")
+async def _with_timeout(coro, seconds: float, label: str) -> str:
+    """awaits one research branch, an empty context if it takes too long."""
+    try:
+        return await asyncio.wait_for(coro, timeout=seconds)
+    except asyncio.TimeoutError:
+        logger.error(f"⚠️ {label} timed out after {seconds}s.")
+        return ""
+
+
+async def _retrieve_local_context(state: AgentState, topic: str) -> str:
+    """chunks of the uploaded documents that match the topic."""
+    if not state.get("source_documents"):
+        return ""
+    retriever = await asyncio.to_thread(
+        get_retriever, state.get("collection_name"), k=4
+    )
+    if not retriever:
+        return ""
 
-    local_context = ""
-    retriever = get_retriever(k=4)
-    has_documents = bool(state.get("source_documents"))
+    logger.info("   🔍 Search local documents...")
+    try:
+        docs = await retriever.ainvoke(topic)
+        if docs:
+            logger.info(f"   ✅ {len(docs)} Document-Chunks found.")
+            return "\n".join([f"- {d.page_content}" for d in docs])
+        logger.info("   ❌ Found no relevant documents.")
+    except Exception as e:
+        logger.error(f"⚠️ Retrieval failed: {e}")
+    return ""
 
-    if retriever and has_documents:
-        logger.info("   🔍 Search local documents...")
-        try:
-            docs = retriever.invoke(topic)
-            if docs:
-                logger.info(f"   ✅ {len(docs)} Document-Chunks found.")
-                local_context = "\n".join([f"- {d.page_content}" for d in docs])
-            else:
-                logger.info("   ❌ Found no relevant documents.")
-        except Exception as e:
-            logger.error(f"⚠️ Retrieval failed: {e}")
 
-    web_context = ""
+async def _llm_search_query(topic: str) -> str:
+    query_llm = await aget_llm_for_agent("researcher")
+    query_prompt = f"Extract a concise 3-4 word search query for a web search engine from the topic below. Output ONLY the search query words, nothing else. Do not use quotation marks.\n\nTopic: {topic}"
+
+    query_response = await query_llm.ainvoke([HumanMessage(content=query_prompt)])
+    return query_response.content.strip().replace('"', "")
+
+
+async def build_search_query(topic: str) -> str:
+    """
+    Turns the topic into a short web search query.
+    Keywords are extracted in-process, the LLM is only asked when the
+    extractor finds nothing (or search_query_mode is "llm"). Queries are
+    kept in an LRU cache per topic.
+    """
+    research_cfg = get_app_config().get("research", {})
+    mode = research_cfg.get("search_query_mode", "keywords")
+    key = (mode, topic.strip().lower())
+    if key in _search_query_cache:
+        _search_query_cache.move_to_end(key)
+        return _search_query_cache[key]
+
+    search_query = extract_keywords(topic) if mode == "keywords" else ""
+    if not search_query and (
+        mode == "llm" or research_cfg.get("llm_query_fallback", True)
+    ):
+        search_query = await _llm_search_query(topic)
+    search_query = search_query or topic
+
+    _search_query_cache[key] = search_query
+    while len(_search_query_cache) > SEARCH_QUERY_CACHE_SIZE:
+        _search_query_cache.popitem(last=False)
+    return search_query
+
+
+async def _search_web_context(topic: str) -> str:
+    """builds a search query for the topic and formats the web results."""
     logger.info(f"🌍 Search web for: {topic}")
     try:
-        query_llm = get_llm_for_agent("researcher")
-        query_prompt = f"Extract a concise 3-4 word search query for a web search engine from this topic: '{topic}'. Output ONLY the search query words, nothing else. Do not use quotation marks."
-
-        search_query = (
-            query_llm.invoke([HumanMessage(content=query_prompt)])
-            .content.strip()
-            .replace('"', "")
-        )
+        search_query = await build_search_query(topic)
         logger.info(f"🌍 Executing Web Search with optimized query: {search_query}")
 
-        web_results = perform_web_search(search_query, max_results=3)
+        web_results = await asyncio.to_thread(
+            perform_web_search, search_query, max_results=3
+        )
         if web_results:
             logger.info(f"✅ {len(web_results)} Web-results found.")
-            web_context = "\n".join(
+            return "\n".join(
                 [
                     f"Title: {r['title']}\nContent: {r['body']}\nSource: {r['href']}"
                     for r in web_results
@@ -62,6 +130,62 @@ def research_node(state: AgentState):
             )
     except Exception as e:
         logger.error(f"⚠️ Web search failed: {e}")
+    return ""
+
+
+async def _research_cache_key(state: AgentState):
+    """(topic embedding, sources hash, language) or None if the cache is off."""
+    if not get_app_config().get("research_cache", {}).get("enabled", True):
+        return None
+    try:
+        embedding = await asyncio.to_thread(topic_embedding, state["topic"])
+        fingerprint = await asyncio.to_thread(
+            sources_fingerprint, state.get("source_documents")
+        )
+    except Exception as e:
+        logger.error(f"⚠️ Research cache unavailable: {e}")
+        return None
+    return embedding, fingerprint, state.get("language") or ""
+
+
+async def research_node(state: AgentState):
+    """
+    Fetches context from vector store AND/OR Web Search.
+    Distinguishes clearly between Local Docs (High Trust) and Web (Low Trust).
+    Both sources are queried concurrently, each with its own timeout.
+    Briefings are cached; a similar earlier topic with the same documents
+    and language skips the whole research step.
+    """
+    topic = state["topic"]
+    logger.info(f"🕵️ RESEARCHER started for topic: {topic}")
+
+    cache_key = await _research_cache_key(state)
+    if cache_key:
+        cached = await asyncio.to_thread(lookup_briefing, *cache_key)
+        if cached:
+            logger.info("♻️ Research briefing loaded from cache.")
+            return {
+                "research_data": [cached],
+                "current_status": "Research loaded from cache.",
+            }
+
+    agent_cfg = get_agent_config("researcher")
+    task_cfg = get_task_config("research_task")
+    current_date = datetime.now().strftime("%d. %B %Y")
+
+    research_cfg = get_app_config().get("research", {})
+    local_context, web_context = await asyncio.gather(
+        _with_timeout(
+            _retrieve_local_context(state, topic),
+            research_cfg.get("retrieval_timeout_seconds", 30),
+            "Retrieval",
+        ),
+        _with_timeout(
+            _search_web_context(topic),
+            research_cfg.get("web_search_timeout_seconds", 60),
+            "Web search",
+        ),
+    )
 
     final_context = ""
 
@@ -77,62 +201,236 @@ def research_node(state: AgentState):
         )
 
     system_prompt = agent_cfg["role"].format(topic=topic, language=state["language"])
-    system_prompt += f"\n\nCurrent Date: {current_date}"
     system_prompt += f"\n\nBackstory: {agent_cfg['backstory'].format(topic=topic, current_date=current_date)}"
 
-    user_prompt = task_cfg["description"].format(topic=topic, current_date=current_date)
-    user_prompt += f"\n\n### AVAILABLE KNOWLEDGE ###\n{final_context}"
-    user_prompt += "\n\nINSTRUCTION: Distinguish clearly between facts from Local Documents and Web Search in your briefing."
-    user_prompt += f"\n\nEXPECTED OUTPUT:\n{task_cfg['expected_output'].format(topic=topic, language=state['language'])}"
+    knowledge = f"### AVAILABLE KNOWLEDGE ###\n{final_context}"
+    prompt = Prompt(
+        system=system_prompt,
+        static=[
+            task_cfg["description"].format(topic=topic, current_date=current_date),
+            "INSTRUCTION: Distinguish clearly between facts from Local Documents and Web Search in your briefing.",
+            f"EXPECTED OUTPUT:\n{task_cfg['expected_output'].format(topic=topic, language=state['language'])}",
+        ],
+        run=[f"Current Date: {current_date}", knowledge],
+        trimmable=[knowledge],
+    )
+    prompt, context_tokens = context_budget.fit(
+        "researcher", prompt, state.get("profile")
+    )
 
-    llm = get_llm_for_agent("researcher")
-    logger.info("🤖 Researcher is thinking...")
-    response = llm.invoke(
-        [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+    llm = await aget_llm_for_agent(
+        "researcher", context_tokens=context_tokens, profile=state.get("profile")
     )
+    logger.info("🤖 Researcher is thinking...")
+    response = await llm.ainvoke(prompt.messages())
 
     logger.info(f"📝 RESEARCHER OUTPUT:\n{response.content[:500]}...\n(truncated)")
 
+    if cache_key:
+        await asyncio.to_thread(
+            store_briefing, *cache_key, topic=topic, briefing=response.content
+        )
+
     return {
         "research_data": [response.content],
         "current_status": "Research completed.",
     }
 
 
-def editor_node(state: AgentState):
+async def editor_node(state: AgentState):
     logger.info("🏗️ EDITOR started.")
 
     agent_cfg = get_agent_config("editor")
     task_cfg = get_task_config("editor_task")
     research_summary = "\n".join(state.get("research_data", []))
+    material = f"RESEARCH MATERIAL:\n{research_summary}"
 
     system_prompt = agent_cfg["role"].format(
         topic=state["topic"], language=state["language"]
     )
 
-    user_prompt = task_cfg["description"].format(
-        topic=state["topic"],
-        length=state["target_len"],
-        information_level=state["information_level"],
-        language_level=state["language_level"],
-        tone=state["tone"],
-        language=state["language"],
-        additional_information=state["additional_info"],
+    prompt = Prompt(
+        system=system_prompt,
+        static=[
+            task_cfg["description"].format(
+                topic=state["topic"],
+                length=state["target_len"],
+                information_level=state["information_level"],
+                language_level=state["language_level"],
+                tone=state["tone"],
+                language=state["language"],
+                additional_information=state["additional_info"],
+            ),
+            f"EXPECTED OUTPUT:\n{task_cfg['expected_output']}",
+        ],
+        run=[material],
+        trimmable=[material],
     )
-    user_prompt += f"\n\nRESEARCH MATERIAL:\n{research_summary}"
-    user_prompt += f"\n\nEXPECTED OUTPUT:\n{task_cfg['expected_output']}"
+    prompt, context_tokens = context_budget.fit("editor", prompt, state.get("profile"))
 
-    llm = get_llm_for_agent("editor")
-    response = llm.invoke(
-        [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+    llm = await aget_llm_for_agent(
+        "editor", context_tokens=context_tokens, profile=state.get("profile")
     )
+    response = await llm.ainvoke(prompt.messages())
 
     logger.info(f"📝 EDITOR OUTLINE:\n{response.content}")
 
     return {"outline": [response.content], "current_status": "Outline created."}
 
 
-def writer_node(state: AgentState):
+def _use_section_writer(state: AgentState) -> bool:
+    writer_cfg = get_app_config().get("writer", {})
+    mode = writer_cfg.get("mode", "auto")
+    if mode == "auto":
+        target_len = str(state.get("target_len") or "").strip().lower()
+        return target_len in writer_cfg.get("section_lengths", ["long"])
+    return mode == "sections"
+
+
+def _section_prompt(prompt: Prompt, sections, index) -> Prompt:
+    section = sections[index]
+    return prompt.extend(
+        f"WRITE ONLY SECTION {index + 1} OF {len(sections)}: {section['title']}\n{section['points']}",
+        f"Start with the headline '## {section['title']}'. The other sections are written separately, so cover only this part and keep it to roughly 1/{len(sections)} of the article length. Do not add a conclusion for the whole article unless this section is the conclusion.",
+    )
+
+
+async def _write_section(llm, section_prompt: Prompt, index, total, semaphore) -> str:
+    async with semaphore:
+        response = await llm.ainvoke(
+            section_prompt.messages(), config={"tags": [TAG_NOSTREAM]}
+        )
+    logger.info(f"   ✅ Section {index + 1}/{total} written.")
+    return response.content.strip()
+
+
+async def _write_transition(llm, previous: str, following: str, language: str) -> str:
+    prompt = f"Write ONE short sentence in {language} that leads from the end of this blog section to the next one. Output ONLY the sentence.\n\n--- END OF SECTION ---\n{previous[-600:]}\n\n--- NEXT SECTION ---\n{following[:600]}"
+    response = await llm.ainvoke(
+        [HumanMessage(content=prompt)], config={"tags": [TAG_NOSTREAM]}
+    )
+    return response.content.strip()
+
+
+def _largest(fitted) -> Optional[int]:
+    """context tokens of the largest of several fitted prompts sent on one llm."""
+    tokens = [context_tokens for _, context_tokens in fitted if context_tokens]
+    return max(tokens) if tokens else None
+
+
+async def write_sections(state: AgentState, prompt: Prompt):
+    """
+    Map-reduce writer: every outline section is written as its own request,
+    all sections concurrently (bounded by writer.max_parallel_sections).
+    The sections are then joined with short generated transitions.
+    Returns None if the outline has no usable sections.
+    """
+    outline_str = "\n".join(state.get("outline", []))
+    sections = parse_outline(outline_str)
+    if not sections:
+        return None
+
+    writer_cfg = get_app_config().get("writer", {})
+    semaphore = asyncio.Semaphore(max(1, writer_cfg.get("max_parallel_sections", 4)))
+    fitted = [
+        context_budget.fit(
+            "writer", _section_prompt(prompt, sections, i), state.get("profile")
+        )
+        for i in range(len(sections))
+    ]
+    llm = await aget_llm_for_agent(
+        "writer", context_tokens=_largest(fitted), profile=state.get("profile")
+    )
+    logger.info(f"✍️ Writing {len(sections)} sections in parallel...")
+
+    texts = await asyncio.gather(
+        *[
+            _write_section(llm, section_prompt, i, len(sections), semaphore)
+            for i, (section_prompt, _) in enumerate(fitted)
+        ]
+    )
+
+    if writer_cfg.get("transitions", True):
+        transitions = await asyncio.gather(
+            *[
+                _write_transition(llm, texts[i], texts[i + 1], state["language"])
+                for i in range(len(texts) - 1)
+            ]
+        )
+        texts = [
+            f"{text}\n\n{transitions[i]}" if i < len(transitions) else text
+            for i, text in enumerate(texts)
+        ]
+
+    title = article_title(outline_str)
+    parts = ([f"# {title}"] if title else []) + list(texts)
+    return "\n\n".join(parts)
+
+
+def _revision_prompt(prompt: Prompt, section, feedback) -> Prompt:
+    return prompt.extend(
+        "⚠️ THIS SECTION OF YOUR DRAFT HAD ERRORS. PLEASE FIX THEM BASED ON THIS CRITIQUE:\n"
+        + "\n".join(feedback),
+        f"--- SECTION TO REWRITE ---\n{section}",
+        "Rewrite ONLY this section and keep its headline. Output ONLY the corrected section.",
+    )
+
+
+async def _revise_section(llm, revision_prompt: Prompt, semaphore) -> str:
+    async with semaphore:
+        response = await llm.ainvoke(
+            revision_prompt.messages(), config={"tags": [TAG_NOSTREAM]}
+        )
+    return response.content.strip()
+
+
+async def revise_sections(state: AgentState, prompt: Prompt):
+    """
+    Regenerates only the sections the fact checker flagged, all flagged
+    sections concurrently; the other sections are kept as they are.
+    Returns None if the draft cannot be split or nothing was flagged.
+    """
+    parts = split_draft(state.get("draft", ""))
+    flagged = [
+        i for i in state.get("flagged_sections") or [] if parts and i < len(parts)
+    ]
+    if not flagged:
+        return None
+
+    issues = [Issue.model_validate(i) for i in state.get("blocking_issues") or []]
+    feedback = feedback_by_section(issues, flagged)
+    writer_cfg = get_app_config().get("writer", {})
+    semaphore = asyncio.Semaphore(max(1, writer_cfg.get("max_parallel_sections", 4)))
+    fitted = [
+        context_budget.fit(
+            "writer",
+            _revision_prompt(prompt, parts[i], feedback[i]),
+            state.get("profile"),
+        )
+        for i in flagged
+    ]
+    llm = await aget_llm_for_agent(
+        "writer", context_tokens=_largest(fitted), profile=state.get("profile")
+    )
+    logger.info(f"✍️ Rewriting {len(flagged)} of {len(parts)} sections...")
+
+    revised = await asyncio.gather(
+        *[
+            _revise_section(llm, revision_prompt, semaphore)
+            for revision_prompt, _ in fitted
+        ]
+    )
+    for index, text in zip(flagged, revised):
+        parts[index] = text
+
+    return {
+        "draft": join_sections(parts),
+        "changed_sections": flagged,
+        "current_status": "Draft revised.",
+    }
+
+
+async def writer_node(state: AgentState):
     logger.info("✍️ WRITER started.")
 
     agent_cfg = get_agent_config("writer")
@@ -145,33 +443,77 @@ def writer_node(state: AgentState):
         topic=state["topic"], language=state["language"]
     )
 
-    user_prompt = task_cfg["description"].format(
-        topic=state["topic"],
-        length=state["target_len"],
-        information_level=state["information_level"],
-        language_level=state["language_level"],
-        tone=state["tone"],
-        language=state["language"],
-        additional_information=state["additional_info"],
+    run = [f"OUTLINE TO FOLLOW:\n{outline_str}"]
+    trimmable = []
+    if not outline_str.strip():
+        # profiles without editor: the writer structures the briefing itself
+        briefing = "RESEARCH BRIEFING:\n" + "\n".join(state.get("research_data", []))
+        run = [
+            briefing,
+            "There is no outline. Structure the article yourself with a title and a few sections.",
+        ]
+        trimmable = [briefing]
+
+    prompt = Prompt(
+        system=system_prompt,
+        static=[
+            task_cfg["description"].format(
+                topic=state["topic"],
+                length=state["target_len"],
+                information_level=state["information_level"],
+                language_level=state["language_level"],
+                tone=state["tone"],
+                language=state["language"],
+                additional_information=state["additional_info"],
+            )
+        ],
+        run=run,
+        trimmable=trimmable,
     )
-    user_prompt += f"\n\nOUTLINE TO FOLLOW:\n{outline_str}"
 
-    if critique and "PASS" not in critique.upper():
+    if state.get("blocking_issues"):
         logger.warning(
             "⚠️ Writer has to rewrite draft because of alert from fact Checker!"
         )
-        user_prompt += f"\n\n⚠️ YOUR PREVIOUS DRAFT HAD ERRORS. PLEASE FIX THEM BASED ON THIS CRITIQUE:\n{critique}\n\n--- PREVIOUS DRAFT ---\n{state.get('draft', '')}"
-
-    llm = get_llm_for_agent("writer")
-    response = llm.invoke(
-        [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+        revision = await revise_sections(state, prompt)
+        if revision:
+            return revision
+        prompt = prompt.extend(
+            f"⚠️ YOUR PREVIOUS DRAFT HAD ERRORS. PLEASE FIX THEM BASED ON THIS CRITIQUE:\n{critique}",
+            f"--- PREVIOUS DRAFT ---\n{state.get('draft', '')}",
+        )
+    elif _use_section_writer(state):
+        draft = await write_sections(state, prompt)
+        if draft:
+            logger.info(f"📝 WRITER DRAFT (first 200 chars): {draft[:200]}...")
+            return {
+                "draft": draft,
+                "changed_sections": None,
+                "current_status": "Draft written.",
+            }
+        logger.info("   Outline has no sections, writing the article at once.")
+
+    prompt, context_tokens = context_budget.fit("writer", prompt, state.get("profile"))
+    llm = await aget_llm_for_agent(
+        "writer", context_tokens=context_tokens, profile=state.get("profile")
     )
+    response = await llm.ainvoke(prompt.messages())
 
     logger.info(f"📝 WRITER DRAFT (first 200 chars): {response.content[:200]}...")
-    return {"draft": response.content, "current_status": "Draft written."}
+    return {
+        "draft": response.content,
+        "changed_sections": None,
+        "current_status": "Draft written.",
+    }
 
 
-def fact_check_node(state: AgentState):
+async def fact_check_node(state: AgentState):
+    """
+    Checks the draft against the research briefing. Sectioned drafts are
+    checked incrementally: after a section revision only the rewritten
+    sections are sent, and every error is tied to a section label so the
+    writer can regenerate just those sections.
+    """
     logger.info("⚖️ FACT CHECKER started.")
 
     agent_cfg = get_agent_config("fact_checker")
@@ -179,51 +521,139 @@ def fact_check_node(state: AgentState):
     draft_text = state.get("draft", "")
     research_summary = "\n".join(state.get("research_data", []))
     rev_count = state.get("revision_count", 0)
+
+    parts = split_draft(draft_text)
+    checked = []
+    if parts:
+        changed = state.get("changed_sections")
+        checked = [
+            i
+            for i in (changed if changed is not None else range(len(parts)))
+            if i < len(parts)
+        ]
+        draft_text = "\n\n".join(f"[SECTION {i + 1}]\n{parts[i]}" for i in checked)
+        logger.info(f"   Checking {len(checked)} of {len(parts)} sections.")
+
     system_prompt = agent_cfg["role"].format(
         topic=state["topic"], language=state["language"]
     )
-    user_prompt = task_cfg["description"].format(topic=state["topic"])
-    user_prompt += f"\n\n--- RESEARCH BRIEFING (TRUE FACTS) ---\n{research_summary}"
-    user_prompt += f"\n\n--- DRAFT TO CHECK ---\n{draft_text}"
-    user_prompt += f"\n\nEXPECTED OUTPUT:\n{task_cfg['expected_output']}"
+    expected_output = f"EXPECTED OUTPUT:\n{task_cfg['expected_output']}"
+    if parts:
+        expected_output += "\nSet 'section' to the number of the section label, e.g. 2 for [SECTION 2]."
+    briefing = f"--- RESEARCH BRIEFING (TRUE FACTS) ---\n{research_summary}"
+    prompt = Prompt(
+        system=system_prompt,
+        static=[task_cfg["description"].format(topic=state["topic"]), expected_output],
+        run=[briefing],
+        call=[f"--- DRAFT TO CHECK ---\n{draft_text}"],
+        trimmable=[briefing],
+    )
+    prompt, context_tokens = context_budget.fit(
+        "fact_checker", prompt, state.get("profile")
+    )
 
-    llm = get_llm_for_agent("fact_checker")
-    response = llm.invoke(
-        [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+    llm = await aget_llm_for_agent(
+        "fact_checker", context_tokens=context_tokens, profile=state.get("profile")
     )
-    critique = response.content.strip()
-    logger.info(f"⚖️ Fact Check Result: {critique[:100]}...")
+    response = await llm.ainvoke(prompt.messages(), format=VERDICT_SCHEMA)
+    verdict = parse_verdict(response.content)
+    logger.info(
+        f"⚖️ Fact Check Result: {len(verdict.blocking)} blocking, {len(verdict.minor)} minor issues."
+    )
+
+    critique = format_critique(verdict.blocking)
+    flagged = sorted(feedback_by_section(verdict.blocking, checked)) if parts else []
 
     return {
         "critique": critique,
+        "blocking_issues": [issue.model_dump() for issue in verdict.blocking],
+        "polish_hints": [format_issue(issue) for issue in verdict.minor],
+        "flagged_sections": flagged,
         "revision_count": rev_count + 1,
         "current_status": f"Fact check completed (Revision {rev_count + 1}).",
     }
 
 
-def polisher_node(state: AgentState):
+async def polisher_node(state: AgentState):
     logger.info("✨ POLISHER started.")
 
     agent_cfg = get_agent_config("polisher")
     task_cfg = get_task_config("polishing_task")
     draft_text = state.get("draft", "")
+    hints = state.get("polish_hints") or []
 
     system_prompt = agent_cfg["role"].format(
         topic=state["topic"], language=state["language"], tone=state["tone"]
     )
-    user_prompt = task_cfg["description"].format(
-        topic=state["topic"], tone=state["tone"], language=state["language"]
-    )
-    user_prompt += f"\n\n--- TEXT TO POLISH ---\n{draft_text}"
-    user_prompt += f"\n\nEXPECTED OUTPUT:\n{task_cfg['expected_output']}"
-    user_prompt += (
-        "\nIMPORTANT: Output ONLY the final article. No intro/outro conversation."
+    prompt = Prompt(
+        system=system_prompt,
+        static=[
+            task_cfg["description"].format(
+                topic=state["topic"], tone=state["tone"], language=state["language"]
+            ),
+            f"EXPECTED OUTPUT:\n{task_cfg['expected_output']}"
+            "\nIMPORTANT: Output ONLY the final article. No intro/outro conversation.",
+        ],
+        call=[f"--- TEXT TO POLISH ---\n{draft_text}"],
     )
+    if hints:
+        # minor fact check findings are fixed here instead of by another rewrite
+        prompt = prompt.extend(
+            "--- EDITOR NOTES (also fix these while polishing) ---\n" + "\n".join(hints)
+        )
 
-    llm = get_llm_for_agent("polisher")
-    response = llm.invoke(
-        [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+    prompt, context_tokens = context_budget.fit(
+        "polisher", prompt, state.get("profile")
+    )
+    llm = await aget_llm_for_agent(
+        "polisher", context_tokens=context_tokens, profile=state.get("profile")
     )
+    response = await llm.ainvoke(prompt.messages())
 
     logger.info("✅ Polishing finished.")
     return {"final_article": response.content, "current_status": "Polishing finished."}
+
+
+async def speculative_fact_check_node(state: AgentState):
+    """
+    Runs the polisher on the draft while the fact checker is still working.
+    If the draft needs neither a rewrite nor polishing hints, the polisher
+    would get exactly this input next, so its result is used and the run
+    ends here. Otherwise the speculative polish is cancelled (Ollama stops
+    generating once the request is closed) and the normal path continues.
+    The speculative polish runs inside this node and may be discarded, so
+    it is not shown in the polisher's live preview.
+    """
+    # the hints of an earlier fact check must not reach this polish; the
+    # accepted result is only valid for a check without hints
+    polish = asyncio.create_task(polisher_node({**state, "polish_hints": []}))
+    try:
+        update = await fact_check_node(state)
+    except BaseException:
+        polish.cancel()
+        raise
+
+    if not update["polish_hints"] and not needs_rewrite({**state, **update}):
+        try:
+            polished = await polish
+        except Exception as e:
+            logger.warning(f"⚠️ Speculative polishing failed, polishing again: {e}")
+            return update
+        logger.info("✨ Fact check passed, using the speculative polish.")
+        return {**update, **polished}
+
+    logger.info("✨ Draft changes after the fact check, speculative polish cancelled.")
+    polish.cancel()
+    try:
+        await polish
+    except (asyncio.CancelledError, Exception):
+        pass
+    return update
+
+
+async def publish_node(state: AgentState):
+    """ends profiles without polisher: the checked draft is the final article."""
+    return {
+        "final_article": state.get("draft", ""),
+        "current_status": "Article finished.",
+    }
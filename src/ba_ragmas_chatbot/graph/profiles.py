@@ -0,0 +1,53 @@
+from typing import List, Optional
+
+from ba_ragmas_chatbot.graph.utils import get_app_config
+
+PIPELINE_ORDER = ("researcher", "editor", "writer", "fact_checker", "polisher")
+REQUIRED_NODES = ("researcher", "writer")
+
+
+def _pipeline_config() -> dict:
+    return get_app_config().get("pipeline", {}) or {}
+
+
+def profile_names() -> List[str]:
+    """the configured profiles, in configs.yaml order."""
+    return list((_pipeline_config().get("profiles", {}) or {}).keys())
+
+
+def resolve_profile(
+    target_len: Optional[str] = None, profile: Optional[str] = None
+) -> str:
+    """
+    Name of the pipeline profile of a run: an explicitly requested profile,
+    else the one configured for the article length, else the default.
+    """
+    cfg = _pipeline_config()
+    profiles = cfg.get("profiles", {}) or {}
+    if profile in profiles:
+        return profile
+    length = str(target_len or "").strip().lower()
+    by_length = (cfg.get("length_profiles", {}) or {}).get(length)
+    if by_length in profiles:
+        return by_length
+    return cfg.get("default_profile", "quality")
+
+
+def get_profile(name: Optional[str]) -> dict:
+    """
+    nodes (in pipeline order, researcher and writer always included), model
+    overrides and max_revisions of a profile; unknown names get the default.
+    """
+    cfg = _pipeline_config()
+    profiles = cfg.get("profiles", {}) or {}
+    profile = profiles.get(name) or profiles.get(cfg.get("default_profile")) or {}
+    selected = profile.get("nodes", PIPELINE_ORDER)
+    return {
+        "nodes": [n for n in PIPELINE_ORDER if n in REQUIRED_NODES or n in selected],
+        "models": profile.get("models", {}) or {},
+        "max_revisions": profile.get("max_revisions", 2),
+    }
+
+
+def max_revisions(state: dict) -> int:
+    return get_profile(state.get("profile"))["max_revisions"]
@@ -0,0 +1,53 @@
+from dataclasses import dataclass, field, replace
+from typing import List
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+
+@dataclass
+class Prompt:
+    """
+    A node prompt assembled from ordered segments.
+
+    Ollama reuses the KV cache of the longest prefix that matches the
+    previous request to the same model, so segments go from stable to
+    volatile: static instructions from agents.yaml / tasks.yaml first, then
+    material fixed for the whole run (briefing, outline), then what changes
+    with every call (critique, draft, section). A rewrite or a second fact
+    check then only has to evaluate the call segments again.
+
+    trimmable lists the segments that may be shortened when the prompt
+    exceeds the agent's token budget, lowest priority first.
+    """
+
+    system: str
+    static: List[str] = field(default_factory=list)
+    run: List[str] = field(default_factory=list)
+    call: List[str] = field(default_factory=list)
+    trimmable: List[str] = field(default_factory=list)
+
+    def extend(self, *call_segments: str) -> "Prompt":
+        """copy of the prompt with additional per-call segments."""
+        return replace(self, call=self.call + list(call_segments))
+
+    def replace_segment(self, old: str, new: str) -> "Prompt":
+        """copy of the prompt with one segment swapped (e.g. a shortened one)."""
+
+        def swap(segments: List[str]) -> List[str]:
+            return [new if segment == old else segment for segment in segments]
+
+        return replace(
+            self,
+            static=swap(self.static),
+            run=swap(self.run),
+            call=swap(self.call),
+            trimmable=swap(self.trimmable),
+        )
+
+    @property
+    def text(self) -> str:
+        segments = self.static + self.run + self.call
+        return "\n\n".join(s.strip() for s in segments if s and s.strip())
+
+    def messages(self) -> list:
+        return [SystemMessage(content=self.system), HumanMessage(content=self.text)]
@@ -0,0 +1,107 @@
+import re
+from collections import Counter
+from typing import List, Optional, TypedDict
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+SECTION_LABEL_PATTERN = re.compile(r"\[SECTION (\d+)\]", re.IGNORECASE)
+NUMBERED_PATTERN = re.compile(r"^(?:\*\*)?(?:\d+|[IVX]+)[.)]\s*(.+?)(?:\*\*)?\s*$")
+
+
+class Section(TypedDict):
+    """one part of the article: its headline and what it should cover."""
+
+    title: str
+    points: str
+
+
+def _section_starts(lines: List[str]) -> List[int]:
+    """indices of the lines that start a section of the outline."""
+    levels = {}
+    for index, line in enumerate(lines):
+        match = HEADING_PATTERN.match(line.strip())
+        if match:
+            levels[index] = len(match.group(1))
+    if levels:
+        counts = Counter(levels.values())
+        repeated = [level for level, count in counts.items() if count >= 2]
+        level = min(repeated) if repeated else min(counts)
+        return [index for index, lvl in levels.items() if lvl == level]
+
+    # plain outlines: "1. Hook", "**2. History**", ... without indentation
+    return [
+        index
+        for index, line in enumerate(lines)
+        if line and not line[0].isspace() and NUMBERED_PATTERN.match(line)
+    ]
+
+
+def _clean_title(line: str) -> str:
+    line = line.strip()
+    match = HEADING_PATTERN.match(line) or NUMBERED_PATTERN.match(line)
+    title = match.group(match.lastindex) if match else line
+    return title.strip("*_ ").strip()
+
+
+def article_title(outline: str) -> Optional[str]:
+    """a heading above the first section (e.g. "# Title"), if there is one."""
+    lines = outline.splitlines()
+    starts = _section_starts(lines)
+    for line in lines[: starts[0] if starts else 0]:
+        if HEADING_PATTERN.match(line.strip()):
+            return _clean_title(line)
+    return None
+
+
+def parse_outline(outline: str) -> Optional[List[Section]]:
+    """
+    Splits the editor's markdown outline into sections.
+
+    Sections start at the heading level that is used at least twice
+    (a single "# Title" above "## ..." headings is not a section), or at
+    numbered top-level lines when the outline has no headings. Returns None
+    when fewer than two sections are found, the writer then falls back to
+    a single generation.
+    """
+    lines = outline.splitlines()
+    starts = _section_starts(lines)
+    if len(starts) < 2:
+        return None
+
+    sections = []
+    for number, start in enumerate(starts):
+        end = starts[number + 1] if number + 1 < len(starts) else len(lines)
+        sections.append(
+            Section(
+                title=_clean_title(lines[start]),
+                points="\n".join(lines[start + 1 : end]).strip(),
+            )
+        )
+    return sections
+
+
+def split_draft(draft: str) -> Optional[List[str]]:
+    """
+    Splits a markdown draft into addressable sections at its section heading
+    level. Text above the first section (title, intro) is its own part.
+    Returns None when the draft has fewer than two sections.
+    """
+    lines = draft.splitlines()
+    starts = [
+        index
+        for index in _section_starts(lines)
+        if HEADING_PATTERN.match(lines[index].strip())
+    ]
+    if len(starts) < 2:
+        return None
+    if starts[0] > 0 and "\n".join(lines[: starts[0]]).strip():
+        starts = [0] + starts
+
+    parts = []
+    for number, start in enumerate(starts):
+        end = starts[number + 1] if number + 1 < len(starts) else len(lines)
+        parts.append("\n".join(lines[start:end]).strip())
+    return parts
+
+
+def join_sections(parts: List[str]) -> str:
+    return "\n\n".join(parts)
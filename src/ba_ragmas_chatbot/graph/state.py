@@ -14,10 +14,16 @@ class AgentState(TypedDict):
     tone: str
     additional_info: str
     source_documents: List[str]
+    collection_name: Optional[str]
     research_data: List[str]
     outline: List[str]
     draft: str
     critique: Optional[str]
+    blocking_issues: List[dict]
+    changed_sections: Optional[List[int]]
+    flagged_sections: List[int]
+    polish_hints: List[str]
     final_article: str
     revision_count: int
     current_status: str
+    profile: Optional[str]
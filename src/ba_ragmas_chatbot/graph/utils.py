@@ -1,32 +1,350 @@
 import os
+import threading
 import yaml
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from ba_ragmas_chatbot import logger_config
 
+logger = logger_config.get_logger("Config")
+
+
+class BackendConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    base_url: str
+    models: List[str] = []
+    embeddings: bool = False
+    max_parallel: Optional[int] = None
+
+
+class ModelsConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    base_url: str = "http://localhost:11434"
+    backends: List[BackendConfig] = []
+    health_check_seconds: float = 15
+    health_check_timeout: float = 2
+    max_parallel: int = 2
+    logic_model: str = "qwen2.5:7b-instruct-q5_k_m"
+    creative_model: str = "gemma2:9b-instruct-q5_k_m"
+    free_chat_model: str = "llama3.1:8b-instruct-q8_0"
+    embedding_model: str = "mxbai-embed-large"
+
+
+class ResidencyConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    memory_budget_gb: float = 8
+    keep_alive: Union[str, int] = "10m"
+    default_model_size_gb: float = 6
+    model_sizes_gb: Dict[str, float] = {}
+
+
+class IndexingConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    max_workers: int = 4
+
+
+class EmbeddingsConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    batching: bool = True
+    batch_size: int = 32
+    window_ms: float = 20
+    max_concurrent_batches: int = 2
+
+
+class QueueConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    max_concurrent_runs: int = 1
+    default_run_seconds: float = 600
+    checkpoint_ttl_hours: float = 72
+
+
+class ResearchConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    retrieval_timeout_seconds: float = 30
+    web_search_timeout_seconds: float = 60
+    search_query_mode: str = "keywords"
+    llm_query_fallback: bool = True
+
+
+class ResearchCacheConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    enabled: bool = True
+    similarity_threshold: float = 0.92
+    ttl_hours: float = 72
+    max_entries: int = 500
+
+
+class WriterConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    mode: str = "auto"
+    section_lengths: List[str] = ["long"]
+    max_parallel_sections: int = 4
+    transitions: bool = True
+
+
+class StreamingConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    nodes: List[str] = ["polisher"]
+    edit_interval_seconds: float = 1.5
+
+
+class ProfileConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    nodes: List[str] = ["researcher", "editor", "writer", "fact_checker", "polisher"]
+    models: Dict[str, str] = {}
+    max_revisions: int = 2
+
+
+class PipelineConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    default_profile: str = "quality"
+    length_profiles: Dict[str, str] = {
+        "short": "fast",
+        "medium": "balanced",
+        "long": "quality",
+    }
+    profiles: Dict[str, ProfileConfig] = {
+        "fast": ProfileConfig(
+            nodes=["researcher", "writer"],
+            models={"writer": "logic_model"},
+            max_revisions=0,
+        ),
+        "balanced": ProfileConfig(max_revisions=1),
+        "quality": ProfileConfig(),
+    }
+
+
+class PolisherConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    speculative: bool = False
+
+
+class ContextConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    enabled: bool = True
+    chars_per_token: float = 3
+    model_chars_per_token: Dict[str, float] = {}
+    context_sizes: List[int] = [4096, 8192, 16384, 32768]
+    default_prompt_tokens: int = 6000
+    default_output_tokens: int = 1024
+    prompt_tokens: Dict[str, int] = {}
+    output_tokens: Dict[str, int] = {}
+
+
+class SchedulerConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    enabled: bool = True
+    max_wait_seconds: float = 30
 
-def load_yaml_config(filename: str) -> Dict[str, Any]:
-    """loads yaml-files from config-folder."""
 
+class AppConfig(BaseModel):
+    """schema of configs.yaml"""
+
+    model_config = ConfigDict(extra="allow")
+
+    chatbot_token: Dict[str, Any] = {}
+    models: ModelsConfig = ModelsConfig()
+    residency: ResidencyConfig = ResidencyConfig()
+    indexing: IndexingConfig = IndexingConfig()
+    embeddings: EmbeddingsConfig = EmbeddingsConfig()
+    queue: QueueConfig = QueueConfig()
+    streaming: StreamingConfig = StreamingConfig()
+    research: ResearchConfig = ResearchConfig()
+    research_cache: ResearchCacheConfig = ResearchCacheConfig()
+    writer: WriterConfig = WriterConfig()
+    pipeline: PipelineConfig = PipelineConfig()
+    polisher: PolisherConfig = PolisherConfig()
+    context: ContextConfig = ContextConfig()
+    scheduler: SchedulerConfig = SchedulerConfig()
+
+
+class AgentConfig(BaseModel):
+    """schema of one agent in agents.yaml"""
+
+    model_config = ConfigDict(extra="allow")
+
+    role: str
+    goal: str = ""
+    backstory: str = ""
+
+
+class TaskConfig(BaseModel):
+    """schema of one task in tasks.yaml"""
+
+    model_config = ConfigDict(extra="allow")
+
+    description: str
+    expected_output: str = ""
+    agent: str = ""
+
+
+CONFIG_SCHEMAS = {
+    "configs.yaml": TypeAdapter(AppConfig),
+    "agents.yaml": TypeAdapter(Dict[str, AgentConfig]),
+    "tasks.yaml": TypeAdapter(Dict[str, TaskConfig]),
+}
+
+
+def config_path(filename: str) -> str:
+    """absolute path of a file in the config-folder."""
     current_script_dir = os.path.dirname(os.path.abspath(__file__))
     package_dir = os.path.dirname(current_script_dir)
-    config_path = os.path.join(package_dir, "config", filename)
+    return os.path.join(package_dir, "config", filename)
+
+
+def config_mtime(filename: str) -> float:
+    """last modification time of a config-file (0 if missing)."""
+    try:
+        return os.path.getmtime(config_path(filename))
+    except OSError:
+        return 0.0
+
 
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"config-file not found: {config_path}")
+def load_yaml_config(filename: str) -> Dict[str, Any]:
+    """loads yaml-files from config-folder."""
+
+    path = config_path(filename)
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"config-file not found: {path}")
 
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
+        with open(path, "r", encoding="utf-8") as f:
             return yaml.safe_load(f)
     except Exception as e:
         raise Exception(f"Error parsing {filename}: {e}")
 
 
+class ConfigService:
+    """
+    Parses and validates every config-file once and serves it from memory.
+
+    A file is reloaded when its mtime changes, either detected by the
+    watchfiles watcher (see start_watcher) or, when no watcher runs, by a
+    cheap stat on access. A reload swaps the whole snapshot at once; if the
+    new file is invalid, the last valid snapshot stays active.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, tuple] = {}
+        # mtime of an invalid file, so it is not re-read until it changes again
+        self._rejected: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _validate(self, filename: str, raw: Any) -> Dict[str, Any]:
+        schema = CONFIG_SCHEMAS.get(filename)
+        if schema is None:
+            return raw or {}
+        validated = schema.validate_python(raw or {})
+        if isinstance(validated, BaseModel):
+            return validated.model_dump()
+        return {name: entry.model_dump() for name, entry in validated.items()}
+
+    def reload(self, filename: str) -> Dict[str, Any]:
+        with self._lock:
+            mtime = config_mtime(filename)
+            try:
+                data = self._validate(filename, load_yaml_config(filename))
+            except Exception as e:
+                if filename not in self._snapshots:
+                    raise
+                logger.error(f"⚠️ Invalid {filename}, keeping previous config: {e}")
+                self._rejected[filename] = mtime
+                return self._snapshots[filename][1]
+            self._rejected.pop(filename, None)
+            self._snapshots[filename] = (mtime, data)
+            logger.info(f"🔄 Config loaded: {filename}")
+            return data
+
+    def get(self, filename: str) -> Dict[str, Any]:
+        snapshot = self._snapshots.get(filename)
+        if snapshot is None:
+            return self.reload(filename)
+        if not self.watching:
+            mtime = config_mtime(filename)
+            if mtime != snapshot[0] and mtime != self._rejected.get(filename):
+                return self.reload(filename)
+        return snapshot[1]
+
+    def version(self, filename: str) -> float:
+        """mtime of the active snapshot, changes on every reload."""
+        self.get(filename)
+        return self._snapshots[filename][0]
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def start_watcher(self) -> None:
+        """reloads changed config-files in a background thread."""
+        if self.watching:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, name="config-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+
+    def _watch(self) -> None:
+        from watchfiles import watch
+
+        config_dir = os.path.dirname(config_path("configs.yaml"))
+        for changes in watch(config_dir, stop_event=self._stop):
+            for _, changed_path in changes:
+                filename = os.path.basename(changed_path)
+                if filename in self._snapshots:
+                    self.reload(filename)
+
+
+config_service = ConfigService()
+
+
 def get_agent_config(agent_name: str) -> Dict[str, Any]:
-    return load_yaml_config("agents.yaml")[agent_name]
+    return config_service.get("agents.yaml")[agent_name]
 
 
 def get_task_config(task_name: str) -> Dict[str, Any]:
-    return load_yaml_config("tasks.yaml")[task_name]
+    return config_service.get("tasks.yaml")[task_name]
+
+
+def get_app_config() -> Dict[str, Any]:
+    return config_service.get("configs.yaml")
 
 
 def get_model_config() -> Dict[str, Any]:
-    return load_yaml_config("configs.yaml").get("models", {})
+    return get_app_config().get("models", {})
+
+
+def get_residency_config() -> Dict[str, Any]:
+    return get_app_config().get("residency", {}) or {}
+
+
+def get_embeddings_config() -> Dict[str, Any]:
+    return get_app_config().get("embeddings", {}) or {}
+
+
+def get_context_config() -> Dict[str, Any]:
+    return get_app_config().get("context", {}) or {}
+
+
+def get_scheduler_config() -> Dict[str, Any]:
+    return get_app_config().get("scheduler", {}) or {}
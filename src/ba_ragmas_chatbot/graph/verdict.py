@@ -0,0 +1,106 @@
+import json
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from ba_ragmas_chatbot.graph.profiles import max_revisions
+from ba_ragmas_chatbot.graph.sections import SECTION_LABEL_PATTERN
+
+
+class Issue(BaseModel):
+    """one finding of the fact checker."""
+
+    severity: Literal["blocking", "minor"]
+    # number of the [SECTION n] label, None for unsectioned drafts
+    section: Optional[int] = None
+    problem: str
+    fix: str = ""
+
+
+class Verdict(BaseModel):
+    """structured result of a fact check, an empty list means the draft passed."""
+
+    issues: List[Issue] = []
+
+    @property
+    def blocking(self) -> List[Issue]:
+        return [issue for issue in self.issues if issue.severity == "blocking"]
+
+    @property
+    def minor(self) -> List[Issue]:
+        return [issue for issue in self.issues if issue.severity == "minor"]
+
+
+# passed to Ollama as format, so the model can only answer with this schema
+VERDICT_SCHEMA = Verdict.model_json_schema()
+
+
+def _legacy_verdict(text: str) -> Verdict:
+    """
+    Free-text answers (models without format support): "PASS" passes,
+    every other line is a blocking issue, [SECTION n] labels are kept.
+    """
+    if not text or text.upper().startswith("PASS"):
+        return Verdict()
+    issues = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        labels = SECTION_LABEL_PATTERN.findall(line)
+        issues.append(
+            Issue(
+                severity="blocking",
+                section=int(labels[0]) if labels else None,
+                problem=line.strip().lstrip("-* ").strip(),
+            )
+        )
+    return Verdict(issues=issues)
+
+
+def parse_verdict(text: str) -> Verdict:
+    text = (text or "").strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            return Verdict.model_validate(json.loads(text[start : end + 1]))
+        except (ValueError, ValidationError):
+            pass
+    return _legacy_verdict(text)
+
+
+def format_issue(issue: Issue) -> str:
+    label = f"[SECTION {issue.section}] " if issue.section else ""
+    fix = f" Fix: {issue.fix}" if issue.fix else ""
+    return f"- {label}{issue.problem}{fix}"
+
+
+def format_critique(issues: List[Issue]) -> str:
+    """blocking issues as the writer's critique, one labelled line per issue."""
+    return "\n".join(format_issue(issue) for issue in issues)
+
+
+def feedback_by_section(
+    issues: List[Issue], checked: List[int]
+) -> Dict[int, List[str]]:
+    """
+    Maps issues onto the indices of the checked sections. An issue without
+    a section (or with a label of a section that was not checked) applies
+    to every checked section.
+    """
+    feedback: Dict[int, List[str]] = {}
+    for issue in issues:
+        index = issue.section - 1 if issue.section else None
+        for target in [index] if index in checked else checked:
+            feedback.setdefault(target, []).append(format_issue(issue))
+    return feedback
+
+
+def needs_rewrite(state: dict) -> bool:
+    """
+    True when the last fact check found blocking issues and the revision
+    limit of the run's profile is not reached yet. Minor issues never send
+    the draft back.
+    """
+    if state.get("revision_count", 0) >= max_revisions(state):
+        return False
+    return bool(state.get("blocking_issues"))
@@ -1,54 +1,192 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.graph import StateGraph, START, END
 from ba_ragmas_chatbot.graph.state import AgentState
+from ba_ragmas_chatbot.llm.factory import residency
+from ba_ragmas_chatbot.graph.utils import config_service, get_app_config
+from ba_ragmas_chatbot.graph.profiles import get_profile, resolve_profile
+from ba_ragmas_chatbot.graph.verdict import needs_rewrite
+from ba_ragmas_chatbot.paths import CHECKPOINT_DB
 from ba_ragmas_chatbot.graph.nodes import (
     research_node,
     editor_node,
     writer_node,
     fact_check_node,
     polisher_node,
+    speculative_fact_check_node,
+    publish_node,
 )
 
 
 def route_after_fact_check(state: AgentState) -> str:
     """
     Decides if text goes back to writer or forwards it to polisher.
+    Only blocking issues cause a rewrite, minor ones go to the polisher.
+    A speculative polish accepted by the fact checker ends the run.
     """
-
-    if state.get("revision_count", 0) >= 2:
-        return "polisher"
-
-    critique = state.get("critique", "").strip().upper()
-
-    if critique == "PASS" or critique.startswith("PASS") or critique == "":
-        return "polisher"
-    else:
+    if needs_rewrite(state):
         return "writer"
+    return END if state.get("final_article") else "polisher"
 
 
-def create_graph():
+def create_graph(checkpointer=None, profile=None):
     """
-    Constructs the LangGraph workflow.
+    Constructs the LangGraph workflow with the nodes of a pipeline profile.
+    Profiles without a polisher end with publish, which takes the draft as
+    the final article.
     """
     workflow = StateGraph(AgentState)
+    speculative = get_app_config().get("polisher", {}).get("speculative", False)
+    nodes = get_profile(profile)["nodes"]
+    finisher = "polisher" if "polisher" in nodes else "publish"
 
     workflow.add_node("researcher", research_node)
-    workflow.add_node("editor", editor_node)
+    if "editor" in nodes:
+        workflow.add_node("editor", editor_node)
     workflow.add_node("writer", writer_node)
-    workflow.add_node("fact_checker", fact_check_node)
-    workflow.add_node("polisher", polisher_node)
+    if "fact_checker" in nodes:
+        workflow.add_node(
+            "fact_checker",
+            speculative_fact_check_node if speculative else fact_check_node,
+        )
+    if finisher == "polisher":
+        workflow.add_node("polisher", polisher_node)
+    else:
+        workflow.add_node("publish", publish_node)
 
     workflow.add_edge(START, "researcher")
-    workflow.add_edge("researcher", "editor")
-    workflow.add_edge("editor", "writer")
-    workflow.add_edge("writer", "fact_checker")
+    if "editor" in nodes:
+        workflow.add_edge("researcher", "editor")
+        workflow.add_edge("editor", "writer")
+    else:
+        workflow.add_edge("researcher", "writer")
+
+    if "fact_checker" in nodes:
+        workflow.add_edge("writer", "fact_checker")
+        workflow.add_conditional_edges(
+            "fact_checker",
+            route_after_fact_check,
+            {"writer": "writer", "polisher": finisher, END: END},
+        )
+    else:
+        workflow.add_edge("writer", finisher)
 
-    workflow.add_conditional_edges(
-        "fact_checker",
-        route_after_fact_check,
-        {"writer": "writer", "polisher": "polisher"},
-    )
+    workflow.add_edge(finisher, END)
+
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def _agent_edges(graphs) -> list:
+    """edges of compiled graphs, with publish (no model) bridged to END."""
+    edges = []
+    for app in graphs:
+        for edge in app.get_graph().edges:
+            if edge.source == "publish":
+                continue
+            if edge.target == "publish":
+                edge = SimpleNamespace(source=edge.source, target=END)
+            edges.append(edge)
+    return edges
+
+
+_compiled_graphs = {}
+_compiled_version = None
+_graph_lock = threading.Lock()
+_checkpointer = None
+
+
+async def open_checkpointer(path: Path = CHECKPOINT_DB):
+    """
+    Opens the SQLite checkpointer that get_graph compiles into the workflow.
+    Every node writes its state to it, so a run with the same thread_id can
+    continue after the last completed node.
+    """
+    global _checkpointer
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = await aiosqlite.connect(str(path))
+    saver = AsyncSqliteSaver(conn)
+    await saver.setup()
+    with _graph_lock:
+        _checkpointer = saver
+        _compiled_graphs.clear()
+    return saver
+
+
+async def close_checkpointer() -> None:
+    global _checkpointer
+    with _graph_lock:
+        saver, _checkpointer = _checkpointer, None
+        _compiled_graphs.clear()
+    if saver is not None:
+        await saver.conn.close()
+
+
+async def drop_stale_checkpoints(max_age_hours: float) -> int:
+    """
+    Deletes the checkpoints of runs whose last step is older than
+    max_age_hours. Finished runs delete their own checkpoints, these are
+    left by failed runs that were never resumed.
+    """
+    saver = _checkpointer
+    if saver is None:
+        return 0
+    newest = {}
+    async for item in saver.alist(None):
+        thread_id = item.config["configurable"]["thread_id"]
+        ts = datetime.fromisoformat(item.checkpoint["ts"])
+        newest[thread_id] = max(ts, newest.get(thread_id, ts))
+
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+    stale = [thread_id for thread_id, ts in newest.items() if ts < cutoff]
+    for thread_id in stale:
+        await saver.adelete_thread(thread_id)
+    return len(stale)
+
+
+def run_config(chat_id: int, run_id: str) -> dict:
+    """graph config of one article run, checkpoints are keyed by chat and run."""
+    return {"configurable": {"thread_id": f"{chat_id}:{run_id}"}}
+
+
+def get_graph(profile=None):
+    """
+    Returns the compiled workflow of a pipeline profile, shared by all runs
+    with that profile. Graphs are only rebuilt when configs.yaml was
+    reloaded or the checkpointer changed.
+    """
+    global _compiled_version
+    version = config_service.version("configs.yaml")
+    profile = resolve_profile(profile=profile)
+    with _graph_lock:
+        if version != _compiled_version:
+            _compiled_graphs.clear()
+            _compiled_version = version
+        if profile not in _compiled_graphs:
+            _compiled_graphs[profile] = create_graph(_checkpointer, profile)
+            residency.set_topology(_agent_edges([_compiled_graphs[profile]]), profile)
+        return _compiled_graphs[profile]
+
+
+def benchmark_graph_build(runs: int = 5) -> dict:
+    """
+    Measures the per-request graph setup cost: compiling for every request
+    (old behaviour) vs. fetching the shared compiled graph.
+    """
+    start = time.perf_counter()
+    for _ in range(runs):
+        create_graph()
+    compile_ms = (time.perf_counter() - start) * 1000 / runs
 
-    workflow.add_edge("polisher", END)
+    get_graph()
+    start = time.perf_counter()
+    for _ in range(runs):
+        get_graph()
+    cached_ms = (time.perf_counter() - start) * 1000 / runs
 
-    app = workflow.compile()
-    return app
+    return {"compile_per_request_ms": compile_ms, "shared_graph_ms": cached_ms}
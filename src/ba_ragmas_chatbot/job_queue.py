@@ -0,0 +1,242 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ba_ragmas_chatbot import logger_config
+from ba_ragmas_chatbot.llm.factory import latency, residency, scheduler
+from ba_ragmas_chatbot.tools.vectorstore import embedding_metrics
+from ba_ragmas_chatbot.paths import JOBS_FILE
+
+logger = logger_config.get_logger("JobQueue")
+
+MAX_ATTEMPTS = 3
+
+
+@dataclass
+class GenerationJob:
+    """One article generation request waiting for (or using) a run slot."""
+
+    chat_id: int
+    user_id: int
+    inputs: dict
+    file_paths: List[str] = field(default_factory=list)
+    status_message_id: Optional[int] = None
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    created_at: float = field(default_factory=time.time)
+    status: str = "pending"
+    attempts: int = 0
+
+
+class GenerationQueue:
+    """
+    Admission control for article runs.
+
+    At most max_concurrent jobs run at once. Pending jobs are dispatched
+    round-robin between users (fewest running jobs first, then the user that
+    was served longest ago, then FIFO), so one user with many jobs cannot
+    starve the others. The queue is written to JOBS_FILE on every change;
+    jobs that were pending or running when the bot stopped are dispatched
+    again after a restart.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[GenerationJob], Awaitable[None]],
+        max_concurrent: int = 1,
+        default_run_seconds: float = 600,
+        on_update: Optional[Callable[[GenerationJob, int, float], Awaitable]] = None,
+        path: Path = JOBS_FILE,
+    ):
+        self.runner = runner
+        self.max_concurrent = max(1, max_concurrent)
+        self.on_update = on_update
+        self.path = Path(path)
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._last_served: Dict[int, int] = {}
+        self._served = 0
+        self._durations: List[float] = []
+        self._first_started: Optional[float] = None
+        self._completed = 0
+        self._default_run_seconds = default_run_seconds
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+
+    # persistence
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([asdict(job) for job in self._jobs.values()], f)
+        os.replace(tmp_path, self.path)
+
+    def _restore(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except Exception as e:
+            logger.error(f"⚠️ Could not read job queue {self.path}: {e}")
+            return
+        for data in stored:
+            job = GenerationJob(**data)
+            if job.attempts >= MAX_ATTEMPTS:
+                logger.warning(
+                    f"⚠️ Dropping job {job.job_id} after {job.attempts} attempts."
+                )
+                continue
+            job.status = "pending"
+            self._jobs[job.job_id] = job
+            residency.run_queued()
+        if self._jobs:
+            logger.info(f"♻️ Restored {len(self._jobs)} queued job(s).")
+
+    # scheduling
+
+    def dispatch_order(self) -> List[GenerationJob]:
+        """pending jobs in the order they will be started."""
+        running = Counter(
+            j.user_id for j in self._jobs.values() if j.status == "running"
+        )
+        last_served = dict(self._last_served)
+        served = self._served
+        pending = [j for j in self._jobs.values() if j.status == "pending"]
+        order = []
+        while pending:
+            job = min(
+                pending,
+                key=lambda j: (
+                    running[j.user_id],
+                    last_served.get(j.user_id, -1),
+                    j.created_at,
+                ),
+            )
+            pending.remove(job)
+            order.append(job)
+            running[job.user_id] += 1
+            served += 1
+            last_served[job.user_id] = served
+        return order
+
+    def average_run_seconds(self) -> float:
+        if not self._durations:
+            return self._default_run_seconds
+        recent = self._durations[-10:]
+        return sum(recent) / len(recent)
+
+    def throughput(self) -> dict:
+        """finished runs and articles per hour since the first run started."""
+        if self._first_started is None:
+            return {"completed": 0, "articles_per_hour": 0.0}
+        elapsed = time.perf_counter() - self._first_started
+        return {
+            "completed": self._completed,
+            "articles_per_hour": (
+                round(self._completed * 3600 / elapsed, 2) if elapsed else 0.0
+            ),
+        }
+
+    def position(self, job_id: str):
+        """(queue position starting at 1, ETA in seconds) of a pending job."""
+        for index, job in enumerate(self.dispatch_order()):
+            if job.job_id == job_id:
+                waves = index // self.max_concurrent + 1
+                return index + 1, waves * self.average_run_seconds()
+        return 0, 0.0
+
+    async def _notify_positions(self) -> None:
+        if not self.on_update:
+            return
+        for job in self.dispatch_order():
+            position, eta = self.position(job.job_id)
+            try:
+                await self.on_update(job, position, eta)
+            except Exception as e:
+                logger.debug(f"Queue update for {job.job_id} failed: {e}")
+
+    # public api
+
+    def contains(self, job_id: str) -> bool:
+        """True while a job with this id is pending or running."""
+        return job_id in self._jobs
+
+    async def submit(self, job: GenerationJob) -> int:
+        if job.job_id in self._jobs:
+            # e.g. a double-tapped resume, the run must not start twice
+            logger.info(f"Job {job.job_id} is already queued, ignoring it.")
+            return self.position(job.job_id)[0]
+        self._jobs[job.job_id] = job
+        self._save()
+        residency.run_queued()
+        logger.info(f"📥 Job {job.job_id} queued for chat {job.chat_id}.")
+        await self._notify_positions()
+        if self._wakeup:
+            self._wakeup.set()
+        return self.position(job.job_id)[0]
+
+    async def start(self) -> None:
+        """restores persisted jobs and starts the worker tasks."""
+        self._wakeup = asyncio.Event()
+        self._restore()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"generation-worker-{i}")
+            for i in range(self.max_concurrent)
+        ]
+        if self._jobs:
+            await self._notify_positions()
+            self._wakeup.set()
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self) -> None:
+        while True:
+            order = self.dispatch_order()
+            if not order:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            job = order[0]
+            job.status = "running"
+            job.attempts += 1
+            self._served += 1
+            self._last_served[job.user_id] = self._served
+            self._save()
+            residency.run_started()
+            await self._notify_positions()
+
+            started = time.perf_counter()
+            if self._first_started is None:
+                self._first_started = started
+            try:
+                await self.runner(job)
+            except asyncio.CancelledError:
+                job.status = "pending"
+                self._save()
+                raise
+            except Exception as e:
+                logger.exception(f"Job {job.job_id} failed: {e}")
+            finally:
+                residency.run_finished()
+                logger.info(f"⏱️ Time to first token per agent: {latency.metrics()}")
+
+            self._durations.append(time.perf_counter() - started)
+            self._completed += 1
+            logger.info(
+                f"📊 Throughput: {self.throughput()}, model scheduler: "
+                f"{scheduler.metrics()}, embeddings: {embedding_metrics()}"
+            )
+            self._jobs.pop(job.job_id, None)
+            self._save()
+            await self._notify_positions()
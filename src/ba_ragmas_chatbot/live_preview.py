@@ -0,0 +1,107 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import List
+
+from telegram.error import BadRequest, RetryAfter
+
+from ba_ragmas_chatbot import logger_config
+
+logger = logger_config.get_logger("LivePreview")
+
+TELEGRAM_MAX_LENGTH = 4096
+
+
+def split_message(text: str, limit: int = TELEGRAM_MAX_LENGTH) -> List[str]:
+    """splits text into telegram-sized parts, preferably at line breaks."""
+    parts = []
+    while len(text) > limit:
+        cut = text.rfind("\n", limit // 2, limit)
+        if cut == -1:
+            cut = limit
+        parts.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    if text:
+        parts.append(text)
+    return parts
+
+
+class LivePreview:
+    """
+    Streams a growing text into Telegram messages while it is generated.
+
+    Tokens are buffered and the preview is edited at most once per
+    min_interval seconds, Telegram allows roughly one edit per second and
+    chat. Text beyond 4096 characters continues in a new message. When
+    Telegram answers with RetryAfter, edits pause for the requested time.
+    """
+
+    def __init__(
+        self,
+        bot,
+        chat_id: int,
+        header: str = "",
+        min_interval: float = 1.5,
+        limit: int = TELEGRAM_MAX_LENGTH,
+    ):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.header = header
+        self.min_interval = min_interval
+        self.limit = limit
+        self.text = ""
+        self._message_ids: List[int] = []
+        self._shown: List[str] = []
+        self._next_edit = 0.0
+        self._paused_until = 0.0
+
+    @property
+    def pending(self) -> bool:
+        return split_message(self.header + self.text, self.limit) != self._shown
+
+    async def push(self, token: str) -> None:
+        self.text += token
+        if time.monotonic() >= self._next_edit:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """sends or edits every message whose text changed since the last flush."""
+        parts = split_message(self.header + self.text, self.limit)
+        for index, part in enumerate(parts):
+            if index < len(self._shown) and self._shown[index] == part:
+                continue
+            try:
+                if index < len(self._message_ids):
+                    await self.bot.edit_message_text(
+                        chat_id=self.chat_id,
+                        message_id=self._message_ids[index],
+                        text=part,
+                    )
+                    self._shown[index] = part
+                else:
+                    message = await self.bot.send_message(self.chat_id, part)
+                    self._message_ids.append(message.message_id)
+                    self._shown.append(part)
+            except RetryAfter as e:
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                logger.debug(f"Rate limited, pausing preview for {delay}s.")
+                self._paused_until = time.monotonic() + delay
+                self._next_edit = self._paused_until
+                return
+            except BadRequest as e:
+                logger.debug(f"flush: {e}")
+                if index < len(self._shown):
+                    self._shown[index] = part
+        self._next_edit = time.monotonic() + self.min_interval
+
+    async def close(self, attempts: int = 3) -> None:
+        """writes the remaining text, waiting out rate limits if necessary."""
+        for _ in range(attempts):
+            if not self.pending:
+                return
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.flush()
@@ -0,0 +1,238 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import httpx
+from ollama import Client
+
+from ba_ragmas_chatbot.graph.utils import get_model_config
+from ba_ragmas_chatbot import logger_config
+
+logger = logger_config.get_logger("Backends")
+
+# errors after which a call is retried on another backend; the request did
+# not reach the model (or the server went away), so retrying is safe
+BACKEND_ERRORS = (
+    ConnectionError,
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.RemoteProtocolError,
+)
+
+
+class NoBackendError(RuntimeError):
+    """no configured (and reachable) Ollama server serves the model."""
+
+
+class BackendPool:
+    """
+    Routes models to the Ollama servers configured under models.backends.
+
+    Every backend may be limited to a set of models. A backend that already
+    has the requested model loaded is preferred while it has fewer than
+    max_parallel calls in flight, then the one with the fewest calls. Backends are health checked with /api/ps (which
+    also tells which models are loaded) at most every health_check_seconds;
+    a backend that fails a check or a call is skipped until a later check
+    succeeds, unless no other backend serves the model. Embeddings go to
+    backends marked with embeddings: true where there are any. Without
+    backends, models.base_url is the only backend.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._healthy: Dict[str, bool] = {}
+        self._loaded: Dict[str, Set[str]] = defaultdict(set)
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._checked_at: Optional[float] = None
+        self._config_key = None
+
+    def backends(self) -> List[dict]:
+        config = get_model_config()
+        backends = config.get("backends") or []
+        if not backends:
+            return [{"base_url": config.get("base_url", "http://localhost:11434")}]
+        return backends
+
+    @staticmethod
+    def _serves(backend: dict, model: str) -> bool:
+        models = backend.get("models") or []
+        return not models or model in models
+
+    # health
+
+    def _check(self, base_url: str, timeout: float):
+        """(healthy, loaded models) of one backend."""
+        try:
+            models = Client(host=base_url, timeout=timeout).ps().models
+            return True, {m.model for m in models}
+        except Exception as e:
+            logger.warning(f"⚠️ Ollama backend {base_url} is not reachable: {e}")
+            return False, set()
+
+    def refresh(self, force: bool = False) -> None:
+        """health checks all backends once the last check is old enough."""
+        config = get_model_config()
+        urls = [b["base_url"] for b in self.backends()]
+        interval = float(config.get("health_check_seconds", 15))
+        # concurrent selects wait for a running check instead of routing
+        # on what was known before it
+        with self._refresh_lock:
+            if (
+                not force
+                and self._config_key == urls
+                and self._checked_at is not None
+                and time.monotonic() - self._checked_at < interval
+            ):
+                return
+
+            timeout = float(config.get("health_check_timeout", 2))
+            results = {url: self._check(url, timeout) for url in urls}
+            with self._lock:
+                for url, (healthy, loaded) in results.items():
+                    if healthy and self._healthy.get(url) is False:
+                        logger.info(f"✅ Ollama backend {url} is reachable again.")
+                    self._healthy[url] = healthy
+                    self._loaded[url] = loaded
+            self._checked_at = time.monotonic()
+            self._config_key = urls
+
+    def mark_unhealthy(self, base_url: str, error: Exception) -> None:
+        logger.warning(f"⚠️ Ollama backend {base_url} failed, failing over: {error}")
+        with self._lock:
+            self._healthy[base_url] = False
+            self._loaded[base_url] = set()
+
+    # routing
+
+    def select(
+        self,
+        model: str,
+        exclude: Iterable[str] = (),
+        embeddings: bool = False,
+        reserve: bool = False,
+    ) -> str:
+        """
+        base_url of the backend the next call for this model goes to. With
+        reserve, the call counts as in flight there until call_finished.
+        """
+        self.refresh()
+        exclude = set(exclude)
+        candidates = [
+            b
+            for b in self.backends()
+            if self._serves(b, model) and b["base_url"] not in exclude
+        ]
+        if embeddings:
+            embedding_backends = [b for b in candidates if b.get("embeddings")]
+            candidates = embedding_backends or candidates
+        if not candidates:
+            raise NoBackendError(f"No Ollama backend serves {model}.")
+
+        with self._lock:
+            healthy = [b for b in candidates if self._healthy.get(b["base_url"], True)]
+            if not healthy:
+                # better a call that may fail than none at all
+                logger.warning(
+                    f"⚠️ No healthy Ollama backend for {model}, trying anyway."
+                )
+                healthy = candidates
+            default_parallel = int(get_model_config().get("max_parallel", 2))
+            order = {b["base_url"]: i for i, b in enumerate(healthy)}
+            parallel = {
+                b["base_url"]: int(b.get("max_parallel") or default_parallel)
+                for b in healthy
+            }
+            # a loaded model wins until that backend is busy, then loading it
+            # on an idle backend is cheaper than waiting
+            best = min(
+                order,
+                key=lambda url: (
+                    self._in_flight[url] >= parallel[url],
+                    model not in self._loaded[url],
+                    self._in_flight[url],
+                    order[url],
+                ),
+            )
+            if reserve:
+                self._in_flight[best] += 1
+            return best
+
+    def call_finished(self, base_url: str, model: Optional[str] = None) -> None:
+        """
+        ends a reserved call; model is given when the call went through, the
+        model is loaded on that backend from then on.
+        """
+        with self._lock:
+            self._in_flight[base_url] = max(0, self._in_flight[base_url] - 1)
+            if model:
+                self._loaded[base_url].add(model)
+
+    def status(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                url: {
+                    "healthy": healthy,
+                    "loaded": sorted(self._loaded[url]),
+                    "in_flight": self._in_flight[url],
+                }
+                for url, healthy in self._healthy.items()
+            }
+
+
+class RoutedLLM:
+    """
+    An LLM whose every call goes to the backend the pool picks for it, so
+    parallel calls (e.g. the sections of one draft) spread over the
+    backends. A call whose backend fails moves to another one.
+    build(base_url) returns the LLM for a backend; it runs in a worker
+    thread the first time a call goes to that backend.
+    """
+
+    def __init__(self, build: Callable[[str], object], model: str, pool: BackendPool):
+        self.build = build
+        self.model = model
+        self.pool = pool
+        self.base_url: Optional[str] = None
+        self._llms: Dict[str, object] = {}
+
+    async def _llm_for(self, base_url: str):
+        if base_url not in self._llms:
+            self._llms[base_url] = await asyncio.to_thread(self.build, base_url)
+        return self._llms[base_url]
+
+    async def ainvoke(self, *args, **kwargs):
+        tried, last_error = [], None
+        while True:
+            # selecting may health check the backends, so not on the loop
+            try:
+                base_url = await asyncio.to_thread(
+                    self.pool.select, self.model, tried, reserve=True
+                )
+            except NoBackendError:
+                if last_error:
+                    raise last_error
+                raise
+            ran = False
+            try:
+                llm = await self._llm_for(base_url)
+                self.base_url = base_url
+                response = await llm.ainvoke(*args, **kwargs)
+                ran = True
+                return response
+            except BACKEND_ERRORS as e:
+                self.pool.mark_unhealthy(base_url, e)
+                tried.append(base_url)
+                last_error = e
+            finally:
+                self.pool.call_finished(base_url, self.model if ran else None)
+
+    def __getattr__(self, name):
+        # attributes of an LLM that was built already, building one here
+        # would talk to Ollama from the caller's (possibly async) context
+        llms = self.__dict__.get("_llms") or {}
+        if not llms:
+            raise AttributeError(name)
+        return getattr(llms.get(self.base_url) or next(iter(llms.values())), name)
@@ -0,0 +1,166 @@
+import math
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from ba_ragmas_chatbot.graph.prompts import Prompt
+from ba_ragmas_chatbot.graph.utils import get_context_config
+from ba_ragmas_chatbot import logger_config
+
+logger = logger_config.get_logger("ContextBudget")
+
+# chat template tokens around every message (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 8
+SHORTENED_MARKER = "[... shortened to fit the context window ...]"
+
+
+def shorten(segment: str, max_chars: int) -> str:
+    """
+    Compresses a segment to about max_chars. The first line (its label) and
+    short lines such as headings are kept, every longer paragraph is cut
+    by the same ratio at a sentence or word boundary, so all sources of a
+    briefing keep their beginning instead of the last ones being dropped.
+    """
+    if len(segment) <= max_chars:
+        return segment
+    head, _, body = segment.partition("\n")
+    paragraphs = body.split("\n\n")
+    long_chars = sum(len(p) for p in paragraphs if len(p) > 120)
+    fixed_chars = len(body) - long_chars + len(head) + len(SHORTENED_MARKER) + 2
+    ratio = max(0.0, (max_chars - fixed_chars) / long_chars) if long_chars else 0.0
+
+    kept = []
+    for paragraph in paragraphs:
+        if len(paragraph) <= 120:
+            kept.append(paragraph)
+            continue
+        cut = paragraph[: int(len(paragraph) * ratio)]
+        end = max(cut.rfind(". "), cut.rfind(".\n"))
+        if end > len(cut) // 2:
+            cut = cut[: end + 1]
+        else:
+            cut = cut.rsplit(" ", 1)[0] if " " in cut else cut
+        if cut.strip():
+            kept.append(cut.rstrip() + " …")
+
+    text = f"{head}\n" + "\n\n".join(kept)
+    text = text[: max(0, max_chars - len(SHORTENED_MARKER) - 1)]
+    return f"{text}\n{SHORTENED_MARKER}"
+
+
+class ContextBudget:
+    """
+    Keeps agent prompts within a token budget and sizes num_ctx per call.
+
+    Ollama has no tokenizer endpoint, so tokens are estimated from the
+    characters per token of each model (configurable, conservative by
+    default). When a prompt exceeds the agent's budget, its trimmable
+    segments are shortened, lowest priority first. num_ctx is then set to
+    the smallest configured context size that holds prompt and answer.
+
+    Every change of num_ctx makes Ollama reload the model and lose its
+    prompt cache, so sizes come in a few buckets and a model keeps its last
+    size as long as that size is large enough and at most one bucket above
+    what the call needs. A model that was unloaded starts over.
+    """
+
+    def __init__(self, model_for_agent: Callable[..., str]):
+        self.model_for_agent = model_for_agent
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}
+
+    def _config(self) -> dict:
+        return get_context_config()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._config().get("enabled", True))
+
+    def count_tokens(self, text: str, model: str) -> int:
+        config = self._config()
+        per_model = config.get("model_chars_per_token", {}) or {}
+        chars_per_token = float(per_model.get(model, config.get("chars_per_token", 3)))
+        return math.ceil(len(text) / chars_per_token)
+
+    def prompt_tokens(self, prompt: Prompt, model: str) -> int:
+        return (
+            self.count_tokens(prompt.system, model)
+            + self.count_tokens(prompt.text, model)
+            + 2 * MESSAGE_OVERHEAD_TOKENS
+        )
+
+    def _agent_value(self, key: str, agent_name: str, default: int) -> int:
+        return int((self._config().get(key, {}) or {}).get(agent_name, default))
+
+    def fit(
+        self, agent_name: str, prompt: Prompt, profile: Optional[str] = None
+    ) -> Tuple[Prompt, Optional[int]]:
+        """
+        Returns the prompt shortened to the agent's budget and the context
+        tokens the call needs (prompt plus reserved answer), or
+        (prompt, None) when the context budget is disabled. Tokens are
+        estimated for the agent's model in the run's profile.
+        """
+        if not self.enabled:
+            return prompt, None
+        config = self._config()
+        model = self.model_for_agent(agent_name, profile)
+        budget = self._agent_value(
+            "prompt_tokens", agent_name, config.get("default_prompt_tokens", 6000)
+        )
+        output_tokens = self._agent_value(
+            "output_tokens", agent_name, config.get("default_output_tokens", 1024)
+        )
+
+        tokens = self.prompt_tokens(prompt, model)
+        for segment in list(prompt.trimmable):
+            if tokens <= budget:
+                break
+            excess_chars = (
+                len(segment)
+                * (tokens - budget)
+                / max(1, self.count_tokens(segment, model))
+            )
+            shortened = shorten(segment, int(len(segment) - excess_chars))
+            prompt = prompt.replace_segment(segment, shortened)
+            new_tokens = self.prompt_tokens(prompt, model)
+            logger.info(
+                f"✂️ {agent_name}: shortened a prompt segment, {tokens} -> {new_tokens} tokens."
+            )
+            tokens = new_tokens
+
+        if tokens > budget:
+            logger.warning(
+                f"⚠️ {agent_name}: prompt needs ~{tokens} tokens, budget is {budget}."
+            )
+        return prompt, tokens + output_tokens
+
+    def num_ctx(self, model: str, tokens: Optional[int]) -> Optional[int]:
+        """
+        Context size for the next call of a model. Calls without an own
+        estimate (small helper prompts) reuse the model's current size.
+        """
+        if not self.enabled:
+            return None
+        sizes = sorted(self._config().get("context_sizes") or [4096])
+        with self._lock:
+            current = self._sizes.get(model)
+            if tokens is None:
+                return current or sizes[0]
+            needed = next((size for size in sizes if size >= tokens), sizes[-1])
+            # a much larger size left by one long prompt would slow down
+            # every later call, so it is given up for the smaller one
+            if current and needed <= current <= self._next_size(sizes, needed):
+                return current
+            if current:
+                logger.info(f"📐 num_ctx of {model}: {current} -> {needed}")
+            self._sizes[model] = needed
+            return needed
+
+    @staticmethod
+    def _next_size(sizes, size: int) -> int:
+        return next((bucket for bucket in sizes if bucket > size), size)
+
+    def forget(self, model: str) -> None:
+        """the model was unloaded, its next load may use any size."""
+        with self._lock:
+            self._sizes.pop(model, None)
@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from ba_ragmas_chatbot.graph.utils import get_embeddings_config
+from ba_ragmas_chatbot import logger_config
+
+logger = logger_config.get_logger("Embeddings")
+
+
+class _Request:
+    """the texts of one embed call, filled in batch by batch."""
+
+    def __init__(self, texts: List[str]):
+        self.vectors: List[Optional[List[float]]] = [None] * len(texts)
+        self.remaining = len(texts)
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+        if not texts:
+            self.done.set()
+
+
+class EmbeddingBatcher(Embeddings):
+    """
+    Embeds the texts of all concurrent callers (indexing workers, retrievers,
+    the research cache) in shared batches.
+
+    Texts are queued; a dispatcher thread sends up to batch_size of them in
+    one request as soon as the batch is full or the oldest text waited
+    window_ms. At most max_concurrent_batches requests are in flight, texts
+    arriving meanwhile join the next batch. Large calls are split over
+    several batches, every caller gets its vectors in order.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        config: Callable[[], dict] = get_embeddings_config,
+    ):
+        self.embeddings = embeddings
+        self._config = config
+        self._queue = deque()  # (request, index, text, enqueued)
+        self._condition = threading.Condition()
+        self._slots: Optional[threading.Semaphore] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._metrics = {
+            "chunks": 0,
+            "batches": 0,
+            "embed_seconds": 0.0,
+            "queue_seconds": 0.0,
+            "max_queue_seconds": 0.0,
+        }
+
+    @property
+    def model(self) -> str:
+        return getattr(self.embeddings, "model", "")
+
+    # public api
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        request = _Request(texts)
+        now = time.perf_counter()
+        with self._condition:
+            self._start()
+            for index, text in enumerate(texts):
+                self._queue.append((request, index, text, now))
+            self._condition.notify_all()
+        request.done.wait()
+        if request.error:
+            raise request.error
+        return request.vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def metrics(self) -> dict:
+        with self._condition:
+            m = dict(self._metrics)
+        return {
+            "chunks": m["chunks"],
+            "batches": m["batches"],
+            "avg_batch_size": (
+                round(m["chunks"] / m["batches"], 2) if m["batches"] else 0.0
+            ),
+            "chunks_per_second": (
+                round(m["chunks"] / m["embed_seconds"], 2)
+                if m["embed_seconds"]
+                else 0.0
+            ),
+            "avg_queue_seconds": (
+                round(m["queue_seconds"] / m["chunks"], 4) if m["chunks"] else 0.0
+            ),
+            "max_queue_seconds": round(m["max_queue_seconds"], 4),
+        }
+
+    # dispatching
+
+    def _start(self) -> None:
+        """starts the dispatcher thread on first use (caller holds the lock)."""
+        if self._dispatcher is None:
+            parallel = int(self._config().get("max_concurrent_batches", 2))
+            parallel = max(1, parallel)
+            self._slots = threading.Semaphore(parallel)
+            self._pool = ThreadPoolExecutor(
+                max_workers=parallel, thread_name_prefix="embedding"
+            )
+            self._dispatcher = threading.Thread(
+                target=self._dispatch, name="embedding-batcher", daemon=True
+            )
+            self._dispatcher.start()
+
+    def _next_batch(self):
+        """waits for a full batch or the end of the window, then takes it."""
+        config = self._config()
+        batch_size = max(1, int(config.get("batch_size", 32)))
+        window = float(config.get("window_ms", 20)) / 1000
+        with self._condition:
+            while not self._queue:
+                self._condition.wait()
+            deadline = self._queue[0][3] + window
+            while len(self._queue) < batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            count = min(batch_size, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _dispatch(self) -> None:
+        while True:
+            self._slots.acquire()
+            try:
+                batch = self._next_batch()
+            except Exception as e:
+                self._slots.release()
+                logger.error(f"❌ Embedding dispatcher failed: {e}")
+                continue
+            self._pool.submit(self._embed_batch, batch)
+
+    def _embed_batch(self, batch) -> None:
+        started = time.perf_counter()
+        try:
+            vectors = self.embeddings.embed_documents([text for _, _, text, _ in batch])
+            error = None
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding batch of {len(batch)} texts failed: {e}")
+            vectors, error = [None] * len(batch), e
+        finally:
+            self._slots.release()
+        elapsed = time.perf_counter() - started
+
+        with self._condition:
+            if error is None:
+                waits = [started - enqueued for _, _, _, enqueued in batch]
+                self._metrics["chunks"] += len(batch)
+                self._metrics["batches"] += 1
+                self._metrics["embed_seconds"] += elapsed
+                self._metrics["queue_seconds"] += sum(waits)
+                self._metrics["max_queue_seconds"] = max(
+                    self._metrics["max_queue_seconds"], *waits
+                )
+
+            # several batches may fill the same request
+            for (request, index, _, _), vector in zip(batch, vectors):
+                if error is not None:
+                    request.error = error
+                    request.done.set()
+                    continue
+                request.vectors[index] = vector
+                request.remaining -= 1
+                if request.remaining == 0:
+                    request.done.set()
@@ -1,41 +1,145 @@
+import asyncio
+import threading
+from typing import Optional
 from langchain_ollama import ChatOllama
-from ba_ragmas_chatbot.graph.utils import get_model_config
+from ollama import AsyncClient, Client
+from ba_ragmas_chatbot.graph.utils import get_model_config, config_service
+from ba_ragmas_chatbot.graph.profiles import get_profile
+from ba_ragmas_chatbot.llm.backends import BackendPool, RoutedLLM
+from ba_ragmas_chatbot.llm.context import ContextBudget
+from ba_ragmas_chatbot.llm.latency import LatencyTracker
+from ba_ragmas_chatbot.llm.residency import ResidencyPolicy
+from ba_ragmas_chatbot.llm.scheduler import ModelScheduler, ScheduledLLM
 
+DEFAULT_MODELS = {
+    "logic_model": "qwen2.5:7b-instruct-q5_k_m",
+    "creative_model": "gemma2:9b-instruct-q5_k_m",
+}
 
-def get_llm_for_agent(agent_name: str, temperature: float = 0.7):
+# agent -> (model type from configs.yaml, temperature)
+AGENT_MODELS = {
+    "researcher": ("logic_model", 0.0),
+    "editor": ("logic_model", 0.2),
+    "writer": ("creative_model", 0.7),
+    "fact_checker": ("logic_model", 0.0),
+    "polisher": ("creative_model", 0.6),
+}
+
+# (model, temperature, base_url) -> ChatOllama, base_url -> (Client, AsyncClient)
+_llm_pool = {}
+_ollama_clients = {}
+_pool_lock = threading.Lock()
+_pool_mtime = None
+
+
+def model_for_agent(agent_name: str, profile: Optional[str] = None) -> str:
+    """
+    Returns the configured model name an agent runs on. A pipeline profile
+    may assign the agent another model type.
+    """
+    model_key = AGENT_MODELS.get(agent_name, ("logic_model", None))[0]
+    if profile:
+        model_key = get_profile(profile)["models"].get(agent_name, model_key)
+    return get_model_config().get(model_key, DEFAULT_MODELS.get(model_key, model_key))
+
+
+context_budget = ContextBudget(model_for_agent)
+residency = ResidencyPolicy(model_for_agent, on_unload=context_budget.forget)
+latency = LatencyTracker()
+backend_pool = BackendPool()
+scheduler = ModelScheduler(
+    can_share=lambda a, b: a != b and residency.fit_together([a, b])
+)
+
+
+def _invalidate_on_config_change() -> None:
+    """drops all pooled clients once configs.yaml was reloaded."""
+    global _pool_mtime
+    mtime = config_service.version("configs.yaml")
+    if mtime != _pool_mtime:
+        _llm_pool.clear()
+        _ollama_clients.clear()
+        _pool_mtime = mtime
+
+
+def get_ollama_clients(base_url: str):
+    """
+    Returns the shared (sync, async) Ollama clients of a server, so all pooled
+    LLMs reuse the same keep-alive HTTP connections.
+    """
+    with _pool_lock:
+        _invalidate_on_config_change()
+        if base_url not in _ollama_clients:
+            _ollama_clients[base_url] = (
+                Client(host=base_url),
+                AsyncClient(host=base_url),
+            )
+        return _ollama_clients[base_url]
+
+
+def get_pooled_llm(model: str, temperature: float, base_url: str) -> ChatOllama:
+    """Returns the pooled ChatOllama instance for (model, temperature, base_url)."""
+    sync_client, async_client = get_ollama_clients(base_url)
+    key = (model, temperature, base_url)
+    with _pool_lock:
+        llm = _llm_pool.get(key)
+        if llm is None:
+            llm = ChatOllama(model=model, base_url=base_url, temperature=temperature)
+            llm._client = sync_client
+            llm._async_client = async_client
+            _llm_pool[key] = llm
+        return llm
+
+
+def get_llm_for_agent(
+    agent_name: str,
+    temperature: float = 0.7,
+    context_tokens: Optional[int] = None,
+    profile: Optional[str] = None,
+):
     """
     Returns the specialized LLM instance for a specific agent.
+    The underlying client is pooled, keep_alive is decided by the residency
+    policy for every call. context_tokens (see ContextBudget.fit) sets num_ctx,
+    profile selects the model of the run's pipeline profile. The backend is
+    picked by the backend pool for every call (and changed if it fails); the
+    LLM of a backend, with its residency preparation, is only built once a
+    call goes there. Calls wait for
+    their turn in the model scheduler, so the runs share model loads.
+    """
+    _, agent_temperature = AGENT_MODELS.get(agent_name, (None, temperature))
+    model = model_for_agent(agent_name, profile)
+    num_ctx = context_budget.num_ctx(model, context_tokens)
+
+    def build(base_url: str):
+        llm = get_pooled_llm(model, agent_temperature, base_url)
+        sync_client, _ = get_ollama_clients(base_url)
+        keep_alive = residency.prepare(agent_name, sync_client, model, profile)
+
+        # model-level callbacks are merged with those of the surrounding graph
+        # run, with_config(callbacks=...) would replace them and break streaming.
+        callbacks = [
+            residency.callback(agent_name, model, profile),
+            latency.callback(agent_name),
+        ]
+        llm = llm.model_copy(update={"callbacks": callbacks, "num_ctx": num_ctx})
+        return llm.bind(keep_alive=keep_alive)
+
+    # the backend is picked per call, building for it happens there as well
+    llm = RoutedLLM(build, model, backend_pool)
+    return ScheduledLLM(llm, model, scheduler)
+
+
+async def aget_llm_for_agent(
+    agent_name: str,
+    temperature: float = 0.7,
+    context_tokens: Optional[int] = None,
+    profile: Optional[str] = None,
+):
+    """
+    Async variant of get_llm_for_agent. Reading the configuration may reload
+    configs.yaml from disk, so it runs in a worker thread instead of the loop.
     """
-    config = get_model_config()
-    base_url = config.get("base_url", "http://localhost:11434")
-    logic_model = config.get("logic_model", "qwen2.5:7b-instruct-q5_k_m")
-    creative_model = config.get("creative_model", "gemma2:9b-instruct-q5_k_m")
-
-    if agent_name == "researcher":
-        return ChatOllama(
-            model=logic_model, base_url=base_url, temperature=0.0, keep_alive=0
-        )
-
-    elif agent_name == "editor":
-        return ChatOllama(
-            model=logic_model, base_url=base_url, temperature=0.2, keep_alive=0
-        )
-
-    elif agent_name == "writer":
-        return ChatOllama(
-            model=creative_model, base_url=base_url, temperature=0.7, keep_alive=0
-        )
-
-    elif agent_name == "fact_checker":
-        return ChatOllama(
-            model=logic_model, base_url=base_url, temperature=0.0, keep_alive=0
-        )
-
-    elif agent_name == "polisher":
-        return ChatOllama(
-            model=creative_model, base_url=base_url, temperature=0.6, keep_alive=0
-        )
-
-    return ChatOllama(
-        model=logic_model, base_url=base_url, temperature=temperature, keep_alive=0
+    return await asyncio.to_thread(
+        get_llm_for_agent, agent_name, temperature, context_tokens, profile
     )
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+class _LatencyCallback(BaseCallbackHandler):
+    """Measures time to first token and prompt evaluation of one agent's calls."""
+
+    # called in the event loop, not in an executor, so timestamps are exact
+    run_inline = True
+
+    def __init__(self, tracker: "LatencyTracker", agent_name: str):
+        self.tracker = tracker
+        self.agent_name = agent_name
+        self._started: Dict = {}
+        self._first_token: Dict = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if run_id in self._started and run_id not in self._first_token:
+            self._first_token[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        started = self._started.pop(run_id, None)
+        first_token = self._first_token.pop(run_id, None)
+        if started is None:
+            return
+        info = {}
+        for generations in response.generations:
+            for generation in generations:
+                info = generation.generation_info or info
+        ttft = (first_token or time.perf_counter()) - started
+        self.tracker.record(self.agent_name, ttft, info)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._started.pop(run_id, None)
+        self._first_token.pop(run_id, None)
+
+
+class LatencyTracker:
+    """
+    Time to first token per agent, plus what Ollama reports about prompt
+    evaluation. prompt_eval_count only counts tokens that were not served
+    from the prompt (KV) cache, so it shows how much of a prompt was reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = defaultdict(
+            lambda: {
+                "calls": 0,
+                "ttft_seconds": 0.0,
+                "prompt_tokens_evaluated": 0,
+                "prompt_eval_seconds": 0.0,
+            }
+        )
+
+    def record(self, agent_name: str, ttft: float, info: dict) -> None:
+        with self._lock:
+            metrics = self._metrics[agent_name]
+            metrics["calls"] += 1
+            metrics["ttft_seconds"] += ttft
+            metrics["prompt_tokens_evaluated"] += info.get("prompt_eval_count") or 0
+            metrics["prompt_eval_seconds"] += (
+                info.get("prompt_eval_duration") or 0
+            ) / 1e9
+
+    def metrics(self) -> Dict[str, dict]:
+        """averages per call and agent."""
+        with self._lock:
+            return {
+                agent: {
+                    "calls": m["calls"],
+                    "avg_ttft_seconds": round(m["ttft_seconds"] / m["calls"], 3),
+                    "avg_prompt_tokens_evaluated": round(
+                        m["prompt_tokens_evaluated"] / m["calls"]
+                    ),
+                    "avg_prompt_eval_seconds": round(
+                        m["prompt_eval_seconds"] / m["calls"], 3
+                    ),
+                }
+                for agent, m in self._metrics.items()
+                if m["calls"]
+            }
+
+    def callback(self, agent_name: str) -> BaseCallbackHandler:
+        return _LatencyCallback(self, agent_name)
@@ -0,0 +1,268 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from ollama import Client
+
+from ba_ragmas_chatbot.graph.utils import get_residency_config
+from ba_ragmas_chatbot import logger_config
+
+logger = logger_config.get_logger("ModelResidency")
+
+GB = 1024**3
+
+
+class _ResidencyCallback(BaseCallbackHandler):
+    """Reports start/end of one LLM call to the residency policy."""
+
+    def __init__(
+        self,
+        policy: "ResidencyPolicy",
+        agent_name: str,
+        model: str,
+        profile: Optional[str] = None,
+    ):
+        self.policy = policy
+        self.agent_name = agent_name
+        self.model = model
+        self.profile = profile
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.policy.call_started(self.agent_name, self.profile)
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self.policy.call_started(self.agent_name, self.profile)
+
+    def on_llm_end(self, response, **kwargs):
+        info = {}
+        for generations in response.generations:
+            for generation in generations:
+                info = generation.generation_info or info
+        self.policy.call_finished(self.agent_name, self.model, info, self.profile)
+
+    def on_llm_error(self, error, **kwargs):
+        self.policy.call_finished(self.agent_name, self.model, None, self.profile)
+
+
+class ResidencyPolicy:
+    """
+    Decides per node which Ollama models stay loaded.
+
+    A model is kept in memory when the next node of the graph, a node of
+    another running article or a queued run needs it, or when all pipeline
+    models fit into the configured memory budget together. Otherwise it is
+    unloaded right after the call (keep_alive=0). Before a model is loaded,
+    resident models that are not needed soon are evicted if the budget would
+    be exceeded. Topology and models are those of the run's pipeline
+    profile, e.g. the fast profile runs the writer on the logic model.
+    """
+
+    def __init__(
+        self,
+        model_for_agent: Callable[..., str],
+        on_unload: Optional[Callable[[str], None]] = None,
+    ):
+        self.model_for_agent = model_for_agent
+        self.on_unload = on_unload
+        self._lock = threading.Lock()
+        # profile -> node -> successor nodes
+        self._successors: Dict[Optional[str], Dict[str, List[str]]] = {}
+        # (agent, profile) -> calls in flight
+        self._in_flight: Dict[tuple, int] = defaultdict(int)
+        self._pending_runs = 0
+        self._active_runs = 0
+        self._observed_sizes: Dict[str, int] = {}
+        self._metrics = defaultdict(
+            lambda: {
+                "loads": 0,
+                "load_seconds": 0.0,
+                "unloads": 0,
+                "unload_seconds": 0.0,
+            }
+        )
+
+    # topology + run bookkeeping
+
+    def set_topology(self, edges: Iterable, profile: Optional[str] = None) -> None:
+        """registers the node successors of a profile's compiled graph."""
+        successors = defaultdict(list)
+        for edge in edges:
+            successors[edge.source].append(edge.target)
+        with self._lock:
+            self._successors[profile] = dict(successors)
+
+    def _model(self, agent_name: str, profile: Optional[str]) -> str:
+        if profile:
+            return self.model_for_agent(agent_name, profile)
+        return self.model_for_agent(agent_name)
+
+    def _topology(self, profile: Optional[str]) -> Dict[str, List[str]]:
+        """successors of a profile, all profiles together when it is unknown."""
+        if profile in self._successors:
+            return self._successors[profile]
+        merged = defaultdict(list)
+        for successors in self._successors.values():
+            for source, targets in successors.items():
+                merged[source].extend(t for t in targets if t not in merged[source])
+        return dict(merged)
+
+    def run_queued(self) -> None:
+        with self._lock:
+            self._pending_runs += 1
+
+    def run_started(self) -> None:
+        with self._lock:
+            self._pending_runs = max(0, self._pending_runs - 1)
+            self._active_runs += 1
+
+    def run_finished(self) -> None:
+        with self._lock:
+            self._active_runs = max(0, self._active_runs - 1)
+        logger.info(f"📊 Model residency metrics: {self.metrics()}")
+
+    def call_started(self, agent_name: str, profile: Optional[str] = None) -> None:
+        with self._lock:
+            self._in_flight[(agent_name, profile)] += 1
+
+    def call_finished(
+        self,
+        agent_name: str,
+        model: str,
+        info: Optional[dict],
+        profile: Optional[str] = None,
+    ) -> None:
+        key = (agent_name, profile)
+        with self._lock:
+            self._in_flight[key] = max(0, self._in_flight[key] - 1)
+            load_ns = (info or {}).get("load_duration") or 0
+            # a few ms of load_duration are reported for already resident models
+            if load_ns > 0.5 * 1e9:
+                self._metrics[model]["loads"] += 1
+                self._metrics[model]["load_seconds"] += load_ns / 1e9
+
+    def metrics(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                model: {k: round(v, 3) for k, v in values.items()}
+                for model, values in self._metrics.items()
+            }
+
+    # decisions
+
+    def _config(self) -> dict:
+        return get_residency_config()
+
+    def _model_size(self, model: str, config: dict) -> int:
+        if model in self._observed_sizes:
+            return self._observed_sizes[model]
+        sizes = config.get("model_sizes_gb", {}) or {}
+        return int(float(sizes.get(model, config.get("default_model_size_gb", 6))) * GB)
+
+    def _models_needed_soon(self, agent_name: str, profile: Optional[str]) -> set:
+        """models of the next nodes of this run, of other runs and of queued runs."""
+        # (agent, profile) pairs, every agent resolved within its run's profile
+        agents = {(a, profile) for a in self._topology(profile).get(agent_name, [])}
+        for (other, other_profile), count in self._in_flight.items():
+            if count > 0:
+                agents.add((other, other_profile))
+                successors = self._topology(other_profile).get(other, [])
+                agents.update((a, other_profile) for a in successors)
+        if self._pending_runs > 0:
+            agents.update((a, None) for a in self._topology(None).get("__start__", []))
+        return {self._model(a, p) for a, p in agents if not a.startswith("__")}
+
+    def _pipeline_models(self, profile: Optional[str]) -> set:
+        topology = self._topology(profile)
+        agents = set(topology)
+        for targets in topology.values():
+            agents.update(targets)
+        return {self._model(a, profile) for a in agents if not a.startswith("__")}
+
+    def fit_together(self, models: Iterable[str]) -> bool:
+        """True when all given models fit into the memory budget at once."""
+        config = self._config()
+        budget = int(float(config.get("memory_budget_gb", 8)) * GB)
+        with self._lock:
+            return sum(self._model_size(m, config) for m in set(models)) <= budget
+
+    def keep_alive_for(
+        self,
+        agent_name: str,
+        model: Optional[str] = None,
+        profile: Optional[str] = None,
+    ):
+        """keep_alive value for the next call of this agent in a profile's run."""
+        config = self._config()
+        keep_alive = config.get("keep_alive", "10m")
+        budget = int(float(config.get("memory_budget_gb", 8)) * GB)
+        model = model or self._model(agent_name, profile)
+
+        with self._lock:
+            pipeline = self._pipeline_models(profile) or {model}
+            if sum(self._model_size(m, config) for m in pipeline) <= budget:
+                return keep_alive
+            if model in self._models_needed_soon(agent_name, profile):
+                return keep_alive
+        return 0
+
+    def prepare(
+        self,
+        agent_name: str,
+        client: Client,
+        model: Optional[str] = None,
+        profile: Optional[str] = None,
+    ):
+        """
+        evicts resident models that would overflow the budget and returns
+        the keep_alive value for the upcoming call (model defaults to the
+        agent's model in the run's profile).
+        """
+        config = self._config()
+        budget = int(float(config.get("memory_budget_gb", 8)) * GB)
+        model = model or self._model(agent_name, profile)
+
+        try:
+            loaded = {m.model: m.size for m in client.ps().models}
+        except Exception as e:
+            logger.debug(f"Could not query loaded models: {e}")
+            loaded = {}
+
+        with self._lock:
+            self._observed_sizes.update(loaded)
+            needed = self._models_needed_soon(agent_name, profile) | {model}
+
+        used = sum(loaded.values())
+        if model not in loaded:
+            used += self._model_size(model, config)
+
+        for resident, size in sorted(loaded.items(), key=lambda kv: -kv[1]):
+            if used <= budget:
+                break
+            if resident in needed:
+                continue
+            self._unload(client, resident)
+            used -= size
+
+        return self.keep_alive_for(agent_name, model, profile)
+
+    def _unload(self, client: Client, model: str) -> None:
+        start = time.perf_counter()
+        try:
+            client.generate(model=model, keep_alive=0)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not unload {model}: {e}")
+            return
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._metrics[model]["unloads"] += 1
+            self._metrics[model]["unload_seconds"] += elapsed
+        logger.info(f"♻️ Unloaded {model} in {elapsed:.2f}s to free memory.")
+        if self.on_unload:
+            self.on_unload(model)
+
+    def callback(
+        self, agent_name: str, model: str, profile: Optional[str] = None
+    ) -> BaseCallbackHandler:
+        return _ResidencyCallback(self, agent_name, model, profile)
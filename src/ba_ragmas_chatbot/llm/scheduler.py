@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional
+
+from ba_ragmas_chatbot.graph.utils import get_scheduler_config
+from ba_ragmas_chatbot import logger_config
+
+logger = logger_config.get_logger("ModelScheduler")
+
+
+class ModelScheduler:
+    """
+    Orders the LLM calls of all running articles by model.
+
+    Calls for the model that is currently active are admitted right away,
+    calls for another model wait until the active model's work is drained,
+    so the logic model finishes everything queued for it before the creative
+    model is loaded (and the other way round). A call that waited longer
+    than max_wait_seconds stops new admissions of the active model, so no
+    run starves. Models that fit into the memory budget together
+    (can_share) are never held back, switching between them costs nothing.
+    """
+
+    def __init__(self, can_share: Optional[Callable[[str, str], bool]] = None):
+        self.can_share = can_share or (lambda a, b: False)
+        self._active: Optional[str] = None
+        self._running: Dict[str, int] = defaultdict(int)
+        self._waiting: Dict[str, List[float]] = defaultdict(list)
+        self._condition: Optional[asyncio.Condition] = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            "calls": 0,
+            "model_switches": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+        self._calls_per_model: Dict[str, int] = defaultdict(int)
+
+    def _get_condition(self) -> asyncio.Condition:
+        # created on first use, inside the event loop that runs the graphs
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _oldest_waiting(self, exclude: Optional[str] = None):
+        """(enqueue time, model) of the longest waiting call, or None."""
+        tickets = [
+            (min(times), model)
+            for model, times in self._waiting.items()
+            if times and model != exclude
+        ]
+        return min(tickets) if tickets else None
+
+    def _may_run(self, model: str, max_wait: float) -> bool:
+        active = self._active
+        if active is None:
+            return True
+        now = time.monotonic()
+        oldest = self._oldest_waiting(exclude=active)
+        if model == active:
+            # a call for another model waited too long: let the active model drain
+            return oldest is None or now - oldest[0] < max_wait
+        if self.can_share(active, model):
+            return True
+        if self._running[active] > 0:
+            return False
+        if self._waiting[active] and now - min(self._waiting[model]) < max_wait:
+            return False
+        # the longest waiting model goes first
+        return oldest is not None and oldest[1] == model
+
+    @asynccontextmanager
+    async def slot(self, model: str):
+        """waits until a call for this model may go to Ollama."""
+        config = get_scheduler_config()
+        if not config.get("enabled", True):
+            yield
+            return
+
+        max_wait = float(config.get("max_wait_seconds", 30))
+        condition = self._get_condition()
+        enqueued = time.monotonic()
+        async with condition:
+            self._waiting[model].append(enqueued)
+            try:
+                while not self._may_run(model, max_wait):
+                    remaining = max_wait - (time.monotonic() - enqueued)
+                    try:
+                        await asyncio.wait_for(
+                            condition.wait(), timeout=min(1.0, max(0.05, remaining))
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiting[model].remove(enqueued)
+            if self._active not in (None, model) and not self.can_share(
+                self._active, model
+            ):
+                logger.info(f"🔀 Switching from {self._active} to {model}.")
+                with self._lock:
+                    self._metrics["model_switches"] += 1
+            self._active = model
+            self._running[model] += 1
+
+        waited = time.monotonic() - enqueued
+        with self._lock:
+            self._metrics["calls"] += 1
+            self._metrics["wait_seconds"] += waited
+            self._metrics["max_wait_seconds"] = max(
+                self._metrics["max_wait_seconds"], waited
+            )
+            self._calls_per_model[model] += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                self._running[model] -= 1
+                condition.notify_all()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            calls = self._metrics["calls"]
+            return {
+                "calls": calls,
+                "model_switches": self._metrics["model_switches"],
+                "avg_wait_seconds": (
+                    round(self._metrics["wait_seconds"] / calls, 3) if calls else 0.0
+                ),
+                "max_wait_seconds": round(self._metrics["max_wait_seconds"], 3),
+                "calls_per_model": dict(self._calls_per_model),
+            }
+
+
+class ScheduledLLM:
+    """An agent's LLM whose calls go through the model scheduler."""
+
+    def __init__(self, llm, model: str, scheduler: ModelScheduler):
+        self.llm = llm
+        self.model = model
+        self.scheduler = scheduler
+
+    async def ainvoke(self, *args, **kwargs):
+        async with self.scheduler.slot(self.model):
+            return await self.llm.ainvoke(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
@@ -16,3 +16,5 @@ PROJECT_ROOT = find_project_root(HERE)
 DATA_ROOT = Path(os.getenv("BA_RAGMAS_DATA_DIR", PROJECT_ROOT))
 DB_DIR = DATA_ROOT / "db"
 DOCUMENTS_DIR = DATA_ROOT / "documents"
+JOBS_FILE = DATA_ROOT / "jobs.json"
+CHECKPOINT_DB = DATA_ROOT / "checkpoints.sqlite"
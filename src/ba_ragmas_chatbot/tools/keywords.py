@@ -0,0 +1,90 @@
+import re
+from collections import defaultdict
+from typing import List
+
+STOPWORDS_EN = set("""
+    a about above after again against all also am an and any are as at be
+    because been before being below between both but by can could did do
+    does doing down during each either every few for from further get had
+    has have having he her here hers him his how i if in into is it its
+    itself just let like may me might more most much must my no nor not now
+    of off on once only or other our ours out over own please same shall she
+    should so some such than that the their theirs them then there these
+    they this those through to too under until up us very was we were what
+    when where which while who whom why will with would you your yours
+    """.split())
+
+STOPWORDS_DE = set("""
+    aber alle allem allen aller alles als also am an ander andere anderen
+    auch auf aus bei beim bin bis bist bitte da damit dann das dass dein
+    deine dem den denn der des dessen die dies diese diesem diesen dieser
+    dieses doch dort du durch ein eine einem einen einer eines er es etwas
+    euer eure für gegen hat hatte hier hin hinter ich ihr ihre im in indem
+    ins ist jede jedem jeden jeder jedes jetzt kann kein keine können machen
+    man mehr mein meine mit muss nach nicht noch nun nur ob oder ohne sehr
+    sein seine sich sie sind so soll sollte sondern über um und uns unser
+    unter viel vom von vor während war waren was weil welche welcher wenn
+    wer werden wie wieder will wir wird wo wurde zu zum zur zwischen
+    """.split())
+
+# words that describe the writing task rather than its subject
+TASK_WORDS = set("""
+    article articles blog blogpost create describe explain give overview
+    post summarize text write writing artikel beitrag blogartikel
+    blogbeitrag beschreibe erkläre erstelle schreibe überblick verfasse
+    """.split())
+
+STOPWORDS = STOPWORDS_EN | STOPWORDS_DE | TASK_WORDS
+
+TOKEN_PATTERN = re.compile(r"[^\W_][\w\-+.#]*|[,;:!?()\[\]\"'/]")
+
+
+def _candidate_phrases(text: str) -> List[List[str]]:
+    """runs of content words, split at stopwords and punctuation."""
+    phrases, current = [], []
+    for token in TOKEN_PATTERN.findall(text):
+        word = token.rstrip(".").lower()
+        if not word or word in STOPWORDS or not word[0].isalnum():
+            if current:
+                phrases.append(current)
+            current = []
+        elif len(word) > 1 or word.isdigit():
+            current.append(token.rstrip("."))
+    if current:
+        phrases.append(current)
+    return phrases
+
+
+def extract_keywords(text: str, max_words: int = 4) -> str:
+    """
+    RAKE-style keyword extraction for web search queries.
+
+    Words are scored by degree / frequency inside the candidate phrases,
+    phrases by the sum of their words. The best phrases are taken until
+    max_words is reached and returned in the order they appear in the text.
+    """
+    phrases = _candidate_phrases(text)
+    frequency, degree = defaultdict(int), defaultdict(int)
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word.lower()] += 1
+            degree[word.lower()] += len(phrase)
+
+    scored = []
+    for position, phrase in enumerate(phrases):
+        score = sum(degree[w.lower()] / frequency[w.lower()] for w in phrase)
+        scored.append((-score, position, phrase))
+
+    chosen, seen = [], set()
+    for _, position, phrase in sorted(scored):
+        words = [w for w in phrase if w.lower() not in seen]
+        if not words:
+            continue
+        if chosen and len(seen) + len(words) > max_words:
+            continue
+        chosen.append((position, words[:max_words]))
+        seen.update(w.lower() for w in words)
+        if len(seen) >= max_words:
+            break
+
+    return " ".join(word for _, words in sorted(chosen) for word in words)
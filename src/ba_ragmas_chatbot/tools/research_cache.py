@@ -0,0 +1,142 @@
+import hashlib
+import time
+import uuid
+from typing import List, Optional
+
+from ba_ragmas_chatbot.graph.utils import get_app_config
+from ba_ragmas_chatbot.tools.vectorstore import (
+    _hash_file,
+    embedding_model_name,
+    get_chroma_client,
+    get_embedding_function,
+    model_collection_name,
+)
+
+RESEARCH_CACHE_COLLECTION = "research_cache"
+
+
+def _cache_config() -> dict:
+    return get_app_config().get("research_cache", {}) or {}
+
+
+def get_research_cache():
+    """
+    persistent collection of research briefings, searched by topic vector.
+    One per embedding model, the topic vectors of models differ in dimension.
+    """
+    return get_chroma_client().get_or_create_collection(
+        model_collection_name(RESEARCH_CACHE_COLLECTION, embedding_model_name()),
+        metadata={"hnsw:space": "cosine"},
+    )
+
+
+def sources_fingerprint(paths: Optional[List[str]]) -> str:
+    """one hash over the contents of all uploaded documents (URLs by name)."""
+    digest = hashlib.sha256()
+    for path in sorted(paths or []):
+        if path.startswith("http://") or path.startswith("https://"):
+            part = path
+        else:
+            try:
+                part = _hash_file(path)
+            except OSError:
+                part = path
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_key(fingerprint: str, language: str) -> dict:
+    """what a cached briefing must match besides the topic."""
+    return {
+        "sources": fingerprint,
+        "language": (language or "").strip().lower(),
+        "embedding_model": embedding_model_name(),
+    }
+
+
+def topic_embedding(topic: str) -> List[float]:
+    return get_embedding_function().embed_query(topic.strip().lower())
+
+
+def lookup_briefing(
+    embedding: List[float], fingerprint: str, language: str
+) -> Optional[str]:
+    """
+    Returns a fresh cached briefing for the most similar topic with the same
+    sources and language, or None. A hit counts as use for the LRU bound.
+    """
+    cfg = _cache_config()
+    if not cfg.get("enabled", True):
+        return None
+    try:
+        cache = get_research_cache()
+        if cache.count() == 0:
+            return None
+        result = cache.query(
+            query_embeddings=[embedding],
+            n_results=5,
+            where={
+                "$and": [{k: v} for k, v in _cache_key(fingerprint, language).items()]
+            },
+            include=["documents", "metadatas", "distances"],
+        )
+    except Exception as e:
+        print(f"⚠️ Research cache lookup failed: {e}")
+        return None
+
+    now = time.time()
+    ttl = cfg.get("ttl_hours", 72) * 3600
+    threshold = cfg.get("similarity_threshold", 0.92)
+    for entry_id, briefing, metadata, distance in zip(
+        result["ids"][0],
+        result["documents"][0],
+        result["metadatas"][0],
+        result["distances"][0],
+    ):
+        if now - metadata.get("created_at", 0) > ttl or 1 - distance < threshold:
+            continue
+        cache.update(ids=[entry_id], metadatas=[{**metadata, "last_used": now}])
+        print(f"♻️ Research cache hit: '{metadata.get('topic')}'")
+        return briefing
+    return None
+
+
+def store_briefing(
+    embedding: List[float],
+    fingerprint: str,
+    language: str,
+    topic: str,
+    briefing: str,
+) -> None:
+    cfg = _cache_config()
+    if not cfg.get("enabled", True) or not briefing:
+        return
+    now = time.time()
+    metadata = _cache_key(fingerprint, language)
+    metadata.update(topic=topic, created_at=now, last_used=now)
+    try:
+        cache = get_research_cache()
+        cache.add(
+            ids=[uuid.uuid4().hex],
+            embeddings=[embedding],
+            documents=[briefing],
+            metadatas=[metadata],
+        )
+        _evict(cache, cfg.get("max_entries", 500), cfg.get("ttl_hours", 72) * 3600)
+    except Exception as e:
+        print(f"⚠️ Research cache store failed: {e}")
+
+
+def _evict(cache, max_entries: int, ttl: float) -> None:
+    """removes expired briefings, then the least recently used ones."""
+    entries = cache.get(include=["metadatas"])
+    now = time.time()
+    rows = sorted(
+        zip(entries["ids"], entries["metadatas"]),
+        key=lambda row: row[1].get("last_used", 0),
+    )
+    expired = [i for i, m in rows if now - m.get("created_at", 0) > ttl]
+    alive = [i for i, m in rows if now - m.get("created_at", 0) <= ttl]
+    overflow = alive[: max(0, len(alive) - max_entries)]
+    if expired or overflow:
+        cache.delete(ids=expired + overflow)
@@ -1,7 +1,17 @@
 import os
-import shutil
-from typing import List
-from ba_ragmas_chatbot.graph.utils import get_model_config
+import asyncio
+import re
+import hashlib
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Optional
+import chromadb
+from ba_ragmas_chatbot.graph.utils import (
+    get_app_config,
+    get_embeddings_config,
+    get_model_config,
+)
 from langchain_chroma import Chroma
 from langchain_ollama import OllamaEmbeddings
 from langchain_community.document_loaders import (
@@ -13,84 +23,366 @@ from langchain_community.document_loaders import (
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 
+from ba_ragmas_chatbot.llm.embeddings import EmbeddingBatcher
+from ba_ragmas_chatbot.llm.factory import backend_pool
 from ba_ragmas_chatbot.paths import DB_DIR
 
-
 DB_DIR_STR = str(DB_DIR)
 
+RUN_COLLECTION_PREFIX = "run_"
+EMBEDDING_CACHE_COLLECTION = "embedding_cache"
+
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+
+_client = None
+_client_lock = threading.Lock()
+_indexing_pool = None
+_embedding_batchers = {}
+
+
+def get_chroma_client():
+    """one persistent chroma client, shared by all runs."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            os.makedirs(DB_DIR_STR, exist_ok=True)
+            _client = chromadb.PersistentClient(path=DB_DIR_STR)
+        return _client
+
+
+def new_collection_name(owner_id) -> str:
+    """
+    builds a unique collection name for one generation run of one chat.
+    """
+    owner = re.sub(r"[^a-zA-Z0-9_-]", "", str(owner_id)) or "anonymous"
+    return f"{RUN_COLLECTION_PREFIX}{owner}_{uuid.uuid4().hex[:12]}"
+
+
+def embedding_model_name() -> str:
+    return get_model_config().get("embedding_model", "mxbai-embed-large")
+
+
+def model_collection_name(prefix: str, model: str) -> str:
+    """
+    name of a collection that holds vectors of one embedding model only.
+    A chroma collection has a fixed dimension, so models cannot share one.
+    """
+    slug = re.sub(r"[^a-zA-Z0-9_-]", "_", model).strip("_-") or "default"
+    return f"{prefix}_{slug}"
+
 
 def get_embedding_function():
-    """defines embedding-model!"""
-    config = get_model_config()
-    return OllamaEmbeddings(
-        model=config.get("embedding_model", "mxbai-embed-large"),
-        base_url=config.get("base_url", "http://localhost:11434"),
-    )
+    """
+    defines embedding-model! (on the embeddings backend, if there is one)
+    All callers share one batcher per model and backend, so their texts are
+    embedded in common batches.
+    """
+    model = embedding_model_name()
+    base_url = backend_pool.select(model, embeddings=True)
+    if not get_embeddings_config().get("batching", True):
+        return OllamaEmbeddings(model=model, base_url=base_url)
+    with _client_lock:
+        key = (model, base_url)
+        if key not in _embedding_batchers:
+            _embedding_batchers[key] = EmbeddingBatcher(
+                OllamaEmbeddings(model=model, base_url=base_url)
+            )
+        return _embedding_batchers[key]
+
+
+def embedding_metrics() -> dict:
+    """batching metrics per embedding model and backend."""
+    with _client_lock:
+        batchers = dict(_embedding_batchers)
+    return {f"{model}@{url}": b.metrics() for (model, url), b in batchers.items()}
+
 
+def _load_documents(path: str):
+    """loads one file or website into langchain documents."""
+    if path.startswith("http://") or path.startswith("https://"):
+        print(f"🌐 Loading URL content: {path}")
+        loader = WebBaseLoader(path)
+    elif path.endswith(".pdf"):
+        loader = PyPDFLoader(path)
+    elif path.endswith(".docx"):
+        loader = Docx2txtLoader(path)
+    elif path.endswith(".txt"):
+        loader = TextLoader(path, encoding="utf-8")
+    else:
+        return []
+    return loader.load()
 
-def setup_vectorstore(documents_paths: List[str]):
+
+def _cache_key(content_hash: str, model_name: str) -> str:
+    """cache key = document content + splitter settings + embedding model."""
+    raw = f"{content_hash}|{CHUNK_SIZE}|{CHUNK_OVERLAP}|{model_name}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_documents(docs) -> str:
+    digest = hashlib.sha256()
+    for doc in docs:
+        digest.update(doc.page_content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _clean_metadata(metadata: dict) -> dict:
+    """chroma only accepts scalar metadata values."""
+    return {k: v for k, v in metadata.items() if isinstance(v, (str, int, float, bool))}
+
+
+def get_embedding_cache(model_name: Optional[str] = None):
     """
-    deletes old db and creates it new with current documents.
+    persistent collection holding chunks + vectors of every document indexed
+    with the embedding model (the configured one by default).
     """
+    return get_chroma_client().get_or_create_collection(
+        model_collection_name(
+            EMBEDDING_CACHE_COLLECTION, model_name or embedding_model_name()
+        )
+    )
 
-    if os.path.exists(DB_DIR_STR):
-        shutil.rmtree(DB_DIR_STR)
 
-    if not documents_paths:
-        print("ℹ️ no documents to index.")
+def _load_cached_chunks(key: str, model_name: str):
+    """returns (documents, metadatas, embeddings) for a cache key or None."""
+    cached = get_embedding_cache(model_name).get(
+        where={"cache_key": key},
+        include=["documents", "metadatas", "embeddings"],
+    )
+    if not cached["ids"]:
         return None
 
-    docs = []
-
-    for path in documents_paths:
-        try:
-            if path.startswith("http://") or path.startswith("https://"):
-                print(f"🌐 Loading URL content: {path}")
-                loader = WebBaseLoader(path)
-            elif path.endswith(".pdf"):
-                loader = PyPDFLoader(path)
-            elif path.endswith(".docx"):
-                loader = Docx2txtLoader(path)
-            elif path.endswith(".txt"):
-                loader = TextLoader(path, encoding="utf-8")
-            else:
-                continue
-
-            docs.extend(loader.load())
-            print(f"✅ document loaded: {os.path.basename(path)}")
-        except Exception as e:
-            print(f"⚠️ error loading {path}: {e}")
+    rows = sorted(
+        zip(cached["documents"], cached["metadatas"], cached["embeddings"]),
+        key=lambda row: row[1].get("chunk_index", 0),
+    )
+    texts = [row[0] for row in rows]
+    metadatas = [row[1] for row in rows]
+    embeddings = [list(row[2]) for row in rows]
+    return texts, metadatas, embeddings
+
+
+def _store_cached_chunks(
+    key: str, model_name: str, texts, metadatas, embeddings
+) -> None:
+    get_embedding_cache(model_name).upsert(
+        ids=[f"{key}:{i}" for i in range(len(texts))],
+        documents=texts,
+        metadatas=[
+            {**m, "cache_key": key, "chunk_index": i} for i, m in enumerate(metadatas)
+        ],
+        embeddings=embeddings,
+    )
+
+
+def _index_document(path: str, text_splitter, embeddings, model_name: str):
+    """
+    returns chunks + vectors for one source. Files are looked up by their
+    content hash before loading, websites after loading. Only cache misses
+    are split and embedded.
+    """
+    is_url = path.startswith("http://") or path.startswith("https://")
+    docs = None
+
+    if is_url:
+        docs = _load_documents(path)
+        if not docs:
+            return None
+        key = _cache_key(_hash_documents(docs), model_name)
+    else:
+        key = _cache_key(_hash_file(path), model_name)
+
+    cached = _load_cached_chunks(key, model_name)
+    if cached:
+        print(f"⚡ embedding cache hit: {os.path.basename(path)}")
+        return cached
 
+    if docs is None:
+        docs = _load_documents(path)
     if not docs:
         return None
 
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=500,
-        chunk_overlap=50,
+    splits = text_splitter.split_documents(docs)
+    if not splits:
+        return None
+
+    texts = [d.page_content for d in splits]
+    metadatas = [_clean_metadata(d.metadata) for d in splits]
+    vectors = embeddings.embed_documents(texts)
+    _store_cached_chunks(key, model_name, texts, metadatas, vectors)
+    return texts, metadatas, vectors
+
+
+def _new_text_splitter():
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
         add_start_index=True,
     )
-    splits = text_splitter.split_documents(docs)
 
-    os.makedirs(DB_DIR_STR, exist_ok=True)
 
-    vectorstore = Chroma.from_documents(
-        documents=splits,
-        embedding=get_embedding_function(),
-        persist_directory=DB_DIR_STR,
+def _index_source(path: str, text_splitter, embeddings):
+    """indexes one source, errors are reported and skipped."""
+    try:
+        indexed = _index_document(path, text_splitter, embeddings, embeddings.model)
+    except Exception as e:
+        print(f"⚠️ error loading {path}: {e}")
+        return None
+    if indexed:
+        print(f"✅ document loaded: {os.path.basename(path)}")
+    return indexed
+
+
+def _create_collection(collection_name: str, results, embeddings):
+    """writes the chunks + vectors of all sources into the run collection."""
+    texts, metadatas, vectors = [], [], []
+    for indexed in results:
+        if not indexed:
+            continue
+        texts.extend(indexed[0])
+        metadatas.extend(indexed[1])
+        vectors.extend(indexed[2])
+
+    if not texts:
+        return None
+
+    collection = get_chroma_client().get_or_create_collection(collection_name)
+    collection.add(
+        ids=[str(uuid.uuid4()) for _ in texts],
+        documents=texts,
+        metadatas=metadatas,
+        embeddings=vectors,
+    )
+
+    print(f"💾 Collection '{collection_name}' created with {len(texts)} chunks.")
+    return Chroma(
+        client=get_chroma_client(),
+        collection_name=collection_name,
+        embedding_function=embeddings,
+    )
+
+
+def setup_vectorstore(documents_paths: List[str], collection_name: str):
+    """
+    creates an isolated collection for one run with the current documents.
+    Chunks and vectors of already seen documents come from the embedding cache.
+    """
+
+    if not documents_paths:
+        print("ℹ️ no documents to index.")
+        return None
+
+    embeddings = get_embedding_function()
+    text_splitter = _new_text_splitter()
+    results = [
+        _index_source(path, text_splitter, embeddings) for path in documents_paths
+    ]
+    return _create_collection(collection_name, results, embeddings)
+
+
+def _get_indexing_pool() -> ThreadPoolExecutor:
+    global _indexing_pool
+    with _client_lock:
+        if _indexing_pool is None:
+            workers = get_app_config().get("indexing", {}).get("max_workers", 4)
+            _indexing_pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="indexing"
+            )
+        return _indexing_pool
+
+
+async def asetup_vectorstore(
+    documents_paths: List[str],
+    collection_name: str,
+    progress: Optional[Callable[[int, int, str], Awaitable[None]]] = None,
+):
+    """
+    setup_vectorstore as a background job for the event loop. Every source is
+    loaded, split and embedded in its own worker of the indexing pool, so the
+    steps of several documents overlap. progress(done, total, name) is awaited
+    whenever a source is finished.
+    """
+
+    if not documents_paths:
+        print("ℹ️ no documents to index.")
+        return None
+
+    loop = asyncio.get_running_loop()
+    pool = _get_indexing_pool()
+    # picking the backend may health check it, so not on the loop
+    embeddings = await loop.run_in_executor(pool, get_embedding_function)
+    text_splitter = _new_text_splitter()
+
+    async def index(position: int, path: str):
+        indexed = await loop.run_in_executor(
+            pool, _index_source, path, text_splitter, embeddings
+        )
+        return position, path, indexed
+
+    results = [None] * len(documents_paths)
+    jobs = [index(i, path) for i, path in enumerate(documents_paths)]
+
+    for done, job in enumerate(asyncio.as_completed(jobs), start=1):
+        position, path, indexed = await job
+        results[position] = indexed
+        if progress:
+            await progress(done, len(documents_paths), os.path.basename(path))
+
+    return await loop.run_in_executor(
+        pool, _create_collection, collection_name, results, embeddings
     )
 
-    print(f"💾 Vectorstore created in {DB_DIR_STR} with {len(splits)} chunks.")
-    return vectorstore
 
+def get_retriever(collection_name: Optional[str], k: int = 4):
+    """hands back retriever of the run's collection for agents."""
+    if not collection_name:
+        return None
 
-def get_retriever(k: int = 4):
-    """hands back retriever for agents."""
-    if not os.path.exists(DB_DIR_STR):
+    client = get_chroma_client()
+    try:
+        client.get_collection(collection_name)
+    except Exception:
         return None
 
     vectorstore = Chroma(
-        persist_directory=DB_DIR_STR,
+        client=client,
+        collection_name=collection_name,
         embedding_function=get_embedding_function(),
+        create_collection_if_not_exists=False,
     )
 
     return vectorstore.as_retriever(search_kwargs={"k": k})
+
+
+def drop_vectorstore(collection_name: Optional[str]) -> None:
+    """deletes the collection of a finished run."""
+    if not collection_name:
+        return
+    try:
+        get_chroma_client().delete_collection(collection_name)
+        print(f"🧹 Collection '{collection_name}' removed.")
+    except Exception:
+        pass
+
+
+def drop_stale_collections() -> int:
+    """
+    removes run collections left behind by runs that never finished (e.g. crash).
+    """
+    client = get_chroma_client()
+    removed = 0
+    for collection in client.list_collections():
+        name = getattr(collection, "name", collection)
+        if name.startswith(RUN_COLLECTION_PREFIX):
+            drop_vectorstore(name)
+            removed += 1
+    return removed
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_ollama import ChatOllama
+
+from ba_ragmas_chatbot.llm import backends as backends_module
+from ba_ragmas_chatbot.llm.backends import BackendPool, NoBackendError, RoutedLLM
+from ba_ragmas_chatbot.tools import vectorstore
+
+
+class StandInOllama:
+    """a local HTTP server answering like Ollama, recording the models it served."""
+
+    def __init__(self, loaded=()):
+        self.loaded = list(loaded)
+        self.served = []
+        self.stopped = False
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: str, content_type="application/json"):
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                models = [
+                    {"name": m, "model": m, "size": 1, "digest": ""}
+                    for m in stand_in.loaded
+                ]
+                self._send(json.dumps({"models": models}))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if stand_in.stopped:
+                    # kept-alive connections of a stopped server just drop
+                    self.close_connection = True
+                    return
+                stand_in.served.append(body["model"])
+                if self.path == "/api/embed":
+                    vectors = [[0.1, 0.2] for _ in body["input"]]
+                    self._send(
+                        json.dumps({"model": body["model"], "embeddings": vectors})
+                    )
+                    return
+                line = {
+                    "model": body["model"],
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "message": {
+                        "role": "assistant",
+                        "content": f"from {stand_in.port}",
+                    },
+                    "done": True,
+                    "done_reason": "stop",
+                }
+                self._send(json.dumps(line) + "\n", "application/x-ndjson")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.stopped = True
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def servers():
+    servers = []
+
+    def start(**kwargs):
+        server = StandInOllama(**kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def models_config(monkeypatch):
+    config = {"backends": [], "health_check_seconds": 60, "health_check_timeout": 1}
+    monkeypatch.setattr(backends_module, "get_model_config", lambda: config)
+    return config
+
+
+def test_backend_with_the_model_loaded_is_preferred(servers, models_config):
+    # arrange
+    cold = servers()
+    warm = servers(loaded=["qwen"])
+    creative_only = servers(loaded=["qwen"])
+    models_config["backends"] = [
+        {"base_url": cold.base_url},
+        {"base_url": warm.base_url},
+        {"base_url": creative_only.base_url, "models": ["gemma"]},
+    ]
+    pool = BackendPool()
+
+    # act + assert
+    assert pool.select("qwen") == warm.base_url
+    assert pool.select("gemma") == cold.base_url
+    assert pool.status()[warm.base_url]["loaded"] == ["qwen"]
+
+
+def test_unreachable_backends_are_skipped(servers, models_config):
+    # arrange
+    down = servers()
+    up = servers()
+    down.stop()
+    models_config["backends"] = [
+        {"base_url": down.base_url},
+        {"base_url": up.base_url, "models": ["qwen"]},
+        {"base_url": "http://127.0.0.1:1", "models": ["gemma"]},
+    ]
+    pool = BackendPool()
+
+    # act + assert
+    assert pool.select("qwen") == up.base_url
+    # no healthy backend serves gemma, so the first one is tried anyway
+    assert pool.select("gemma") == down.base_url
+    with pytest.raises(NoBackendError):
+        pool.select("llama", exclude=[down.base_url])
+
+
+@pytest.mark.asyncio
+async def test_call_fails_over_when_its_backend_goes_down(servers, models_config):
+    # arrange
+    first = servers(loaded=["qwen"])
+    second = servers()
+    models_config["backends"] = [
+        {"base_url": first.base_url},
+        {"base_url": second.base_url},
+    ]
+    pool = BackendPool()
+    llm = RoutedLLM(
+        lambda base_url: ChatOllama(model="qwen", base_url=base_url), "qwen", pool
+    )
+    assert (await llm.ainvoke([HumanMessage(content="hi")])).content.endswith(
+        str(first.port)
+    )
+    first.stop()
+
+    # act
+    response = await llm.ainvoke([HumanMessage(content="hi")])
+
+    # assert
+    assert response.content == f"from {second.port}"
+    assert second.served == ["qwen"]
+    assert pool.status()[first.base_url]["healthy"] is False
+
+
+@pytest.mark.asyncio
+async def test_parallel_calls_spread_over_backends(servers, models_config):
+    # arrange: the model is loaded on the first backend only
+    warm = servers(loaded=["gemma"])
+    cold = servers()
+    models_config["backends"] = [
+        {"base_url": warm.base_url, "max_parallel": 2},
+        {"base_url": cold.base_url},
+    ]
+    pool = BackendPool()
+    used = []
+
+    class SlowLLM:
+        def __init__(self, base_url):
+            self.base_url = base_url
+
+        async def ainvoke(self, section):
+            used.append(self.base_url)
+            await asyncio.sleep(0.05)
+            return section
+
+    llm = RoutedLLM(SlowLLM, "gemma", pool)
+
+    # act: four sections of one draft at once
+    await asyncio.gather(*[llm.ainvoke(f"section {i}") for i in range(4)])
+
+    # assert
+    assert used.count(warm.base_url) == 2
+    assert used.count(cold.base_url) == 2
+    assert all(s["in_flight"] == 0 for s in pool.status().values())
+
+
+@pytest.mark.asyncio
+async def test_backends_are_only_prepared_and_marked_when_a_call_runs(
+    servers, models_config
+):
+    # arrange
+    first = servers()
+    second = servers()
+    models_config["backends"] = [
+        {"base_url": first.base_url},
+        {"base_url": second.base_url},
+    ]
+    pool = BackendPool()
+    built = []
+
+    def build(base_url):
+        built.append(base_url)
+        return ChatOllama(model="qwen", base_url=base_url)
+
+    # act
+    llm = RoutedLLM(build, "qwen", pool)
+    picked = pool.select("qwen")
+    loaded_before = pool.status()[picked]["loaded"]
+    await llm.ainvoke([HumanMessage(content="hi")])
+
+    # assert
+    assert loaded_before == []
+    assert built == [first.base_url]
+    assert pool.status()[first.base_url]["loaded"] == ["qwen"]
+    assert pool.status()[second.base_url]["loaded"] == []
+
+
+def test_embeddings_go_to_the_embeddings_backend(servers, models_config, monkeypatch):
+    # arrange
+    chat = servers(loaded=["mxbai-embed-large"])
+    embed = servers()
+    models_config["embedding_model"] = "mxbai-embed-large"
+    models_config["backends"] = [
+        {"base_url": chat.base_url},
+        {"base_url": embed.base_url, "embeddings": True},
+    ]
+    monkeypatch.setattr(vectorstore, "get_model_config", lambda: models_config)
+    monkeypatch.setattr(vectorstore, "backend_pool", BackendPool())
+
+    # act
+    vectors = vectorstore.get_embedding_function().embed_documents(["a", "b"])
+
+    # assert
+    assert len(vectors) == 2
+    assert embed.served == ["mxbai-embed-large"]
+    assert chat.served == []
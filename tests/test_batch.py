@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from ba_ragmas_chatbot import batch
+from ba_ragmas_chatbot.graph import workflow
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    # arrange: nodes that only record their calls, the polisher of the
+    # "fails" job raises on its first attempt
+    calls = []
+    failures = ["fails"]
+
+    def fake_node(name, update):
+        async def node(state):
+            calls.append((state["topic"], name))
+            if name == "polisher" and state["topic"] in failures:
+                failures.remove(state["topic"])
+                raise TimeoutError("ollama timed out")
+            return update(state) if callable(update) else update
+
+        return node
+
+    monkeypatch.setattr(batch, "drop_vectorstore", lambda collection_name: None)
+    monkeypatch.setattr(
+        workflow, "research_node", fake_node("researcher", {"research_data": ["r"]})
+    )
+    monkeypatch.setattr(
+        workflow, "editor_node", fake_node("editor", {"outline": ["o"]})
+    )
+    monkeypatch.setattr(workflow, "writer_node", fake_node("writer", {"draft": "d"}))
+    monkeypatch.setattr(
+        workflow, "fact_check_node", fake_node("fact_checker", {"blocking_issues": []})
+    )
+    monkeypatch.setattr(
+        workflow,
+        "polisher_node",
+        fake_node("polisher", lambda s: {"final_article": f"# {s['topic']}"}),
+    )
+    return calls
+
+
+def test_jobs_are_read_from_yaml_and_csv(tmp_path):
+    # arrange
+    yaml_file = tmp_path / "jobs.yaml"
+    yaml_file.write_text(
+        "defaults:\n  tone: casual\njobs:\n"
+        "  - topic: Green tea\n    documents: [notes.pdf]\n"
+        "  - topic: Coffee\n    id: coffee\n    tone: professional\n"
+    )
+    csv_file = tmp_path / "jobs.csv"
+    csv_file.write_text(
+        "topic,length,documents\nGreen tea,short,a.pdf;https://example.com\n"
+    )
+
+    # act
+    yaml_jobs = batch.load_jobs(yaml_file)
+    csv_jobs = batch.load_jobs(csv_file)
+
+    # assert
+    assert [j.job_id for j in yaml_jobs] == ["001_green_tea", "coffee"]
+    assert [j.tone for j in yaml_jobs] == ["casual", "professional"]
+    assert yaml_jobs[0].documents == [str(tmp_path / "notes.pdf")]
+    assert csv_jobs[0].length == "short"
+    assert csv_jobs[0].documents == [str(tmp_path / "a.pdf"), "https://example.com"]
+
+
+@pytest.mark.asyncio
+async def test_interrupted_batch_resumes_and_skips_finished_jobs(calls, tmp_path):
+    # arrange
+    await workflow.open_checkpointer(tmp_path / "checkpoints.sqlite")
+    jobs = [
+        batch.BatchJob(job_id="ok", topic="ok", length="long"),
+        batch.BatchJob(job_id="fails", topic="fails", length="long"),
+    ]
+    output_dir = tmp_path / "out"
+
+    # act
+    try:
+        first = await batch.run_batch(jobs, output_dir, concurrency=2)
+        calls.clear()
+        second = await batch.run_batch(jobs, output_dir, concurrency=2)
+    finally:
+        await workflow.close_checkpointer()
+
+    # assert
+    assert first["last_run"]["failed"] == 1
+    assert calls == [("fails", "polisher")]
+    assert second["jobs"]["fails"]["resumed"] is True
+    assert (output_dir / "fails.md").read_text() == "# fails"
+    report = json.loads((output_dir / "report.json").read_text())
+    assert report["last_run"] == {**second["last_run"]}
+    assert set(report["jobs"]["ok"]["nodes"]) == {
+        "researcher",
+        "editor",
+        "writer",
+        "fact_checker",
+        "polisher",
+    }
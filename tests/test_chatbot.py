@@ -632,3 +632,40 @@ async def test_tone_throw_error():
     mock_message.reply_text.assert_any_call(
         "An error occurred: Simulated error in tone. \nPlease resend your preferred article tone."
     )
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_status_edit_is_skipped():
+    # arrange
+    from telegram.error import RetryAfter
+
+    from ba_ragmas_chatbot.job_queue import GenerationJob
+
+    bot = TelegramBot()
+    bot.bot = MagicMock()
+    bot.bot.edit_message_text = AsyncMock(side_effect=RetryAfter(30))
+    job = GenerationJob(chat_id=1, user_id=1, inputs={}, status_message_id=5)
+
+    # act
+    await bot.edit_status(job, "📝 Writing...")
+    await bot.edit_status(job, "🔍 Reviewing...")
+
+    # assert: no error reached the run and the pause skipped the second edit
+    bot.bot.edit_message_text.assert_called_once()
+
+
+def test_uploads_with_the_same_name_get_own_paths(tmp_path, monkeypatch):
+    # arrange
+    from ba_ragmas_chatbot import chatbot
+
+    monkeypatch.setattr(chatbot, "DOCUMENTS_DIR", tmp_path)
+
+    # act
+    first = TelegramBot.upload_path(1, "notes.pdf")
+    second = TelegramBot.upload_path(2, "notes.pdf")
+    again = TelegramBot.upload_path(1, "../notes.pdf")
+
+    # assert
+    assert len({first, second, again}) == 3
+    assert os.path.dirname(first) == os.path.dirname(again) == str(tmp_path / "1")
+    assert all(path.endswith("_notes.pdf") for path in (first, second, again))
@@ -0,0 +1,85 @@
+import pytest
+
+from ba_ragmas_chatbot.graph import workflow
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    # arrange: nodes that only record their calls, the polisher fails once
+    calls = []
+
+    def fake_node(name, update):
+        async def node(state):
+            calls.append(name)
+            if name == "polisher" and calls.count("polisher") == 1:
+                raise TimeoutError("ollama timed out")
+            return update
+
+        return node
+
+    monkeypatch.setattr(
+        workflow, "research_node", fake_node("researcher", {"research_data": ["r"]})
+    )
+    monkeypatch.setattr(
+        workflow, "editor_node", fake_node("editor", {"outline": ["o"]})
+    )
+    monkeypatch.setattr(workflow, "writer_node", fake_node("writer", {"draft": "d"}))
+    monkeypatch.setattr(
+        workflow, "fact_check_node", fake_node("fact_checker", {"blocking_issues": []})
+    )
+    monkeypatch.setattr(
+        workflow, "polisher_node", fake_node("polisher", {"final_article": "done"})
+    )
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_after_last_completed_node(calls, tmp_path):
+    # arrange
+    saver = await workflow.open_checkpointer(tmp_path / "checkpoints.sqlite")
+    app = workflow.create_graph(saver)
+    config = workflow.run_config(chat_id=1, run_id="job1")
+
+    with pytest.raises(TimeoutError):
+        await app.ainvoke({"topic": "Plants"}, config)
+
+    # act: a new graph on the same database, as after a restart
+    await workflow.close_checkpointer()
+    saver = await workflow.open_checkpointer(tmp_path / "checkpoints.sqlite")
+    app = workflow.create_graph(saver)
+    snapshot = await app.aget_state(config)
+    result = await app.ainvoke(None, config)
+    await workflow.close_checkpointer()
+
+    # assert
+    assert snapshot.next == ("polisher",)
+    assert result["final_article"] == "done"
+    assert calls == [
+        "researcher",
+        "editor",
+        "writer",
+        "fact_checker",
+        "polisher",
+        "polisher",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_of_abandoned_runs_expire(calls, tmp_path):
+    # arrange: a failed run that is never resumed
+    saver = await workflow.open_checkpointer(tmp_path / "checkpoints.sqlite")
+    app = workflow.create_graph(saver)
+    config = workflow.run_config(chat_id=1, run_id="job1")
+    with pytest.raises(TimeoutError):
+        await app.ainvoke({"topic": "Plants"}, config)
+
+    # act
+    kept = await workflow.drop_stale_checkpoints(max_age_hours=1)
+    removed = await workflow.drop_stale_checkpoints(max_age_hours=0)
+    snapshot = await app.aget_state(config)
+    await workflow.close_checkpointer()
+
+    # assert
+    assert kept == 0
+    assert removed == 1
+    assert not snapshot.next
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from ba_ragmas_chatbot.graph import utils
+from ba_ragmas_chatbot.graph.utils import ConfigService
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    # arrange: config-folder in a temp directory
+    monkeypatch.setattr(utils, "config_path", lambda name: str(tmp_path / name))
+    (tmp_path / "configs.yaml").write_text(
+        "models:\n  logic_model: first-model\n", encoding="utf-8"
+    )
+    return tmp_path
+
+
+def touch_later(path):
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def test_config_is_parsed_once(config_dir, monkeypatch):
+    # arrange
+    service = ConfigService()
+    calls = []
+    original = utils.load_yaml_config
+    monkeypatch.setattr(
+        utils, "load_yaml_config", lambda name: calls.append(name) or original(name)
+    )
+
+    # act
+    for _ in range(5):
+        service.get("configs.yaml")
+
+    # assert
+    assert calls == ["configs.yaml"]
+    assert service.get("configs.yaml")["models"]["logic_model"] == "first-model"
+    assert service.get("configs.yaml")["models"]["base_url"].startswith("http")
+
+
+def test_config_reloads_on_mtime_change(config_dir):
+    # arrange
+    service = ConfigService()
+    service.get("configs.yaml")
+    path = config_dir / "configs.yaml"
+    path.write_text("models:\n  logic_model: second-model\n", encoding="utf-8")
+    touch_later(path)
+
+    # act
+    config = service.get("configs.yaml")
+
+    # assert
+    assert config["models"]["logic_model"] == "second-model"
+
+
+def test_invalid_config_keeps_previous_snapshot(config_dir):
+    # arrange
+    service = ConfigService()
+    service.get("configs.yaml")
+    path = config_dir / "configs.yaml"
+    path.write_text("residency:\n  memory_budget_gb: lots\n", encoding="utf-8")
+    touch_later(path)
+
+    # act
+    config = service.get("configs.yaml")
+
+    # assert
+    assert config["models"]["logic_model"] == "first-model"
+
+
+def test_invalid_config_is_not_reread_until_it_changes(config_dir, monkeypatch):
+    # arrange
+    service = ConfigService()
+    service.get("configs.yaml")
+    version = service.version("configs.yaml")
+    path = config_dir / "configs.yaml"
+    path.write_text("residency:\n  memory_budget_gb: lots\n", encoding="utf-8")
+    touch_later(path)
+    calls = []
+    original = utils.load_yaml_config
+    monkeypatch.setattr(
+        utils, "load_yaml_config", lambda name: calls.append(name) or original(name)
+    )
+
+    # act
+    for _ in range(5):
+        service.get("configs.yaml")
+    path.write_text("models:\n  logic_model: fixed-model\n", encoding="utf-8")
+    os.utime(path, (os.stat(path).st_atime, os.stat(path).st_mtime + 20))
+    fixed = service.get("configs.yaml")
+
+    # assert
+    assert calls == ["configs.yaml", "configs.yaml"]
+    assert service.version("configs.yaml") != version
+    assert fixed["models"]["logic_model"] == "fixed-model"
@@ -0,0 +1,98 @@
+import pytest
+
+from ba_ragmas_chatbot.graph.prompts import Prompt
+from ba_ragmas_chatbot.llm import context
+from ba_ragmas_chatbot.llm.context import SHORTENED_MARKER, ContextBudget, shorten
+
+CONFIG = {
+    "enabled": True,
+    "chars_per_token": 4,
+    "model_chars_per_token": {"fast": 2},
+    "context_sizes": [4096, 8192, 16384],
+    "prompt_tokens": {"researcher": 1000},
+    "output_tokens": {"researcher": 500},
+}
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(context, "get_context_config", lambda: CONFIG)
+    return ContextBudget(lambda agent_name, profile=None: profile or "logic")
+
+
+def test_shorten_keeps_label_and_every_source():
+    # arrange
+    paragraphs = [f"Source {n}: " + "A fact about tea. " * 40 for n in range(3)]
+    segment = "### AVAILABLE KNOWLEDGE ###\n" + "\n\n".join(paragraphs)
+
+    # act
+    short = shorten(segment, 1000)
+
+    # assert
+    assert len(short) <= 1000
+    assert short.startswith("### AVAILABLE KNOWLEDGE ###\n")
+    assert short.endswith(SHORTENED_MARKER)
+    assert all(f"Source {n}:" in short for n in range(3))
+
+
+def test_fit_shortens_only_trimmable_segments_to_the_budget(budget):
+    # arrange
+    knowledge = "### KNOWLEDGE ###\n" + "\n\n".join(["Tea is green. " * 60] * 10)
+    draft = "DRAFT:\n" + "x" * 400
+    prompt = Prompt(
+        system="sys",
+        static=["TASK"],
+        run=[knowledge],
+        call=[draft],
+        trimmable=[knowledge],
+    )
+
+    # act
+    fitted, context_tokens = budget.fit("researcher", prompt)
+
+    # assert
+    assert budget.prompt_tokens(fitted, "logic") <= 1000
+    assert draft in fitted.call
+    assert SHORTENED_MARKER in fitted.run[0]
+    assert context_tokens == budget.prompt_tokens(fitted, "logic") + 500
+
+
+def test_num_ctx_uses_buckets_and_keeps_a_large_enough_size(budget):
+    # act
+    first = budget.num_ctx("logic", 3000)
+    grown = budget.num_ctx("logic", 5000)
+    small_call = budget.num_ctx("logic", 1000)
+    helper_call = budget.num_ctx("logic", None)
+
+    # assert
+    assert first == 4096
+    assert grown == 8192
+    assert small_call == 8192
+    assert helper_call == 8192
+
+
+def test_fit_estimates_tokens_for_the_model_of_the_profile(budget):
+    # arrange
+    prompt = Prompt(system="sys", static=["x" * 400])
+
+    # act
+    _, default_tokens = budget.fit("writer", prompt)
+    _, fast_tokens = budget.fit("writer", prompt, profile="fast")
+
+    # assert: the fast model packs fewer characters into a token
+    assert fast_tokens > default_tokens + 90
+
+
+def test_num_ctx_shrinks_after_a_long_prompt_and_when_unloaded(budget):
+    # arrange
+    budget.num_ctx("logic", 15000)
+
+    # act
+    short_call = budget.num_ctx("logic", 1000)
+    budget.num_ctx("creative", 7000)
+    budget.forget("creative")
+    after_unload = budget.num_ctx("creative", 1000)
+
+    # assert
+    assert short_call == 4096
+    assert after_unload == 4096
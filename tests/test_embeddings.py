@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.embeddings import Embeddings
+
+from ba_ragmas_chatbot.llm.embeddings import EmbeddingBatcher
+
+
+class RecordingEmbeddings(Embeddings):
+    """returns [number of the text] as vector and records every batch."""
+
+    model = "fake-embed"
+
+    def __init__(self, seconds=0.0, fail=False):
+        self.batches = []
+        self.seconds = seconds
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        time.sleep(self.seconds)
+        if self.fail:
+            raise ConnectionError("ollama is down")
+        return [[float(text.split()[-1])] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def _config(**values):
+    config = {"batch_size": 8, "window_ms": 50, "max_concurrent_batches": 1}
+    config.update(values)
+    return lambda: config
+
+
+def test_concurrent_callers_share_batches():
+    # arrange
+    inner = RecordingEmbeddings()
+    batcher = EmbeddingBatcher(inner, config=_config())
+
+    # act: six jobs, two chunks each, embedding at the same time
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(
+            pool.map(
+                lambda job: batcher.embed_documents(
+                    [f"job {job} chunk {2 * job}", f"job {job} chunk {2 * job + 1}"]
+                ),
+                range(6),
+            )
+        )
+
+    # assert
+    assert results == [[[2.0 * j], [2.0 * j + 1]] for j in range(6)]
+    assert len(inner.batches) < 6
+    assert sum(len(batch) for batch in inner.batches) == 12
+    assert max(len(batch) for batch in inner.batches) <= 8
+
+
+def test_large_calls_are_split_into_batch_size_requests():
+    # arrange
+    inner = RecordingEmbeddings()
+    batcher = EmbeddingBatcher(inner, config=_config(batch_size=4, window_ms=1))
+
+    # act
+    vectors = batcher.embed_documents([f"chunk {i}" for i in range(10)])
+    query = batcher.embed_query("topic 42")
+
+    # assert
+    assert vectors == [[float(i)] for i in range(10)]
+    assert query == [42.0]
+    assert [len(batch) for batch in inner.batches] == [4, 4, 2, 1]
+    metrics = batcher.metrics()
+    assert metrics["chunks"] == 11
+    assert metrics["batches"] == 4
+    assert metrics["chunks_per_second"] > 0
+
+
+def test_queue_latency_is_bounded_by_the_window_and_errors_reach_callers():
+    # arrange
+    inner = RecordingEmbeddings(fail=True)
+    batcher = EmbeddingBatcher(inner, config=_config(window_ms=30))
+
+    # act
+    started = time.perf_counter()
+    try:
+        batcher.embed_query("topic 1")
+        error = None
+    except ConnectionError as e:
+        error = e
+    elapsed = time.perf_counter() - started
+
+    # assert
+    assert isinstance(error, ConnectionError)
+    assert 0.02 < elapsed < 1
+    assert batcher.metrics()["batches"] == 0
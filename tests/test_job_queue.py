@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from ba_ragmas_chatbot.job_queue import GenerationJob, GenerationQueue
+
+
+def make_job(user_id, topic):
+    return GenerationJob(chat_id=user_id, user_id=user_id, inputs={"topic": topic})
+
+
+@pytest.mark.asyncio
+async def test_queue_alternates_between_users(tmp_path):
+    # arrange
+    queue = GenerationQueue(runner=None, path=tmp_path / "jobs.json")
+    for job in [
+        make_job(1, "a1"),
+        make_job(1, "a2"),
+        make_job(1, "a3"),
+        make_job(2, "b1"),
+    ]:
+        await queue.submit(job)
+
+    # act
+    order = [job.inputs["topic"] for job in queue.dispatch_order()]
+
+    # assert
+    assert order == ["a1", "b1", "a2", "a3"]
+    assert queue.position(queue.dispatch_order()[1].job_id)[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_queue_respects_concurrency_limit(tmp_path):
+    # arrange
+    running, peak, done = [], [], []
+
+    async def runner(job):
+        running.append(job.job_id)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(job.job_id)
+        done.append(job.inputs["topic"])
+
+    queue = GenerationQueue(runner, max_concurrent=2, path=tmp_path / "jobs.json")
+    await queue.start()
+
+    # act
+    for i in range(5):
+        await queue.submit(make_job(i, f"t{i}"))
+    while len(done) < 5:
+        await asyncio.sleep(0.01)
+    await queue.stop()
+
+    # assert
+    assert max(peak) == 2
+    assert queue.dispatch_order() == []
+
+
+@pytest.mark.asyncio
+async def test_pending_jobs_survive_restart(tmp_path):
+    # arrange
+    path = tmp_path / "jobs.json"
+    first = GenerationQueue(runner=None, path=path)
+    await first.submit(make_job(1, "persisted"))
+
+    finished = asyncio.Event()
+    topics = []
+
+    async def runner(job):
+        topics.append(job.inputs["topic"])
+        finished.set()
+
+    # act
+    second = GenerationQueue(runner, path=path)
+    await second.start()
+    await asyncio.wait_for(finished.wait(), timeout=1)
+    await second.stop()
+
+    # assert
+    assert topics == ["persisted"]
+
+
+@pytest.mark.asyncio
+async def test_job_with_the_same_id_is_queued_once(tmp_path):
+    # arrange
+    queue = GenerationQueue(runner=None, path=tmp_path / "jobs.json")
+    job = make_job(1, "resumed")
+
+    # act: a double-tapped resume submits the same job id twice
+    await queue.submit(job)
+    await queue.submit(GenerationJob(**{**job.__dict__, "inputs": {}}))
+
+    # assert
+    assert [j.inputs for j in queue.dispatch_order()] == [{"topic": "resumed"}]
+    assert queue.contains(job.job_id)
@@ -0,0 +1,28 @@
+from ba_ragmas_chatbot.tools.keywords import extract_keywords
+
+
+def test_english_task_is_reduced_to_subject():
+    # act
+    query = extract_keywords("Write a blog article about the benefits of green tea")
+
+    # assert
+    assert query == "benefits green tea"
+
+
+def test_german_stopwords_are_removed():
+    # act
+    query = extract_keywords("Erkläre, wie man einen Komposthaufen im Garten anlegt")
+
+    # assert
+    assert query == "Komposthaufen Garten anlegt"
+
+
+def test_query_is_limited_to_max_words():
+    # act
+    query = extract_keywords(
+        "Künstliche Intelligenz in der Medizin: Chancen und Risiken", max_words=3
+    )
+
+    # assert
+    assert query == "Künstliche Intelligenz Medizin"
+    assert extract_keywords("the and of") == ""
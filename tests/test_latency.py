@@ -0,0 +1,45 @@
+import uuid
+
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.messages import AIMessage
+
+from ba_ragmas_chatbot.graph.prompts import Prompt
+from ba_ragmas_chatbot.llm.latency import LatencyTracker
+
+
+def test_prompt_orders_segments_from_static_to_call():
+    # arrange
+    prompt = Prompt(system="sys", static=["TASK"], run=["BRIEFING"], call=["DRAFT"])
+
+    # act
+    revised = prompt.extend("CRITIQUE")
+
+    # assert
+    assert prompt.text == "TASK\n\nBRIEFING\n\nDRAFT"
+    assert revised.text == "TASK\n\nBRIEFING\n\nDRAFT\n\nCRITIQUE"
+    assert revised.text.startswith(prompt.text)
+
+
+def test_tracker_records_ttft_and_prompt_eval():
+    # arrange
+    tracker = LatencyTracker()
+    callback = tracker.callback("writer")
+    run_id = uuid.uuid4()
+    info = {"prompt_eval_count": 40, "prompt_eval_duration": 2_000_000_000}
+    response = LLMResult(
+        generations=[
+            [ChatGeneration(message=AIMessage(content="hi"), generation_info=info)]
+        ]
+    )
+
+    # act
+    callback.on_chat_model_start({}, [], run_id=run_id)
+    callback.on_llm_new_token("hi", run_id=run_id)
+    callback.on_llm_end(response, run_id=run_id)
+
+    # assert
+    metrics = tracker.metrics()["writer"]
+    assert metrics["calls"] == 1
+    assert metrics["avg_ttft_seconds"] >= 0
+    assert metrics["avg_prompt_tokens_evaluated"] == 40
+    assert metrics["avg_prompt_eval_seconds"] == 2.0
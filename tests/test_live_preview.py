@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+from telegram.error import RetryAfter
+
+from ba_ragmas_chatbot.live_preview import LivePreview, split_message
+
+
+class FakeBot:
+    def __init__(self, rate_limited=0):
+        self.messages = {}
+        self.edits = 0
+        self.rate_limited = rate_limited
+
+    async def send_message(self, chat_id, text):
+        message_id = len(self.messages) + 1
+        self.messages[message_id] = text
+        return SimpleNamespace(message_id=message_id)
+
+    async def edit_message_text(self, chat_id, message_id, text):
+        if self.rate_limited:
+            self.rate_limited -= 1
+            raise RetryAfter(0)
+        self.edits += 1
+        self.messages[message_id] = text
+
+
+def test_split_message_prefers_line_breaks():
+    # act
+    parts = split_message("a" * 6 + "\n" + "b" * 6, limit=10)
+
+    # assert
+    assert parts == ["aaaaaa", "bbbbbb"]
+    assert split_message("x" * 25, limit=10) == ["x" * 10, "x" * 10, "x" * 5]
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_batched_into_few_edits():
+    # arrange
+    bot = FakeBot()
+    preview = LivePreview(bot, chat_id=1, min_interval=60)
+
+    # act
+    for token in ["Hello", " world", ",", " this", " is", " streamed."]:
+        await preview.push(token)
+    await preview.close()
+
+    # assert
+    assert bot.messages == {1: "Hello world, this is streamed."}
+    assert bot.edits == 1
+
+
+@pytest.mark.asyncio
+async def test_long_text_continues_in_new_message():
+    # arrange
+    bot = FakeBot()
+    preview = LivePreview(bot, chat_id=1, header="Live:\n", min_interval=0, limit=10)
+
+    # act
+    for word in ["one ", "two ", "three ", "four"]:
+        await preview.push(word)
+    await preview.close()
+
+    # assert
+    assert list(bot.messages.values()) == ["Live:", "one two th", "ree four"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_waited_out_on_close():
+    # arrange
+    bot = FakeBot(rate_limited=1)
+    preview = LivePreview(bot, chat_id=1, min_interval=0)
+    await preview.push("first")
+
+    # act
+    await preview.push(" second")
+    await preview.close()
+
+    # assert
+    assert bot.messages == {1: "first second"}
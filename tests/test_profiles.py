@@ -0,0 +1,67 @@
+import pytest
+
+from ba_ragmas_chatbot.graph import workflow
+from ba_ragmas_chatbot.graph.profiles import get_profile, profile_names, resolve_profile
+from ba_ragmas_chatbot.llm.factory import model_for_agent
+
+
+def test_profile_is_picked_by_length_unless_set_explicitly():
+    # act + assert
+    assert resolve_profile(target_len="Short") == "fast"
+    assert resolve_profile(target_len="long") == "quality"
+    assert resolve_profile(target_len="about 800 words") == "quality"
+    assert resolve_profile(target_len="short", profile="balanced") == "balanced"
+
+
+def test_fast_profile_runs_writer_on_the_logic_model():
+    # act
+    writer_model = model_for_agent("writer", "fast")
+
+    # assert
+    assert writer_model == model_for_agent("researcher")
+    assert model_for_agent("writer") != writer_model
+
+
+@pytest.mark.asyncio
+async def test_fast_profile_skips_editor_and_polisher(monkeypatch):
+    # arrange
+    calls = []
+
+    def fake_node(name, update):
+        async def node(state):
+            calls.append(name)
+            return update
+
+        return node
+
+    monkeypatch.setattr(
+        workflow, "research_node", fake_node("researcher", {"research_data": ["r"]})
+    )
+    monkeypatch.setattr(workflow, "writer_node", fake_node("writer", {"draft": "d"}))
+    app = workflow.create_graph(profile="fast")
+
+    # act
+    result = await app.ainvoke({"topic": "t", "profile": "fast"})
+
+    # assert
+    assert calls == ["researcher", "writer"]
+    assert result["final_article"] == "d"
+    assert result["profile"] == "fast"
+    assert get_profile("fast")["max_revisions"] == 0
+
+
+def test_graphs_are_cached_per_profile():
+    # act
+    fast = workflow.get_graph("fast")
+    quality = workflow.get_graph("quality")
+
+    # assert
+    assert workflow.get_graph("fast") is fast
+    assert fast is not quality
+    assert "editor" in quality.get_graph().nodes
+    assert "editor" not in fast.get_graph().nodes
+
+
+def test_profile_names_follow_the_config_order():
+    # act + assert
+    assert profile_names() == ["fast", "balanced", "quality"]
@@ -0,0 +1,99 @@
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from ba_ragmas_chatbot.tools import research_cache, vectorstore
+
+
+@pytest.fixture
+def cache_config(tmp_path, monkeypatch):
+    # arrange: isolated chroma directory + fake embedding model
+    monkeypatch.setattr(vectorstore, "DB_DIR_STR", str(tmp_path / "db"))
+    monkeypatch.setattr(vectorstore, "_client", None)
+    fake = DeterministicFakeEmbedding(size=8)
+    monkeypatch.setattr(research_cache, "get_embedding_function", lambda: fake)
+    config = {"similarity_threshold": 0.9, "ttl_hours": 1, "max_entries": 10}
+    monkeypatch.setattr(research_cache, "_cache_config", lambda: config)
+    return config
+
+
+def store(topic, language="English", briefing=None):
+    research_cache.store_briefing(
+        research_cache.topic_embedding(topic),
+        research_cache.sources_fingerprint([]),
+        language,
+        topic=topic,
+        briefing=briefing or f"briefing about {topic}",
+    )
+
+
+def lookup(topic, language="English"):
+    return research_cache.lookup_briefing(
+        research_cache.topic_embedding(topic),
+        research_cache.sources_fingerprint([]),
+        language,
+    )
+
+
+def test_same_topic_and_language_hits_cache(cache_config):
+    # arrange
+    store("Green Tea")
+
+    # act & assert
+    assert lookup(" green tea ") == "briefing about Green Tea"
+    assert lookup("Green Tea", language="German") is None
+    assert lookup("Quantum computing") is None
+
+
+def test_expired_briefing_is_ignored(cache_config):
+    # arrange
+    store("Green Tea")
+    cache_config["ttl_hours"] = 0
+
+    # act & assert
+    assert lookup("Green Tea") is None
+
+
+def test_least_recently_used_briefing_is_evicted(cache_config):
+    # arrange
+    cache_config["max_entries"] = 2
+    store("Green Tea")
+    store("Black Tea")
+    lookup("Green Tea")
+
+    # act
+    store("White Tea")
+
+    # assert
+    assert lookup("Green Tea") is not None
+    assert lookup("Black Tea") is None
+    assert research_cache.get_research_cache().count() == 2
+
+
+def test_embedding_model_change_uses_its_own_cache(cache_config, monkeypatch):
+    # arrange
+    store("Green Tea")
+    smaller = DeterministicFakeEmbedding(size=4)
+    monkeypatch.setattr(research_cache, "get_embedding_function", lambda: smaller)
+    monkeypatch.setattr(research_cache, "embedding_model_name", lambda: "small")
+
+    # act
+    missed = lookup("Green Tea")
+    store("Green Tea")
+
+    # assert
+    assert missed is None
+    assert lookup("Green Tea") == "briefing about Green Tea"
+    assert research_cache.get_research_cache().count() == 1
+
+
+def test_changed_documents_change_fingerprint(tmp_path):
+    # arrange
+    path = tmp_path / "notes.txt"
+    path.write_text("first version", encoding="utf-8")
+    before = research_cache.sources_fingerprint([str(path)])
+
+    # act
+    path.write_text("second version", encoding="utf-8")
+
+    # assert
+    assert research_cache.sources_fingerprint([str(path)]) != before
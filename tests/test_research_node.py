@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from ba_ragmas_chatbot.graph import nodes
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages[-1].content)
+        return AIMessage(content="briefing")
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FakeLLM()
+
+    async def get_llm(agent_name, **kwargs):
+        return fake
+
+    async def no_cache(state):
+        return None
+
+    monkeypatch.setattr(nodes, "aget_llm_for_agent", get_llm)
+    monkeypatch.setattr(nodes, "_research_cache_key", no_cache)
+    return fake
+
+
+def make_state():
+    return {"topic": "Plants", "language": "English", "source_documents": ["a.pdf"]}
+
+
+@pytest.mark.asyncio
+async def test_retrieval_and_web_search_run_concurrently(llm, monkeypatch):
+    # arrange
+    async def retrieve(state, topic):
+        await asyncio.sleep(0.3)
+        return "local fact"
+
+    async def search(topic):
+        await asyncio.sleep(0.3)
+        return "web fact"
+
+    monkeypatch.setattr(nodes, "_retrieve_local_context", retrieve)
+    monkeypatch.setattr(nodes, "_search_web_context", search)
+
+    # act
+    started = time.perf_counter()
+    result = await nodes.research_node(make_state())
+    elapsed = time.perf_counter() - started
+
+    # assert
+    assert elapsed < 0.5
+    assert "local fact" in llm.prompts[-1]
+    assert "web fact" in llm.prompts[-1]
+    assert result["research_data"] == ["briefing"]
+
+
+@pytest.mark.asyncio
+async def test_slow_branch_is_skipped_after_timeout(llm, monkeypatch):
+    # arrange
+    async def retrieve(state, topic):
+        return "local fact"
+
+    async def search(topic):
+        await asyncio.sleep(10)
+        return "web fact"
+
+    monkeypatch.setattr(nodes, "_retrieve_local_context", retrieve)
+    monkeypatch.setattr(nodes, "_search_web_context", search)
+    monkeypatch.setattr(
+        nodes,
+        "get_app_config",
+        lambda: {"research": {"web_search_timeout_seconds": 0.1}},
+    )
+
+    # act
+    await nodes.research_node(make_state())
+
+    # assert
+    assert "local fact" in llm.prompts[-1]
+    assert "web fact" not in llm.prompts[-1]
+
+
+@pytest.mark.asyncio
+async def test_search_query_needs_no_llm_and_is_cached(llm, monkeypatch):
+    # arrange
+    monkeypatch.setattr(nodes, "_search_query_cache", nodes.OrderedDict())
+    calls = []
+    original = nodes.extract_keywords
+    monkeypatch.setattr(
+        nodes, "extract_keywords", lambda topic: calls.append(topic) or original(topic)
+    )
+
+    # act
+    first = await nodes.build_search_query("Write about the history of coffee")
+    second = await nodes.build_search_query("Write about the history of coffee")
+
+    # assert
+    assert first == second == "history coffee"
+    assert len(calls) == 1
+    assert llm.prompts == []
+
+
+@pytest.mark.asyncio
+async def test_llm_is_fallback_when_no_keywords_found(llm, monkeypatch):
+    # arrange
+    monkeypatch.setattr(nodes, "_search_query_cache", nodes.OrderedDict())
+
+    # act
+    query = await nodes.build_search_query("What is it?")
+
+    # assert
+    assert query == "briefing"
+    assert len(llm.prompts) == 1
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import pytest
+
+from ba_ragmas_chatbot.llm import residency as residency_module
+from ba_ragmas_chatbot.llm.residency import ResidencyPolicy
+
+MODELS = {
+    "researcher": "logic",
+    "editor": "logic",
+    "writer": "creative",
+    "fact_checker": "logic",
+    "polisher": "creative",
+}
+
+EDGES = [
+    ("__start__", "researcher"),
+    ("researcher", "editor"),
+    ("editor", "writer"),
+    ("writer", "fact_checker"),
+    ("fact_checker", "writer"),
+    ("fact_checker", "polisher"),
+    ("polisher", "__end__"),
+]
+
+
+def make_policy(monkeypatch, budget_gb):
+    monkeypatch.setattr(
+        residency_module,
+        "get_residency_config",
+        lambda: {
+            "memory_budget_gb": budget_gb,
+            "keep_alive": "10m",
+            "model_sizes_gb": {"logic": 5, "creative": 6},
+        },
+    )
+    policy = ResidencyPolicy(MODELS.get)
+    policy.set_topology(SimpleNamespace(source=s, target=t) for s, t in EDGES)
+    return policy
+
+
+@pytest.mark.parametrize(
+    "agent, expected",
+    [
+        ("researcher", "10m"),
+        ("editor", 0),
+        ("writer", 0),
+        ("fact_checker", 0),
+        ("polisher", 0),
+    ],
+)
+def test_keep_alive_follows_next_node(monkeypatch, agent, expected):
+    # arrange
+    policy = make_policy(monkeypatch, budget_gb=8)
+
+    # act / assert
+    assert policy.keep_alive_for(agent) == expected
+
+
+def test_keep_alive_when_all_models_fit(monkeypatch):
+    # arrange
+    policy = make_policy(monkeypatch, budget_gb=16)
+
+    # act / assert
+    assert policy.keep_alive_for("polisher") == "10m"
+
+
+def test_keep_alive_for_other_runs_and_queue(monkeypatch):
+    # arrange
+    policy = make_policy(monkeypatch, budget_gb=8)
+
+    # act
+    policy.call_started("writer")
+    keep_polisher = policy.keep_alive_for("polisher")
+    policy.call_finished("writer", "creative", None)
+    policy.run_queued()
+    keep_editor = policy.keep_alive_for("editor")
+
+    # assert
+    assert keep_polisher == "10m"
+    assert keep_editor == "10m"
+
+
+def test_fast_profile_keeps_its_single_model_loaded(monkeypatch):
+    # arrange: the fast profile runs the writer on the logic model
+    policy = make_policy(monkeypatch, budget_gb=8)
+    policy.model_for_agent = lambda agent, profile=None: (
+        "logic" if profile == "fast" else MODELS[agent]
+    )
+    fast_edges = [
+        ("__start__", "researcher"),
+        ("researcher", "writer"),
+        ("writer", "__end__"),
+    ]
+    policy.set_topology(
+        (SimpleNamespace(source=s, target=t) for s, t in fast_edges), "fast"
+    )
+
+    # act
+    keep_fast = policy.keep_alive_for("researcher", "logic", "fast")
+    keep_quality = policy.keep_alive_for("fact_checker", "logic")
+
+    # assert
+    assert keep_fast == "10m"
+    assert keep_quality == 0
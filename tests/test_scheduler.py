@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from ba_ragmas_chatbot.llm import factory
+from ba_ragmas_chatbot.llm import scheduler as scheduler_module
+from ba_ragmas_chatbot.llm.scheduler import ModelScheduler, ScheduledLLM
+
+
+class FakeLLM:
+    def __init__(self, model, order, seconds=0.05):
+        self.model = model
+        self.order = order
+        self.seconds = seconds
+
+    async def ainvoke(self, messages, **kwargs):
+        self.order.append(("start", self.model, messages))
+        await asyncio.sleep(self.seconds)
+        self.order.append(("end", self.model, messages))
+        return messages
+
+
+@pytest.fixture
+def config(monkeypatch):
+    config = {"enabled": True, "max_wait_seconds": 30}
+    monkeypatch.setattr(scheduler_module, "get_scheduler_config", lambda: config)
+    return config
+
+
+def _starts(order):
+    return [(model, name) for event, model, name in order if event == "start"]
+
+
+@pytest.mark.asyncio
+async def test_queued_calls_of_the_loaded_model_run_before_a_switch(config):
+    # arrange
+    scheduler = ModelScheduler()
+    order = []
+    logic = ScheduledLLM(FakeLLM("logic", order), "logic", scheduler)
+    creative = ScheduledLLM(FakeLLM("creative", order), "creative", scheduler)
+
+    async def delayed(llm, name, delay):
+        await asyncio.sleep(delay)
+        return await llm.ainvoke(name)
+
+    # act: a creative call arrives while logic work of other runs is queued
+    await asyncio.gather(
+        delayed(logic, "research a", 0),
+        delayed(creative, "write a", 0.01),
+        delayed(logic, "research b", 0.02),
+        delayed(logic, "fact check c", 0.03),
+    )
+
+    # assert
+    assert _starts(order) == [
+        ("logic", "research a"),
+        ("logic", "research b"),
+        ("logic", "fact check c"),
+        ("creative", "write a"),
+    ]
+    assert scheduler.metrics()["model_switches"] == 1
+    assert scheduler.metrics()["calls_per_model"] == {"logic": 3, "creative": 1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "can_share",
+    [
+        None,
+        factory.scheduler.can_share,
+        lambda a, b: factory.residency.fit_together([a, b]),
+    ],
+    ids=["no sharing", "production check", "residency budget only"],
+)
+async def test_a_call_waiting_too_long_gets_its_model_next(config, can_share):
+    # arrange: with the production check the two models do not fit together
+    config["max_wait_seconds"] = 0.1
+    scheduler = ModelScheduler(can_share=can_share)
+    order = []
+    logic = ScheduledLLM(FakeLLM("logic", order, seconds=0.08), "logic", scheduler)
+    creative = ScheduledLLM(FakeLLM("creative", order), "creative", scheduler)
+
+    async def logic_stream(run):
+        # a run that keeps the logic model busy with back-to-back calls
+        for step in range(5):
+            await logic.ainvoke(f"{run} {step}")
+
+    async def late_creative():
+        await asyncio.sleep(0.01)
+        await creative.ainvoke("write")
+
+    # act
+    await asyncio.gather(logic_stream("a"), logic_stream("b"), late_creative())
+
+    # assert: the writer did not wait for all ten logic calls
+    starts = _starts(order)
+    assert starts.index(("creative", "write")) < len(starts) - 2
+    assert scheduler.metrics()["max_wait_seconds"] < 0.5
+
+
+@pytest.mark.asyncio
+async def test_models_fitting_into_memory_together_run_in_parallel(config):
+    # arrange
+    scheduler = ModelScheduler(can_share=lambda a, b: True)
+    order = []
+    logic = ScheduledLLM(FakeLLM("logic", order), "logic", scheduler)
+    creative = ScheduledLLM(FakeLLM("creative", order), "creative", scheduler)
+
+    # act
+    await asyncio.gather(logic.ainvoke("fact check"), creative.ainvoke("polish"))
+
+    # assert
+    assert [event for event, _, _ in order[:2]] == ["start", "start"]
+    assert scheduler.metrics()["model_switches"] == 0
@@ -0,0 +1,110 @@
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from ba_ragmas_chatbot.tools import vectorstore
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    model: str = "fake-embed"
+    calls: int = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def embeddings(tmp_path, monkeypatch):
+    # arrange: isolated chroma directory + fake embedding model
+    monkeypatch.setattr(vectorstore, "DB_DIR_STR", str(tmp_path / "db"))
+    monkeypatch.setattr(vectorstore, "_client", None)
+    fake = CountingEmbeddings(size=8)
+    monkeypatch.setattr(vectorstore, "get_embedding_function", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "policy.txt"
+    path.write_text("Plants must be watered every Monday.", encoding="utf-8")
+    return str(path)
+
+
+def test_runs_use_isolated_collections(embeddings, document):
+    # arrange
+    first = vectorstore.new_collection_name(1)
+    second = vectorstore.new_collection_name(1)
+
+    # act
+    vectorstore.setup_vectorstore([document], first)
+    vectorstore.setup_vectorstore([document], second)
+    vectorstore.drop_vectorstore(first)
+
+    # assert
+    assert first != second
+    assert vectorstore.get_retriever(first) is None
+    assert vectorstore.get_retriever(second, k=1).invoke("plants")
+
+
+def test_reindexing_same_document_hits_embedding_cache(embeddings, document):
+    # act
+    vectorstore.setup_vectorstore([document], vectorstore.new_collection_name(1))
+    vectorstore.setup_vectorstore([document], vectorstore.new_collection_name(2))
+
+    # assert
+    assert embeddings.calls == 1
+
+
+def test_drop_stale_collections_keeps_embedding_cache(embeddings, document):
+    # arrange
+    vectorstore.setup_vectorstore([document], vectorstore.new_collection_name(1))
+
+    # act
+    removed = vectorstore.drop_stale_collections()
+
+    # assert
+    assert removed == 1
+    assert vectorstore.get_embedding_cache("fake-embed").count() == 1
+
+
+def test_embedding_models_of_other_dimensions_get_own_caches(
+    embeddings, document, monkeypatch
+):
+    # arrange: the configured model changes to one with smaller vectors
+    vectorstore.setup_vectorstore([document], vectorstore.new_collection_name(1))
+    other = CountingEmbeddings(size=4, model="other-embed:latest")
+    monkeypatch.setattr(vectorstore, "get_embedding_function", lambda: other)
+
+    # act
+    store = vectorstore.setup_vectorstore(
+        [document], vectorstore.new_collection_name(1)
+    )
+
+    # assert
+    assert store is not None
+    assert other.calls == 1
+    assert vectorstore.get_embedding_cache("other-embed:latest").count() == 1
+    assert vectorstore.get_embedding_cache("fake-embed").count() == 1
+
+
+@pytest.mark.asyncio
+async def test_async_indexing_reports_progress(embeddings, tmp_path):
+    # arrange
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"doc_{i}.txt"
+        path.write_text(f"Document number {i} about plants.", encoding="utf-8")
+        paths.append(str(path))
+    progress = []
+
+    async def report(done, total, name):
+        progress.append((done, total))
+
+    # act
+    collection_name = vectorstore.new_collection_name(1)
+    await vectorstore.asetup_vectorstore(paths, collection_name, progress=report)
+
+    # assert
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    collection = vectorstore.get_chroma_client().get_collection(collection_name)
+    assert collection.count() == 3
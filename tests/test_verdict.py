@@ -0,0 +1,192 @@
+import asyncio
+import json
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.graph import END
+
+from ba_ragmas_chatbot.graph import nodes
+from ba_ragmas_chatbot.graph.verdict import parse_verdict
+from ba_ragmas_chatbot.graph.workflow import route_after_fact_check
+
+STATE = {
+    "topic": "Green tea",
+    "language": "English",
+    "tone": "casual",
+    "draft": "Green tea was discovered in 2737 BC.",
+    "research_data": ["Legend dates green tea to 2737 BC."],
+    "revision_count": 0,
+}
+
+
+def checker_returning(verdict):
+    prompts = []
+
+    class CheckerLLM:
+        async def ainvoke(self, messages, config=None, **kwargs):
+            prompts.append((messages[-1].content, kwargs))
+            return AIMessage(content=json.dumps(verdict))
+
+    async def get_llm(agent_name, **kwargs):
+        return CheckerLLM()
+
+    return get_llm, prompts
+
+
+def test_parse_verdict_reads_json_and_free_text():
+    # act
+    structured = parse_verdict(
+        '{"issues": [{"severity": "minor", "section": 2, "problem": "Vague."}]}'
+    )
+    passed = parse_verdict("PASS")
+    legacy = parse_verdict("- [SECTION 3] Wrong year.")
+
+    # assert
+    assert [i.section for i in structured.minor] == [2]
+    assert passed.issues == []
+    assert legacy.blocking[0].section == 3
+
+
+@pytest.mark.asyncio
+async def test_minor_issues_go_to_the_polisher(monkeypatch):
+    # arrange
+    get_llm, prompts = checker_returning(
+        {"issues": [{"severity": "minor", "problem": "Say it is a legend."}]}
+    )
+    monkeypatch.setattr(nodes, "aget_llm_for_agent", get_llm)
+
+    # act
+    update = await nodes.fact_check_node(dict(STATE))
+    state = {**STATE, **update}
+    await nodes.polisher_node(state)
+
+    # assert
+    assert "format" in prompts[0][1]
+    assert route_after_fact_check(state) == "polisher"
+    assert "Say it is a legend." in prompts[1][0]
+
+
+@pytest.mark.asyncio
+async def test_blocking_issues_send_the_draft_back(monkeypatch):
+    # arrange
+    get_llm, _ = checker_returning(
+        {
+            "issues": [
+                {"severity": "blocking", "problem": "Year not in briefing."},
+                {"severity": "minor", "problem": "Long sentence."},
+            ]
+        }
+    )
+    monkeypatch.setattr(nodes, "aget_llm_for_agent", get_llm)
+
+    # act
+    update = await nodes.fact_check_node(dict(STATE))
+    state = {**STATE, **update}
+
+    # assert
+    assert route_after_fact_check(state) == "writer"
+    assert "Year not in briefing." in state["critique"]
+    assert "Long sentence." not in state["critique"]
+    assert route_after_fact_check({**state, "revision_count": 2}) == "polisher"
+
+
+def speculative_llms(verdict, polish_delay=0.0):
+    calls = {"polished": 0, "cancelled": 0}
+
+    class LLM:
+        def __init__(self, agent_name):
+            self.agent_name = agent_name
+
+        async def ainvoke(self, messages, config=None, **kwargs):
+            if self.agent_name == "fact_checker":
+                await asyncio.sleep(0.2)
+                return AIMessage(content=json.dumps(verdict))
+            try:
+                await asyncio.sleep(polish_delay)
+            except asyncio.CancelledError:
+                calls["cancelled"] += 1
+                raise
+            calls["polished"] += 1
+            return AIMessage(content="Polished article.")
+
+    async def get_llm(agent_name, **kwargs):
+        return LLM(agent_name)
+
+    return get_llm, calls
+
+
+@pytest.mark.asyncio
+async def test_speculative_polish_is_used_when_the_check_passes(monkeypatch):
+    # arrange
+    get_llm, calls = speculative_llms({"issues": []}, polish_delay=0.2)
+    monkeypatch.setattr(nodes, "aget_llm_for_agent", get_llm)
+    start = time.perf_counter()
+
+    # act
+    update = await nodes.speculative_fact_check_node(dict(STATE))
+
+    # assert
+    assert time.perf_counter() - start < 0.35
+    assert update["final_article"] == "Polished article."
+    assert route_after_fact_check({**STATE, **update}) == END
+
+
+@pytest.mark.asyncio
+async def test_speculative_polish_is_cancelled_on_issues(monkeypatch):
+    # arrange
+    verdict = {"issues": [{"severity": "blocking", "problem": "Wrong year."}]}
+    get_llm, calls = speculative_llms(verdict, polish_delay=1)
+    monkeypatch.setattr(nodes, "aget_llm_for_agent", get_llm)
+
+    # act
+    update = await nodes.speculative_fact_check_node(dict(STATE))
+
+    # assert
+    assert "final_article" not in update
+    assert calls == {"polished": 0, "cancelled": 1}
+    assert route_after_fact_check({**STATE, **update}) == "writer"
+
+
+def test_routing_follows_the_blocking_issues_not_the_critique_text():
+    # arrange
+    issue = {"severity": "blocking", "problem": "PASSAGE invents a year."}
+
+    # act + assert
+    assert route_after_fact_check({**STATE, "critique": "PASS"}) == "polisher"
+    assert (
+        route_after_fact_check(
+            {**STATE, "critique": "PASSAGE invents a year.", "blocking_issues": [issue]}
+        )
+        == "writer"
+    )
+    assert route_after_fact_check({**STATE, "critique": "Wrong."}) == "polisher"
+
+
+@pytest.mark.asyncio
+async def test_speculative_polish_ignores_hints_of_an_earlier_check(monkeypatch):
+    # arrange: a revision is re-checked after a check that left a hint
+    polished = []
+
+    class LLM:
+        def __init__(self, agent_name):
+            self.agent_name = agent_name
+
+        async def ainvoke(self, messages, config=None, **kwargs):
+            if self.agent_name == "fact_checker":
+                return AIMessage(content=json.dumps({"issues": []}))
+            polished.append(messages[-1].content)
+            return AIMessage(content="Polished article.")
+
+    async def get_llm(agent_name, **kwargs):
+        return LLM(agent_name)
+
+    monkeypatch.setattr(nodes, "aget_llm_for_agent", get_llm)
+    state = {**STATE, "polish_hints": ["- Say it is a legend."]}
+
+    # act
+    update = await nodes.speculative_fact_check_node(state)
+
+    # assert
+    assert update["final_article"] == "Polished article."
+    assert "Say it is a legend." not in polished[0]
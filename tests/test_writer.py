@@ -0,0 +1,224 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from ba_ragmas_chatbot.graph import nodes
+from ba_ragmas_chatbot.graph.sections import (
+    article_title,
+    parse_outline,
+    split_draft,
+)
+from ba_ragmas_chatbot.graph.verdict import Issue, feedback_by_section
+
+OUTLINE = """# Green Tea
+## The Hook
+- legend of Shen Nong
+## Health Benefits
+- catechins
+## Conclusion
+- summary"""
+
+
+class SectionLLM:
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def ainvoke(self, messages, config=None):
+        prompt = messages[-1].content
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        if "WRITE ONLY SECTION" in prompt:
+            title = prompt.split("WRITE ONLY SECTION", 1)[1].split(": ", 1)[1]
+            return AIMessage(content=f"## {title.splitlines()[0]}\nBody.")
+        return AIMessage(content="Transition.")
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = SectionLLM()
+
+    async def get_llm(agent_name, **kwargs):
+        return fake
+
+    monkeypatch.setattr(nodes, "aget_llm_for_agent", get_llm)
+    return fake
+
+
+def make_state(target_len):
+    return {
+        "topic": "Green tea",
+        "target_len": target_len,
+        "information_level": "basic",
+        "language_level": "beginner",
+        "tone": "casual",
+        "language": "English",
+        "additional_info": "",
+        "outline": [OUTLINE],
+    }
+
+
+def test_outline_is_split_at_repeated_heading_level():
+    # act
+    sections = parse_outline(OUTLINE)
+
+    # assert
+    assert article_title(OUTLINE) == "Green Tea"
+    assert [s["title"] for s in sections] == [
+        "The Hook",
+        "Health Benefits",
+        "Conclusion",
+    ]
+    assert sections[1]["points"] == "- catechins"
+    assert parse_outline("An outline without any structure.") is None
+
+
+@pytest.mark.asyncio
+async def test_long_article_sections_are_written_concurrently(llm):
+    # act
+    result = await nodes.writer_node(make_state("long"))
+
+    # assert
+    assert llm.peak == 3
+    assert result["draft"] == (
+        "# Green Tea\n\n"
+        "## The Hook\nBody.\n\nTransition.\n\n"
+        "## Health Benefits\nBody.\n\nTransition.\n\n"
+        "## Conclusion\nBody."
+    )
+
+
+@pytest.mark.asyncio
+async def test_short_article_is_written_at_once(llm):
+    # act
+    result = await nodes.writer_node(make_state("short"))
+
+    # assert
+    assert llm.peak == 1
+    assert result["draft"] == "Transition."
+
+
+DRAFT = "# Green Tea\n\n## The Hook\nOld hook.\n\n## Health Benefits\nOld benefits."
+
+
+def test_issues_are_mapped_to_sections():
+    # arrange
+    parts = split_draft(DRAFT)
+
+    # act
+    flagged = feedback_by_section(
+        [
+            Issue(severity="blocking", section=3, problem="wrong number"),
+            Issue(severity="blocking", section=9, problem="unknown"),
+        ],
+        checked=[0, 1, 2],
+    )
+
+    # assert
+    assert parts == [
+        "# Green Tea",
+        "## The Hook\nOld hook.",
+        "## Health Benefits\nOld benefits.",
+    ]
+    assert flagged[2] == ["- [SECTION 3] wrong number", "- [SECTION 9] unknown"]
+    assert flagged[0] == flagged[1] == ["- [SECTION 9] unknown"]
+
+
+def test_issue_without_section_flags_every_checked_section():
+    # act
+    flagged = feedback_by_section(
+        [
+            Issue(severity="blocking", problem="Wrong year overall", fix="x"),
+            Issue(severity="blocking", section=2, problem="bad quote", fix="y"),
+        ],
+        checked=[0, 1, 2],
+    )
+
+    # assert
+    assert sorted(flagged) == [0, 1, 2]
+    assert flagged[1] == [
+        "- Wrong year overall Fix: x",
+        "- [SECTION 2] bad quote Fix: y",
+    ]
+    assert flagged[2] == ["- Wrong year overall Fix: x"]
+
+
+@pytest.mark.asyncio
+async def test_revision_rewrites_only_flagged_sections(llm):
+    # arrange
+    state = make_state("long")
+    state.update(
+        draft=DRAFT,
+        critique="- [SECTION 3] wrong number",
+        blocking_issues=[
+            {"severity": "blocking", "section": 3, "problem": "wrong number"}
+        ],
+        flagged_sections=[2],
+    )
+
+    # act
+    result = await nodes.writer_node(state)
+
+    # assert
+    assert result["changed_sections"] == [2]
+    assert result["draft"].startswith("# Green Tea\n\n## The Hook\nOld hook.\n\n")
+    assert "Old benefits." not in result["draft"]
+
+
+@pytest.mark.asyncio
+async def test_fact_checker_only_sees_changed_sections(monkeypatch):
+    # arrange
+    prompts = []
+
+    class CheckerLLM:
+        async def ainvoke(self, messages, config=None, **kwargs):
+            prompts.append(messages[-1].content)
+            return AIMessage(content="- [SECTION 3] still wrong")
+
+    async def get_llm(agent_name, **kwargs):
+        return CheckerLLM()
+
+    monkeypatch.setattr(nodes, "aget_llm_for_agent", get_llm)
+    state = make_state("long")
+    state.update(draft=DRAFT, research_data=["facts"], changed_sections=[2])
+
+    # act
+    result = await nodes.fact_check_node(state)
+
+    # assert
+    assert "Old benefits." in prompts[0]
+    assert "Old hook." not in prompts[0]
+    assert result["flagged_sections"] == [2]
+
+
+@pytest.mark.asyncio
+async def test_issue_without_section_rewrites_all_checked_sections(monkeypatch):
+    # arrange
+    verdict = {
+        "issues": [
+            {"severity": "blocking", "problem": "Wrong year overall."},
+            {"severity": "blocking", "section": 3, "problem": "Bad quote."},
+        ]
+    }
+
+    class CheckerLLM:
+        async def ainvoke(self, messages, config=None, **kwargs):
+            return AIMessage(content=json.dumps(verdict))
+
+    async def get_llm(agent_name, **kwargs):
+        return CheckerLLM()
+
+    monkeypatch.setattr(nodes, "aget_llm_for_agent", get_llm)
+    state = make_state("long")
+    state.update(draft=DRAFT, research_data=["facts"], changed_sections=[1, 2])
+
+    # act
+    result = await nodes.fact_check_node(state)
+
+    # assert
+    assert result["flagged_sections"] == [1, 2]
+    assert [i["section"] for i in result["blocking_issues"]] == [None, 3]